@@ -0,0 +1,79 @@
+"""
+008: alerts tablosu için created_at sıralı kısmi indeksler.
+
+get_alerts sorgusu `WHERE is_read = FALSE` / `WHERE is_resolved = FALSE`
+(ve opsiyonel fuel_type) filtresiyle `ORDER BY created_at DESC LIMIT N`
+çalıştırır. Eski kısmi indeksler yalnızca boolean kolonu taşıdığı için
+Postgres eşleşen tüm satırları okuyup sıralıyordu. Yeni indeksler
+created_at DESC sıralı olduğundan ilk N satır doğrudan indeksten okunur.
+
+Yerini alan indeksler (idx_alert_unread, idx_alert_unresolved,
+idx_alert_fuel) kaldırılır; (fuel_type, created_at) bileşik indeksi
+sadece fuel_type filtresini de karşılar.
+
+İndeksler CONCURRENTLY oluşturulur — tablo yazmaya kilitlenmez
+(transaction dışında, autocommit bloğunda çalışır).
+
+Revision ID: 008_alerts_created_idx
+Revises: 007
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# Alembic revision bilgileri
+revision = "008_alerts_created_idx"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """created_at sıralı kısmi indeksleri oluşturur, eskilerini kaldırır."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_alert_unread_created", "alerts",
+            [sa.text("created_at DESC")],
+            postgresql_where=sa.text("is_read = FALSE"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "idx_alert_unresolved_created", "alerts",
+            [sa.text("created_at DESC")],
+            postgresql_where=sa.text("is_resolved = FALSE"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "idx_alert_fuel_created", "alerts",
+            ["fuel_type", sa.text("created_at DESC")],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+        op.drop_index("idx_alert_unread", table_name="alerts",
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_alert_unresolved", table_name="alerts",
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_alert_fuel", table_name="alerts",
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Eski boolean kısmi indeksleri geri yükler."""
+    with op.get_context().autocommit_block():
+        op.create_index("idx_alert_fuel", "alerts", ["fuel_type"],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index("idx_alert_unresolved", "alerts", ["is_resolved"],
+                        postgresql_where=sa.text("is_resolved = FALSE"),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index("idx_alert_unread", "alerts", ["is_read"],
+                        postgresql_where=sa.text("is_read = FALSE"),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+        op.drop_index("idx_alert_fuel_created", table_name="alerts",
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_alert_unresolved_created", table_name="alerts",
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index("idx_alert_unread_created", table_name="alerts",
+                      postgresql_concurrently=True, if_exists=True)
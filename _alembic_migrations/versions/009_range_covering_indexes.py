@@ -0,0 +1,63 @@
+"""
+009: mbe_calculations / cost_base_snapshots icin kapsayan (covering) indeksler.
+
+get_mbe_range_thin ve get_cost_snapshots_range_thin sorgulari
+`WHERE fuel_type = ? AND trade_date BETWEEN ? AND ? ORDER BY trade_date`
+filtresiyle yalnizca birkac kolon okur. (fuel_type, trade_date) indeksine
+bu kolonlar INCLUDE ile eklenir; Postgres index-only scan ile heap'e
+gitmeden sonucu dondurebilir.
+
+Indeks adlari degismez: yeni indeks gecici adla CONCURRENTLY olusturulur,
+eskisi kaldirilir ve yenisi eski ada tasinir (tablo yazmaya kilitlenmez).
+
+Revision ID: 009_range_covering_idx
+Revises: 008_alerts_created_idx
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# Alembic revision bilgileri
+revision = "009_range_covering_idx"
+down_revision = "008_alerts_created_idx"
+branch_labels = None
+depends_on = None
+
+
+_MBE_INCLUDE = ["mbe_value", "mbe_pct", "nc_forward", "nc_base", "trend_direction"]
+_COST_INCLUDE = [
+    "cif_component_tl",
+    "margin_component_tl",
+    "theoretical_cost_tl",
+    "actual_pump_price_tl",
+    "implied_cif_usd_ton",
+    "cost_gap_tl",
+    "cost_gap_pct",
+]
+
+
+def _swap_index(name: str, table: str, include: list[str] | None) -> None:
+    """(fuel_type, trade_date) indeksini verilen INCLUDE listesiyle yeniden kurar."""
+    tmp_name = f"{name}_new"
+    op.create_index(
+        tmp_name, table, ["fuel_type", "trade_date"],
+        postgresql_include=include or [],
+        postgresql_concurrently=True, if_not_exists=True,
+    )
+    op.drop_index(name, table_name=table,
+                  postgresql_concurrently=True, if_exists=True)
+    op.execute(f"ALTER INDEX {tmp_name} RENAME TO {name}")
+
+
+def upgrade() -> None:
+    """(fuel_type, trade_date) indekslerine okuma kolonlarini INCLUDE eder."""
+    with op.get_context().autocommit_block():
+        _swap_index("idx_mbe_calc_fuel_date", "mbe_calculations", _MBE_INCLUDE)
+        _swap_index("idx_cost_snapshot_fuel_date", "cost_base_snapshots", _COST_INCLUDE)
+
+
+def downgrade() -> None:
+    """INCLUDE kolonlarini kaldirir, duz (fuel_type, trade_date) indekse doner."""
+    with op.get_context().autocommit_block():
+        _swap_index("idx_cost_snapshot_fuel_date", "cost_base_snapshots", None)
+        _swap_index("idx_mbe_calc_fuel_date", "mbe_calculations", None)
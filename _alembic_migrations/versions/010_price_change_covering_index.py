@@ -0,0 +1,54 @@
+"""
+010: price_changes (fuel_type, change_date) indeksine kapsayan kolonlar.
+
+get_latest_price_change_summary sorgusu
+`WHERE fuel_type = ? ORDER BY change_date DESC LIMIT 1` filtresiyle
+yalnizca change_date, new_price ve direction okur. Bu kolonlar
+idx_price_change_fuel_date indeksine INCLUDE ile eklenir; Postgres
+indeksi geriye tarayarak heap'e gitmeden (index-only scan) sonucu
+dondurebilir.
+
+Indeks adi degismez: yeni indeks gecici adla CONCURRENTLY olusturulur,
+eskisi kaldirilir ve yenisi eski ada tasinir (tablo yazmaya kilitlenmez).
+
+Revision ID: 010_price_change_covering_idx
+Revises: 009_range_covering_idx
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# Alembic revision bilgileri
+revision = "010_price_change_covering_idx"
+down_revision = "009_range_covering_idx"
+branch_labels = None
+depends_on = None
+
+
+_INDEX_NAME = "idx_price_change_fuel_date"
+_SUMMARY_INCLUDE = ["new_price", "direction"]
+
+
+def _swap_index(include: list[str] | None) -> None:
+    """(fuel_type, change_date) indeksini verilen INCLUDE listesiyle yeniden kurar."""
+    tmp_name = f"{_INDEX_NAME}_new"
+    op.create_index(
+        tmp_name, "price_changes", ["fuel_type", "change_date"],
+        postgresql_include=include or [],
+        postgresql_concurrently=True, if_not_exists=True,
+    )
+    op.drop_index(_INDEX_NAME, table_name="price_changes",
+                  postgresql_concurrently=True, if_exists=True)
+    op.execute(f"ALTER INDEX {tmp_name} RENAME TO {_INDEX_NAME}")
+
+
+def upgrade() -> None:
+    """Ozet sorgusunun okudugu kolonlari indekse INCLUDE eder."""
+    with op.get_context().autocommit_block():
+        _swap_index(_SUMMARY_INCLUDE)
+
+
+def downgrade() -> None:
+    """INCLUDE kolonlarini kaldirir, duz (fuel_type, change_date) indekse doner."""
+    with op.get_context().autocommit_block():
+        _swap_index(None)
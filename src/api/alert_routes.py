@@ -13,9 +13,9 @@ from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
-from src.config.database import get_db
+from src.config.database import get_db, get_read_db
 from src.core.alert_repository import (
     get_alerts,
     get_alert_by_id,
@@ -78,7 +78,7 @@ async def list_alerts(
     unread: bool = Query(default=False, description="Sadece okunmamışları getir"),
     unresolved: bool = Query(default=False, description="Sadece çözülmemişleri getir"),
     limit: int = Query(default=100, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ) -> AlertListResponse:
     """
     Alert'leri filtreli olarak döndürür.
@@ -105,7 +105,7 @@ async def list_alerts(
 async def list_alerts_by_fuel(
     fuel_type: str,
     limit: int = Query(default=100, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ) -> AlertListResponse:
     """Belirtilen yakıt tipi için alert'leri döndürür."""
     if fuel_type not in {"benzin", "motorin", "lpg"}:
@@ -13,9 +13,9 @@ from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from src.config.database import get_db
+from src.config.database import get_read_db
 from src.core.delay_repository import (
     get_delay_history,
     get_delay_stats,
@@ -61,10 +61,10 @@ class DelayStatsResponse(BaseModel):
 
     fuel_type: str
     count: int
-    avg_delay: str
+    avg_delay: float
     max_delay: int
     min_delay: int
-    std_delay: str
+    std_delay: float
 
 
 # --- Endpoint'ler ---
@@ -80,7 +80,7 @@ async def list_pending(
         default=None,
         description="Yakıt tipi filtresi (benzin, motorin, lpg)",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ) -> DelayListResponse:
     """Watching durumundaki (bekleyen) gecikme kayıtlarını döndürür."""
     if fuel_type is not None and fuel_type not in {"benzin", "motorin", "lpg"}:
@@ -102,7 +102,7 @@ async def list_pending(
 async def list_history(
     fuel_type: str,
     limit: int = Query(default=50, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ) -> DelayListResponse:
     """Belirtilen yakıt tipi için gecikme geçmişini döndürür."""
     if fuel_type not in {"benzin", "motorin", "lpg"}:
@@ -123,7 +123,7 @@ async def list_history(
 )
 async def get_stats(
     fuel_type: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncConnection = Depends(get_read_db),
 ) -> DelayStatsResponse:
     """
     Belirtilen yakıt tipi için gecikme istatistiklerini döndürür.
@@ -253,9 +253,9 @@ async def trigger_mbe_calculation(
     # Hesaplama servisi burada cagrilacak (Katman 2 entegrasyonunda)
     # Simdilik sadece mevcut verileri kontrol edelim
     mbe = await get_mbe_at_date(db, request.trade_date, request.fuel_type)
-    snapshot = await get_cost_snapshot(db, request.trade_date, request.fuel_type)
 
     if mbe is not None:
+        snapshot = await get_cost_snapshot(db, request.trade_date, request.fuel_type)
         return CalculateResponse(
             status="exists",
             message=(
@@ -86,10 +86,10 @@ async def _fetch_feature_inputs(
     from src.data_collectors.tax_repository import get_current_tax
     from src.core.mbe_repository import (
         get_latest_mbe,
-        get_mbe_range,
-        get_cost_snapshots_range,
+        get_mbe_range_thin,
+        get_cost_snapshots_range_thin,
     )
-    from src.core.price_change_repository import get_latest_price_change
+    from src.core.price_change_repository import get_latest_price_change_summary
 
     # --- En son piyasa verisi ---
     market = await get_latest_data(db, fuel_type)
@@ -126,7 +126,7 @@ async def _fetch_feature_inputs(
     mbe_pct = float(mbe.mbe_pct) if mbe and mbe.mbe_pct is not None else 0.0
 
     # MBE gecmisi
-    mbe_range = await get_mbe_range(
+    mbe_range = await get_mbe_range_thin(
         db, fuel_type, lookback_start, target_date,
     )
     mbe_history = [
@@ -142,7 +142,7 @@ async def _fetch_feature_inputs(
     )
 
     # --- NC gecmisi ---
-    snapshots = await get_cost_snapshots_range(
+    snapshots = await get_cost_snapshots_range_thin(
         db, fuel_type, lookback_start, target_date,
     )
     nc_history = [
@@ -151,7 +151,7 @@ async def _fetch_feature_inputs(
     ]
 
     # --- Son fiyat degisikligi ---
-    last_change = await get_latest_price_change(db, fuel_type)
+    last_change = await get_latest_price_change_summary(db, fuel_type)
     days_since_last_hike = (
         (target_date - last_change.change_date).days
         if last_change and last_change.change_date
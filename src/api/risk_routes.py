@@ -19,7 +19,7 @@ from src.config.database import get_db
 from src.core.risk_repository import (
     get_high_risk_days,
     get_latest_risk,
-    get_risk_range,
+    get_risk_range_rows,
     upsert_risk_score,
 )
 from src.core.risk_engine import (
@@ -156,7 +156,7 @@ async def get_range(
             detail="Başlangıç tarihi bitiş tarihinden sonra olamaz",
         )
 
-    records = await get_risk_range(db, fuel_type, start_date, end_date)
+    records = await get_risk_range_rows(db, fuel_type, start_date, end_date)
     data = [RiskScoreResponse.model_validate(r) for r in records]
 
     return RiskScoreListResponse(count=len(data), data=data)
@@ -18,7 +18,7 @@ from src.core.mbe_calculator import (
     MBEResult,
     CostSnapshot,
     _safe_decimal,
-    calculate_nc_forward,
+    calculate_nc_forward_series,
     calculate_nc_base_from_pump,
     calculate_sma,
     calculate_full_mbe,
@@ -177,7 +177,13 @@ def run_mbe_backtest(
         total_days=len(scenario),
     )
 
-    # NC_forward serisi (pencere icin birikim)
+    # NC_forward degerleri tum senaryo icin tek geciste hesaplanir;
+    # dongu her gun pencereye bir sonraki degeri ekler
+    nc_forward_all = calculate_nc_forward_series(
+        [day.cif_usd_ton for day in scenario],
+        [day.fx_rate for day in scenario],
+        rho,
+    )
     nc_forward_history: list[Decimal] = []
 
     # Son zam bilgisi — ilk gun icin baslangic nc_base
@@ -197,12 +203,7 @@ def run_mbe_backtest(
     for i, day in enumerate(scenario):
         regime_config = get_regime_config(day.regime)
 
-        # NC_forward hesapla
-        nc_forward = calculate_nc_forward(
-            cif_usd_ton=day.cif_usd_ton,
-            fx_rate=day.fx_rate,
-            rho=rho,
-        )
+        nc_forward = nc_forward_all[i]
         nc_forward_history.append(nc_forward)
 
         # Zam gunu: nc_base guncelle (yeni pompa fiyatindan reverse-engineer)
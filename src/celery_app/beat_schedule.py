@@ -10,6 +10,11 @@ Değişiklik Geçmişi:
   sabah veri toplama + tahmin eklendi.
 - TASK-080: Timezone düzeltme — tüm saatler TSİ olarak ayarlandı,
   akşam bildirim (18:00 TSİ) eklendi.
+- MBE ve risk hesaplama tek task'ta birleştirildi
+  (calculate_daily_mbe_and_risk) — risk adımı MBE'nin okuduğu
+  satırları tekrar okumaz.
+- ML model durumu saatlik refresh_predictor_state ile yenilenir;
+  health_check predictor'ı her çalışmada yüklemez.
 """
 
 from celery.schedules import crontab
@@ -23,16 +28,11 @@ CELERY_BEAT_SCHEDULE = {
         "task": "src.celery_app.tasks.collect_daily_market_data",
         "schedule": crontab(hour=settings.DATA_FETCH_HOUR, minute=0),
     },
-    # 18:10 TSİ — veri toplama bittikten 10 dk sonra
-    "calculate-daily-mbe": {
-        "task": "src.celery_app.tasks.calculate_daily_mbe",
+    # 18:10 TSİ — veri toplama bittikten 10 dk sonra (MBE + risk tek task)
+    "calculate-daily-mbe-risk": {
+        "task": "src.celery_app.tasks.calculate_daily_mbe_and_risk",
         "schedule": crontab(hour=settings.DATA_FETCH_HOUR, minute=10),
     },
-    # 18:20 TSİ — MBE bittikten 10 dk sonra
-    "calculate-daily-risk": {
-        "task": "src.celery_app.tasks.calculate_daily_risk",
-        "schedule": crontab(hour=settings.DATA_FETCH_HOUR, minute=20),
-    },
     # 18:30 TSİ — veri toplama bittikten 30 dk sonra
     "run-daily-prediction": {
         "task": "src.celery_app.tasks.run_daily_prediction",
@@ -55,22 +55,14 @@ CELERY_BEAT_SCHEDULE = {
             minute=settings.MORNING_DATA_FETCH_MINUTE,
         ),
     },
-    # 10:25 TSİ — sabah MBE hesaplama
-    "calculate-morning-mbe": {
-        "task": "src.celery_app.tasks.calculate_daily_mbe",
+    # 10:25 TSİ — sabah MBE + risk hesaplama
+    "calculate-morning-mbe-risk": {
+        "task": "src.celery_app.tasks.calculate_daily_mbe_and_risk",
         "schedule": crontab(
             hour=settings.MORNING_DATA_FETCH_HOUR,
             minute=settings.MORNING_DATA_FETCH_MINUTE + 10,
         ),
     },
-    # 10:35 TSİ — sabah risk hesaplama
-    "calculate-morning-risk": {
-        "task": "src.celery_app.tasks.calculate_daily_risk",
-        "schedule": crontab(
-            hour=settings.MORNING_DATA_FETCH_HOUR,
-            minute=settings.MORNING_DATA_FETCH_MINUTE + 20,
-        ),
-    },
     # 10:45 TSİ — sabah tahmin güncelleme
     "run-morning-prediction": {
         "task": "src.celery_app.tasks.run_daily_prediction",
@@ -110,4 +102,9 @@ CELERY_BEAT_SCHEDULE = {
         "task": "src.celery_app.tasks.health_check",
         "schedule": crontab(minute="*/30"),
     },
+    # Her saat başı — ML model hazırlık durumu (health_check bunu okur)
+    "refresh-predictor-state": {
+        "task": "src.celery_app.tasks.refresh_predictor_state",
+        "schedule": crontab(minute=0),
+    },
 }
@@ -1,14 +1,20 @@
 """
 Celery uygulama konfigürasyonu.
 
-Celery app instance'ı, broker/backend ayarları ve
-Beat schedule yüklemesi burada yapılır.
+Celery app instance'ı, broker/backend ayarları,
+Beat schedule yüklemesi ve worker başına kalıcı event loop burada yapılır.
 """
 
+import asyncio
+import logging
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from src.config.settings import settings
 
+logger = logging.getLogger(__name__)
+
 celery_app = Celery(
     "yakit_analizi",
     broker=settings.REDIS_URL,
@@ -38,3 +44,65 @@ celery_app.conf.update(
 from src.celery_app.beat_schedule import CELERY_BEAT_SCHEDULE  # noqa: E402
 
 celery_app.conf.beat_schedule = CELERY_BEAT_SCHEDULE
+
+
+# ── Worker başına kalıcı event loop ─────────────────────────────────────────
+# asyncio.run() her çağrıda yeni loop açıp kapatır; asyncpg bağlantıları
+# oluşturuldukları loop'a bağlı olduğundan havuz task'lar arasında
+# yeniden kullanılamaz. Worker process'i boyunca tek loop tutulur.
+
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+# Loop kapanmadan önce çalıştırılacak async temizlik fonksiyonları
+# (loop'a bağlı client'lar: Redis vb.)
+_loop_cleanups: list = []
+
+
+def register_loop_cleanup(cleanup) -> None:
+    """Worker kapanışında kalıcı loop üzerinde await edilecek fonksiyonu kaydeder."""
+    _loop_cleanups.append(cleanup)
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Worker process'inin kalıcı event loop'unu döndürür (yoksa oluşturur)."""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
+
+
+def run_async(coro):
+    """Coroutine'i worker'ın kalıcı event loop'unda çalıştırır."""
+    return get_worker_loop().run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _init_worker_loop(**kwargs) -> None:
+    """Fork sonrası her worker process'i kendi event loop'unu açar."""
+    get_worker_loop()
+    logger.info("Worker event loop oluşturuldu")
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_loop(**kwargs) -> None:
+    """Worker kapanırken kayıtlı client'ları ve engine havuzunu kapatıp loop'u kapatır."""
+    global _worker_loop
+    loop = _worker_loop
+    if loop is None or loop.is_closed():
+        return
+
+    from src.config.database import dispose_engine
+
+    try:
+        for cleanup in _loop_cleanups:
+            try:
+                loop.run_until_complete(cleanup())
+            except Exception:
+                logger.exception("Worker kapanışında temizlik hatası: %s", cleanup)
+        loop.run_until_complete(dispose_engine())
+    except Exception:
+        logger.exception("Worker kapanışında engine dispose hatası")
+    finally:
+        loop.close()
+        _worker_loop = None
@@ -5,22 +5,56 @@ Günlük veri toplama, ML tahmin çalıştırma, bildirim gönderme
 ve sistem sağlık kontrolü görevlerini tanımlar.
 
 Her task sync Celery worker'da çalışır; async fonksiyonlar
-asyncio.run() ile sarmalanır.
+worker başına kalıcı event loop üzerinde run_async() ile çalıştırılır.
 
 TASK-025 güncellemesi:
 - collect_daily_market_data: Veri DB'ye upsert edilecek şekilde güncellendi
-- run_daily_prediction: placeholder → _fetch_and_compute_features (DB'den gerçek veri)
+- run_daily_prediction: placeholder → _fetch_all_features (tüm yakıtlar için DB'den gerçek veri)
 - LPG desteği eklendi
 - ML model yoksa graceful skip
 """
 
 import asyncio
+import bisect
+import json
 import logging
-from datetime import UTC, date, datetime
-from decimal import Decimal
-
-from src.celery_app.celery_config import celery_app
+import math
+import time
+from datetime import UTC, date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import psycopg2
+import psycopg2.extras
+import redis.asyncio
+from celery.signals import worker_process_init
+from sqlalchemy import Float, bindparam, cast, func, select
+from sqlalchemy import text as sa_text
+from telegram import Bot
+
+from src.celery_app.celery_config import celery_app, register_loop_cleanup, run_async
+from src.config.database import async_session_factory, read_engine
 from src.config.settings import settings
+from src.core.risk_engine import DEFAULT_WEIGHTS
+from src.data_collectors.brent_collector import fetch_brent_daily
+from src.data_collectors.epdk_collector import fetch_istanbul_avrupa
+from src.data_collectors.fx_collector import fetch_usd_try_daily
+from src.data_collectors.market_data_repository import bulk_upsert_market_data
+from src.ml.feature_engineering import FEATURE_NAMES, compute_all_features
+from src.ml.predictor import get_predictor
+from src.models.market_data import DailyMarketData
+from src.models.mbe_calculations import MBECalculation
+from src.models.tax_parameters import TaxParameter
+from src.repositories.ml_repository import bulk_upsert_ml_predictions
+
+# Telegram bildirim modülü opsiyonel — import modül yüklenirken bir kez
+# denenir; yoksa bildirim yardımcısı sentinel üzerinden atlanır
+try:
+    from src.telegram.notifications import (
+        send_daily_notifications as _send_telegram_notifications,
+    )
+except ImportError:
+    _send_telegram_notifications = None
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +73,7 @@ def collect_daily_market_data(self):
     logger.info("Günlük piyasa verisi toplama başlıyor...")
 
     try:
-        results = asyncio.run(_collect_all_data())
+        results = run_async(_collect_all_data())
         logger.info("Veri toplama tamamlandı: %s", results)
         return results
     except Exception as exc:
@@ -49,134 +83,94 @@ def collect_daily_market_data(self):
 
 async def _collect_all_data() -> dict:
     """Tüm veri kaynaklarından günlük veri çek ve DB'ye kaydet."""
-    from src.config.database import async_session_factory
-    from src.data_collectors.brent_collector import fetch_brent_daily
-    from src.data_collectors.epdk_collector import fetch_istanbul_avrupa
-    from src.data_collectors.fx_collector import fetch_usd_try_daily
-    from src.data_collectors.market_data_repository import upsert_market_data
-
     today = date.today()
     results = {}
 
-    # Toplanan ham verileri tutacak değişkenler
-    brent_data = None
-    fx_data = None
-    epdk_averages = {}
-
-    # 1. Brent petrol fiyatı
-    try:
-        brent_data = await fetch_brent_daily(today)
-        if brent_data is not None:
-            results["brent"] = {
-                "brent_usd_bbl": str(brent_data.brent_usd_bbl),
-                "cif_med_estimate_usd_ton": str(brent_data.cif_med_estimate_usd_ton),
-                "source": brent_data.source,
-            }
-            logger.info(
-                "Brent verisi alındı: %s USD/bbl (%s)",
-                brent_data.brent_usd_bbl,
-                brent_data.source,
-            )
-        else:
-            results["brent"] = None
-            logger.warning("Brent verisi alınamadı")
-    except Exception as e:
-        results["brent"] = f"HATA: {e}"
-        logger.exception("Brent veri toplama hatası")
-
-    # 2. USD/TRY döviz kuru
-    try:
-        fx_data = await fetch_usd_try_daily(today)
-        if fx_data is not None:
-            results["fx"] = {
-                "usd_try_rate": str(fx_data.usd_try_rate),
-                "source": fx_data.source,
-            }
-            logger.info(
-                "FX verisi alındı: %s TRY (%s)",
-                fx_data.usd_try_rate,
-                fx_data.source,
-            )
-        else:
-            results["fx"] = None
-            logger.warning("FX verisi alınamadı")
-    except Exception as e:
-        results["fx"] = f"HATA: {e}"
-        logger.exception("FX veri toplama hatası")
+    # Üç kaynak birbirinden bağımsız — HTTP istekleri eşzamanlı yapılır,
+    # toplam süre en yavaş kaynağın süresine iner
+    brent_res, fx_res, epdk_res = await asyncio.gather(
+        fetch_brent_daily(today),
+        fetch_usd_try_daily(today),
+        fetch_istanbul_avrupa(today),
+        return_exceptions=True,
+    )
+
+    # Her kaynağın sonucu tek geçişte results'a işlenir; bir kaynağın
+    # hatası diğerlerini etkilemez (return_exceptions=True)
+    results["brent"], brent_data = _unpack_source_result(
+        "Brent",
+        brent_res,
+        lambda d: {
+            "brent_usd_bbl": str(d.brent_usd_bbl),
+            "cif_med_estimate_usd_ton": str(d.cif_med_estimate_usd_ton),
+            "source": d.source,
+        },
+    )
+    results["fx"], fx_data = _unpack_source_result(
+        "FX",
+        fx_res,
+        lambda d: {"usd_try_rate": str(d.usd_try_rate), "source": d.source},
+    )
+    # PO pompa fiyatlari (Istanbul Avrupa / Avcilar)
+    results["epdk"], epdk_averages = _unpack_source_result(
+        "EPDK",
+        epdk_res,
+        lambda d: {fuel_type: str(price) for fuel_type, price in d.items()},
+    )
+    epdk_averages = epdk_averages or {}
+
+    # Toplanan verileri DB'ye kaydet (her yakıt tipi için ayrı satır,
+    # tek çok satırlı UPSERT ile)
+    db_saved = 0
 
-    # 3. PO pompa fiyatlari (Istanbul Avrupa / Avcilar)
-    try:
-        epdk_averages = await fetch_istanbul_avrupa(today)
-        if epdk_averages:
-            results["epdk"] = {
-                fuel_type: str(price)
-                for fuel_type, price in epdk_averages.items()
-            }
-            logger.info("PO Istanbul Avrupa fiyatlari alindi: %s", epdk_averages)
-        else:
-            epdk_averages = {}
-            results["epdk"] = None
-            logger.warning("PO Istanbul fiyatlari alinamadi")
-    except Exception as e:
-        epdk_averages = {}
-        results["epdk"] = f"HATA: {e}"
-        logger.exception("EPDK veri toplama hatası")
+    # Kaynak bilgisini derle — Brent/FX yakıt tipine göre değişmez,
+    # sadece pompa fiyatının varlığı kaynağı etkiler (döngü dışında bir kez)
+    base_sources = []
+    if brent_data:
+        base_sources.append(brent_data.source)
+    if fx_data:
+        base_sources.append(fx_data.source)
+    src_without_pump = "+".join(base_sources) if base_sources else "partial"
+    src_with_pump = "+".join([*base_sources, "po_istanbul_avcilar"])
+    # Brent ve FX birlikte varsa kalite sadece pompa fiyatına bağlıdır
+    has_brent_fx = brent_data is not None and fx_data is not None
+
+    rows = []
+    for fuel_type in ["benzin", "motorin", "lpg"]:
+        pump_price = epdk_averages.get(fuel_type)
+        rows.append({
+            "trade_date": today,
+            "fuel_type": fuel_type,
+            "brent_usd_bbl": brent_data.brent_usd_bbl if brent_data else None,
+            "cif_med_usd_ton": (
+                brent_data.cif_med_estimate_usd_ton if brent_data else None
+            ),
+            "usd_try_rate": fx_data.usd_try_rate if fx_data else None,
+            "pump_price_tl_lt": pump_price,
+            "data_quality_flag": (
+                "verified" if has_brent_fx and pump_price else "estimated"
+            ),
+            "source": (
+                src_with_pump if pump_price is not None else src_without_pump
+            ),
+        })
 
-    # 4. Toplanan verileri DB'ye kaydet (her yakıt tipi için ayrı satır)
-    db_saved = 0
     try:
         async with async_session_factory() as session:
             try:
-                for fuel_type in ["benzin", "motorin", "lpg"]:
-                    pump_price = epdk_averages.get(fuel_type)
-                    sources = []
-
-                    # Kaynak bilgisini derle
-                    if brent_data:
-                        sources.append(brent_data.source)
-                    if fx_data:
-                        sources.append(fx_data.source)
-                    if pump_price is not None:
-                        sources.append("po_istanbul_avcilar")
-
-                    source_str = "+".join(sources) if sources else "partial"
-
-                    await upsert_market_data(
-                        session,
-                        trade_date=today,
-                        fuel_type=fuel_type,
-                        brent_usd_bbl=(
-                            brent_data.brent_usd_bbl if brent_data else None
-                        ),
-                        cif_med_usd_ton=(
-                            brent_data.cif_med_estimate_usd_ton
-                            if brent_data
-                            else None
-                        ),
-                        usd_try_rate=(
-                            fx_data.usd_try_rate if fx_data else None
-                        ),
-                        pump_price_tl_lt=pump_price,
-                        data_quality_flag=(
-                            "verified"
-                            if brent_data and fx_data and pump_price
-                            else "estimated"
-                        ),
-                        source=source_str,
-                    )
-                    db_saved += 1
-                    logger.info(
-                        "DB'ye kaydedildi: %s/%s (kaynak: %s)",
-                        today,
-                        fuel_type,
-                        source_str,
-                    )
-
+                db_saved = await bulk_upsert_market_data(session, rows)
                 await session.commit()
             except Exception:
                 await session.rollback()
                 raise
 
+        for row in rows:
+            logger.info(
+                "DB'ye kaydedildi: %s/%s (kaynak: %s)",
+                today,
+                row["fuel_type"],
+                row["source"],
+            )
         results["db_saved"] = db_saved
         logger.info("Toplam %d kayıt DB'ye yazıldı", db_saved)
 
@@ -187,6 +181,24 @@ async def _collect_all_data() -> dict:
     return results
 
 
+def _unpack_source_result(name: str, res, summarize) -> tuple[object, object]:
+    """
+    gather sonucunu (results özeti, ham veri) çiftine çevirir.
+
+    Exception → ("HATA: ...", None), boş sonuç → (None, None),
+    başarılı sonuç → (summarize(res), res).
+    """
+    if isinstance(res, BaseException):
+        logger.error("%s veri toplama hatası", name, exc_info=res)
+        return f"HATA: {res}", None
+    if not res:
+        logger.warning("%s verisi alınamadı", name)
+        return None, None
+    summary = summarize(res)
+    logger.info("%s verisi alındı: %s", name, summary)
+    return summary, res
+
+
 # ── Task 2: Günlük ML Tahmin ────────────────────────────────────────────────
 
 
@@ -201,7 +213,7 @@ def run_daily_prediction(self):
     logger.info("Günlük ML tahmin başlıyor...")
 
     try:
-        results = asyncio.run(_run_predictions())
+        results = run_async(_run_predictions())
         logger.info("ML tahmin tamamlandı: %s", results)
         return results
     except Exception as exc:
@@ -211,10 +223,6 @@ def run_daily_prediction(self):
 
 async def _run_predictions() -> dict:
     """Her yakıt türü için ML tahmin çalıştır."""
-    from src.config.database import async_session_factory
-    from src.ml.predictor import get_predictor
-    from src.repositories.ml_repository import upsert_ml_prediction
-
     predictor = get_predictor()
 
     # Model yüklü değilse yükle
@@ -227,72 +235,184 @@ async def _run_predictions() -> dict:
             )
             return {"status": "skipped", "reason": "model_not_found"}
 
-    results = {}
     today = date.today()
 
-    for fuel_type in ["benzin", "motorin", "lpg"]:
-        try:
-            # DB'den gerçek feature hesapla
-            features = await _fetch_and_compute_features(fuel_type, today)
-
-            # Tahmin yap (fallback destekli)
-            prediction = predictor.predict_with_fallback(features)
+    # Üç yakıtın feature verisi tek seferde çekilir (tablo başına tek sorgu)
+    features_by_fuel = await _fetch_all_features(today, _PREDICTION_FUEL_TYPES)
 
-            # DB'ye kaydet
+    results = {}
+    rows = []
+    for fuel_type in _PREDICTION_FUEL_TYPES:
+        prediction = _predict_one(fuel_type, features_by_fuel[fuel_type], predictor)
+        if isinstance(prediction, str):
+            results[fuel_type] = prediction
+            continue
+        rows.append({
+            "fuel_type": fuel_type,
+            "prediction_date": today,
+            "predicted_direction": prediction.predicted_direction,
+            "probability_hike": prediction.probability_hike,
+            "probability_stable": prediction.probability_stable,
+            "probability_cut": prediction.probability_cut,
+            "expected_change_tl": prediction.expected_change_tl,
+            "model_version": prediction.model_version,
+            "system_mode": prediction.system_mode,
+            "shap_top_features": prediction.shap_top_features,
+        })
+        results[fuel_type] = {
+            "direction": prediction.predicted_direction,
+            "probability_hike": str(prediction.probability_hike),
+            "confidence": prediction.confidence,
+            "system_mode": prediction.system_mode,
+        }
+
+    # Tüm tahminleri tek session + tek transaction içinde toplu yaz
+    if rows:
+        try:
             async with async_session_factory() as session:
                 try:
-                    await upsert_ml_prediction(
-                        session,
-                        fuel_type=fuel_type,
-                        prediction_date=today,
-                        predicted_direction=prediction.predicted_direction,
-                        probability_hike=prediction.probability_hike,
-                        probability_stable=prediction.probability_stable,
-                        probability_cut=prediction.probability_cut,
-                        expected_change_tl=prediction.expected_change_tl,
-                        model_version=prediction.model_version,
-                        system_mode=prediction.system_mode,
-                        shap_top_features=prediction.shap_top_features,
-                    )
+                    await bulk_upsert_ml_predictions(session, rows)
                     await session.commit()
                 except Exception:
                     await session.rollback()
                     raise
-
-            results[fuel_type] = {
-                "direction": prediction.predicted_direction,
-                "probability_hike": str(prediction.probability_hike),
-                "confidence": prediction.confidence,
-                "system_mode": prediction.system_mode,
-            }
-            logger.info(
-                "%s tahmini: %s (p_hike=%s, mode=%s)",
-                fuel_type,
-                prediction.predicted_direction,
-                prediction.probability_hike,
-                prediction.system_mode,
-            )
-
         except Exception as e:
-            results[fuel_type] = f"HATA: {e}"
-            logger.exception("%s tahmin hatası", fuel_type)
+            logger.exception("ML tahmin DB kayıt hatası")
+            for row in rows:
+                results[row["fuel_type"]] = f"HATA: {e}"
 
     return results
 
 
+def _predict_one(fuel_type: str, features: dict[str, float], predictor):
+    """
+    Tek yakıt tipi için hazır feature'larla tahmin yap.
+
+    Hatalar yakıt tipi bazında yakalanır; diğer yakıtların tahmini etkilenmez.
+
+    Returns:
+        PredictionResult veya "HATA: ..." mesajı
+    """
+    try:
+        # Tahmin yap (fallback destekli)
+        prediction = predictor.predict_with_fallback(features)
+
+        logger.info(
+            "%s tahmini: %s (p_hike=%s, mode=%s)",
+            fuel_type,
+            prediction.predicted_direction,
+            prediction.probability_hike,
+            prediction.system_mode,
+        )
+        return prediction
+
+    except Exception as e:
+        logger.exception("%s tahmin hatası", fuel_type)
+        return f"HATA: {e}"
+
+
+# Veri yetersizliğinde dönülen sıfır feature şablonu (modül yüklenirken bir kez)
+_ZERO_FEATURES = dict.fromkeys(FEATURE_NAMES, 0.0)
+
+
+def _get_placeholder_features() -> dict[str, float]:
+    """Tüm FEATURE_NAMES için sıfır değerli feature sözlüğünün kopyasını döndürür."""
+    return _ZERO_FEATURES.copy()
+
+
+# Tahmin yapılan yakıt tipleri
+_PREDICTION_FUEL_TYPES = ["benzin", "motorin", "lpg"]
+
+# Feature sorguları modül seviyesinde bir kez kurulur; parametreler
+# bindparam ile verilir, böylece SQLAlchemy derleme cache'i her çağrıda isabet eder.
+# fts: yakıt tipleri (IN listesi), lb: lookback başlangıcı, td: hedef tarih
+# Her sorgu ilk kolon olarak fuel_type döndürür; satırlar Python'da gruplanır.
+# Piyasa/MBE/vergi kolonları SQL tarafında float'a çevrilir (NULL → varsayılan);
+# satırlar doğrudan float64 NumPy dizisine yüklenir, Decimal nesnesi oluşmaz.
+_FEATURE_MARKET_STMT = (
+    select(
+        DailyMarketData.fuel_type,
+        func.coalesce(cast(DailyMarketData.brent_usd_bbl, Float), 0.0),
+        func.coalesce(cast(DailyMarketData.usd_try_rate, Float), 0.0),
+        func.coalesce(cast(DailyMarketData.cif_med_usd_ton, Float), 0.0),
+        func.coalesce(cast(DailyMarketData.pump_price_tl_lt, Float), 0.0),
+    )
+    .where(
+        DailyMarketData.fuel_type.in_(bindparam("fts", expanding=True)),
+        DailyMarketData.trade_date >= bindparam("lb"),
+        DailyMarketData.trade_date <= bindparam("td"),
+    )
+    .order_by(DailyMarketData.fuel_type, DailyMarketData.trade_date.asc())
+)
+_FEATURE_MBE_STMT = (
+    select(
+        MBECalculation.fuel_type,
+        func.coalesce(cast(MBECalculation.mbe_value, Float), 0.0),
+        func.coalesce(cast(MBECalculation.mbe_pct, Float), 0.0),
+        func.coalesce(cast(MBECalculation.nc_forward, Float), 0.0),
+    )
+    .where(
+        MBECalculation.fuel_type.in_(bindparam("fts", expanding=True)),
+        MBECalculation.trade_date >= bindparam("lb"),
+        MBECalculation.trade_date <= bindparam("td"),
+    )
+    .order_by(MBECalculation.fuel_type, MBECalculation.trade_date.asc())
+)
+# Her yakıt için hedef tarihte geçerli en son vergi — row_number() penceresi
+_feature_tax_ranked = (
+    select(
+        TaxParameter.fuel_type,
+        func.coalesce(cast(TaxParameter.otv_fixed_tl, Float), 0.0).label("otv"),
+        func.coalesce(cast(TaxParameter.kdv_rate, Float), 0.20).label("kdv"),
+        func.row_number()
+        .over(
+            partition_by=TaxParameter.fuel_type,
+            order_by=TaxParameter.valid_from.desc(),
+        )
+        .label("rn"),
+    )
+    .where(
+        TaxParameter.fuel_type.in_(bindparam("fts", expanding=True)),
+        TaxParameter.valid_from <= bindparam("td"),
+    )
+    .subquery()
+)
+_FEATURE_TAX_STMT = select(
+    _feature_tax_ranked.c.fuel_type,
+    _feature_tax_ranked.c.otv,
+    _feature_tax_ranked.c.kdv,
+).where(_feature_tax_ranked.c.rn == 1)
+
+# Vergi parametreleri aylar arayla değişir — (yakıt tipi, tarih) bazında
+# süreç içi TTL cache; sıcak çağrılarda vergi sorgusu hiç atılmaz.
+# Değer: (son_geçerlilik_monotonic, otv_rate, kdv_rate)
+_TAX_CACHE_TTL_SECONDS = 3600
+_tax_cache: dict[tuple[str, date], tuple[float, float, float]] = {}
+
+
+def _get_cached_tax(fuel_type: str, target_date: date) -> tuple[float, float] | None:
+    """Süresi dolmamış cache kaydını (otv_rate, kdv_rate) olarak döndürür."""
+    entry = _tax_cache.get((fuel_type, target_date))
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1], entry[2]
+
+
+def _store_cached_tax(
+    fuel_type: str, target_date: date, otv_rate: float, kdv_rate: float
+) -> None:
+    """Vergi oranlarını TTL süresiyle cache'e yazar."""
+    expires_at = time.monotonic() + _TAX_CACHE_TTL_SECONDS
+    _tax_cache[(fuel_type, target_date)] = (expires_at, otv_rate, kdv_rate)
+
+
 async def _fetch_and_compute_features(
     fuel_type: str, target_date: date
 ) -> dict[str, float]:
     """
-    DB'den piyasa verisi çekip ML feature'ları hesaplar.
+    Tek yakıt tipi için ML feature'larını hesaplar.
 
-    Strateji:
-    1. daily_market_data'dan son N günlük veriyi çek
-    2. mbe_calculations'dan MBE geçmişini çek
-    3. tax_parameters'dan güncel vergiyi çek
-    4. compute_all_features() ile feature vektörü oluştur
-
-    Veri yetersizse sıfır değerlerle fallback yapar — ML durmuyor.
+    _fetch_all_features'ın tek yakıtlık kısayoludur.
 
     Args:
         fuel_type: Yakıt tipi (benzin, motorin, lpg)
@@ -301,109 +421,147 @@ async def _fetch_and_compute_features(
     Returns:
         Feature adı → değer sözlüğü
     """
-    from datetime import timedelta
+    features = await _fetch_all_features(target_date, [fuel_type])
+    return features[fuel_type]
+
+
+async def _fetch_all_features(
+    target_date: date, fuel_types: list[str]
+) -> dict[str, dict[str, float]]:
+    """
+    DB'den piyasa verisi çekip tüm yakıtlar için ML feature'ları hesaplar.
+
+    Strateji:
+    1. daily_market_data'dan son N günlük veriyi çek (tüm yakıtlar tek sorgu)
+    2. mbe_calculations'dan MBE geçmişini çek (tüm yakıtlar tek sorgu)
+    3. tax_parameters'dan güncel vergiyi çek (cache'te olmayan yakıtlar)
+    4. Satırları yakıt tipine göre grupla, her yakıt için
+       compute_all_features() ile feature vektörü oluştur
 
-    from src.config.database import async_session_factory
-    from src.ml.feature_engineering import FEATURE_NAMES, compute_all_features
+    Veri yetersizse sıfır değerlerle fallback yapar — ML durmuyor.
 
-    # Varsayılan sıfır feature'lar (fallback)
-    zero_features = {name: 0.0 for name in FEATURE_NAMES}
+    Args:
+        target_date: Tahmin tarihi
+        fuel_types: Feature hesaplanacak yakıt tipleri
 
+    Returns:
+        Yakıt tipi → (feature adı → değer) sözlüğü
+    """
     try:
-        async with async_session_factory() as session:
-            from sqlalchemy import select
-            from sqlalchemy.sql import func
-
-            from src.models.market_data import DailyMarketData
-            from src.models.mbe_calculations import MBECalculation
-            from src.models.tax_parameters import TaxParameter
-
-            # Son 15 günlük piyasa verisi çek
-            lookback_start = target_date - timedelta(days=15)
-            market_stmt = (
-                select(DailyMarketData)
-                .where(
-                    DailyMarketData.fuel_type == fuel_type,
-                    DailyMarketData.trade_date >= lookback_start,
-                    DailyMarketData.trade_date <= target_date,
-                )
-                .order_by(DailyMarketData.trade_date.asc())
-            )
-            market_result = await session.execute(market_stmt)
-            market_rows = list(market_result.scalars().all())
-
-            if not market_rows:
-                logger.warning(
-                    "%s için piyasa verisi bulunamadı — sıfır feature fallback",
-                    fuel_type,
-                )
-                return zero_features
-
-            # En son kaydı al
-            latest = market_rows[-1]
-            brent = float(latest.brent_usd_bbl or Decimal("0"))
-            fx = float(latest.usd_try_rate or Decimal("0"))
-            cif = float(latest.cif_med_usd_ton or Decimal("0"))
-            pump = float(latest.pump_price_tl_lt or Decimal("0"))
-
-            # Geçmiş seriler oluştur
-            brent_history = [
-                float(r.brent_usd_bbl or 0) for r in market_rows
-            ]
-            fx_history = [
-                float(r.usd_try_rate or 0) for r in market_rows
-            ]
-            cif_history = [
-                float(r.cif_med_usd_ton or 0) for r in market_rows
-            ]
-
-            # MBE geçmişi çek
-            mbe_stmt = (
-                select(MBECalculation)
-                .where(
-                    MBECalculation.fuel_type == fuel_type,
-                    MBECalculation.trade_date >= lookback_start,
-                    MBECalculation.trade_date <= target_date,
-                )
-                .order_by(MBECalculation.trade_date.asc())
+        # Son 15 günlük piyasa verisi, MBE geçmişi ve güncel vergi parametresi
+        params = {
+            "fts": list(fuel_types),
+            "lb": target_date - timedelta(days=15),
+            "td": target_date,
+        }
+
+        # Vergi oranları cache'te olan yakıtlar vergi sorgusuna girmez
+        taxes = {}
+        for fuel_type in fuel_types:
+            cached_tax = _get_cached_tax(fuel_type, target_date)
+            if cached_tax is not None:
+                taxes[fuel_type] = cached_tax
+        missing_tax = [ft for ft in fuel_types if ft not in taxes]
+
+        # AsyncSession tek session içinde sorguları sıralar — sorgular
+        # ayrı session'larda eşzamanlı çalıştırılır (round-trip'ler örtüşür)
+        queries = [
+            _rows_in_own_session(_FEATURE_MARKET_STMT, params),
+            _rows_in_own_session(_FEATURE_MBE_STMT, params),
+        ]
+        if missing_tax:
+            queries.append(
+                _rows_in_own_session(_FEATURE_TAX_STMT, {**params, "fts": missing_tax})
             )
-            mbe_result = await session.execute(mbe_stmt)
-            mbe_rows = list(mbe_result.scalars().all())
-
-            mbe_value = 0.0
-            mbe_pct = 0.0
-            mbe_history = []
-            previous_mbe = None
-            mbe_3_days_ago = None
-            nc_history = []
-
-            if mbe_rows:
-                latest_mbe = mbe_rows[-1]
-                mbe_value = float(latest_mbe.mbe_value or 0)
-                mbe_pct = float(latest_mbe.mbe_pct or 0)
-                mbe_history = [float(r.mbe_value or 0) for r in mbe_rows]
-                nc_history = [float(r.nc_forward or 0) for r in mbe_rows]
-
-                if len(mbe_rows) >= 2:
-                    previous_mbe = float(mbe_rows[-2].mbe_value or 0)
-                if len(mbe_rows) >= 4:
-                    mbe_3_days_ago = float(mbe_rows[-4].mbe_value or 0)
-
-            # Güncel vergi parametresini çek
-            tax_stmt = (
-                select(TaxParameter)
-                .where(
-                    TaxParameter.fuel_type == fuel_type,
-                    TaxParameter.valid_from <= target_date,
-                )
-                .order_by(TaxParameter.valid_from.desc())
-                .limit(1)
-            )
-            tax_result = await session.execute(tax_stmt)
-            tax_row = tax_result.scalar_one_or_none()
+        market_rows, mbe_rows, *tax_result = await asyncio.gather(*queries)
+    except Exception as exc:
+        logger.warning(
+            "Feature verisi çekme hatası — sıfır fallback: %s",
+            exc,
+        )
+        return {ft: _get_placeholder_features() for ft in fuel_types}
+
+    # Kolonlar: fuel_type, otv_fixed_tl, kdv_rate (SQL'de float, NULL → varsayılan)
+    for fuel_type, otv_rate, kdv_rate in (tax_result[0] if tax_result else []):
+        taxes[fuel_type] = (float(otv_rate), float(kdv_rate))
+        # Sadece bulunan kayıt cache'lenir — eksik vergi verisi
+        # sonradan eklenirse bir sonraki çağrıda görülsün
+        _store_cached_tax(fuel_type, target_date, *taxes[fuel_type])
 
-            otv_rate = float(tax_row.otv_fixed_tl or 0) if tax_row else 0.0
-            kdv_rate = float(tax_row.kdv_rate or Decimal("0.20")) if tax_row else 0.20
+    market_by_fuel = _group_rows_by_fuel(market_rows)
+    mbe_by_fuel = _group_rows_by_fuel(mbe_rows)
+
+    return {
+        fuel_type: _compute_features_for_fuel(
+            fuel_type,
+            target_date,
+            market_by_fuel.get(fuel_type, []),
+            mbe_by_fuel.get(fuel_type, []),
+            taxes.get(fuel_type, (0.0, 0.20)),
+        )
+        for fuel_type in fuel_types
+    }
+
+
+def _group_rows_by_fuel(rows) -> dict[str, list[tuple]]:
+    """İlk kolonu fuel_type olan satırları yakıt tipine göre gruplar."""
+    grouped: dict[str, list[tuple]] = {}
+    for row in rows:
+        grouped.setdefault(row[0], []).append(tuple(row[1:]))
+    return grouped
+
+
+def _compute_features_for_fuel(
+    fuel_type: str,
+    target_date: date,
+    market_rows: list[tuple],
+    mbe_rows: list[tuple],
+    tax: tuple[float, float],
+) -> dict[str, float]:
+    """
+    Tek yakıtın gruplanmış satırlarından feature vektörü hesaplar.
+
+    Returns:
+        Feature adı → değer sözlüğü (hata/veri yoksa sıfır fallback)
+    """
+    if not market_rows:
+        logger.warning(
+            "%s için piyasa verisi bulunamadı — sıfır feature fallback",
+            fuel_type,
+        )
+        return _get_placeholder_features()
+
+    try:
+        # Kolonlar: brent, fx, cif, pump
+        market = np.array(market_rows, dtype=np.float64)
+        brent, fx, cif, pump = (float(v) for v in market[-1])
+
+        # Geçmiş seriler — liste dönüşümü sadece compute_all_features sınırında
+        brent_history = market[:, 0].tolist()
+        fx_history = market[:, 1].tolist()
+        cif_history = market[:, 2].tolist()
+
+        mbe_value = 0.0
+        mbe_pct = 0.0
+        mbe_history = []
+        previous_mbe = None
+        mbe_3_days_ago = None
+        nc_history = []
+
+        if mbe_rows:
+            # Kolonlar: mbe_value, mbe_pct, nc_forward
+            mbe = np.array(mbe_rows, dtype=np.float64)
+            mbe_value = float(mbe[-1, 0])
+            mbe_pct = float(mbe[-1, 1])
+            mbe_history = mbe[:, 0].tolist()
+            nc_history = mbe[:, 2].tolist()
+
+            if len(mbe) >= 2:
+                previous_mbe = float(mbe[-2, 0])
+            if len(mbe) >= 4:
+                mbe_3_days_ago = float(mbe[-4, 0])
+
+        otv_rate, kdv_rate = tax
 
         # Feature hesapla
         record = compute_all_features(
@@ -441,7 +599,14 @@ async def _fetch_and_compute_features(
             fuel_type,
             exc,
         )
-        return zero_features
+        return _get_placeholder_features()
+
+
+async def _rows_in_own_session(stmt, params: dict) -> list:
+    """Sorguyu kendi session'ında çalıştırıp satır listesi döndürür."""
+    async with async_session_factory() as session:
+        result = await session.execute(stmt, params)
+        return list(result.all())
 
 
 # ── Task 3: Günlük Bildirim Gönderme ────────────────────────────────────────
@@ -493,6 +658,20 @@ def send_evening_notifications(self):
         raise self.retry(exc=exc)
 
 
+async def _send_notifications() -> dict:
+    """
+    src.telegram.notifications üzerinden async bildirim gönderir.
+
+    Modül yoksa (sentinel None) bildirim atlanır, hata fırlatılmaz.
+    """
+    if _send_telegram_notifications is None:
+        logger.warning("Telegram bildirim modülü bulunamadı — bildirim atlanıyor")
+        return {"status": "skipped", "reason": "telegram_module_not_found"}
+
+    result = await _send_telegram_notifications()
+    return {"status": "sent", "result": result}
+
+
 def _build_notification_message_sync() -> str:
     """
     Bildirim mesajını psycopg2 ile sync oluşturur.
@@ -501,8 +680,6 @@ def _build_notification_message_sync() -> str:
     yerine doğrudan psycopg2 kullanır. handlers.py'deki
     format_daily_notification() ile aynı formatı üretir.
     """
-    import psycopg2
-
     DB_URL = settings.sync_database_url
     MONTHS_TR = {
         1: "Ocak", 2: "Şubat", 3: "Mart", 4: "Nisan",
@@ -589,12 +766,8 @@ def _send_notification_sync(message_text: str) -> dict:
     Mesajı tüm aktif+onaylı kullanıcılara gönderir.
 
     Kullanıcı listesini psycopg2 ile çeker, mesaj gönderimini
-    asyncio.run() ile yapar (sadece Telegram API çağrısı, DB yok).
+    run_async() ile yapar (sadece Telegram API çağrısı, DB yok).
     """
-    import psycopg2
-
-    from telegram import Bot
-
     DB_URL = settings.sync_database_url
 
     # Kullanıcı listesini sync çek
@@ -630,10 +803,89 @@ def _send_notification_sync(message_text: str) -> dict:
             await asyncio.sleep(0.05)  # rate limit
         return {"sent": sent, "failed": failed, "total": total}
 
-    return asyncio.run(_send_all())
+    return run_async(_send_all())
+
+
+# ── Task 5: Günlük MBE + Risk Hesaplama ─────────────────────────────────────
+
+# Sync MBE/risk hesaplamalarında kullanılan sabitler
+_SYNC_FUEL_TYPES = ["benzin", "motorin", "lpg"]
+_RHO = {"benzin": Decimal("1180"), "motorin": Decimal("1190"), "lpg": Decimal("1750")}
+_PRECISION = Decimal("0.00000001")
+_RISK_WEIGHTS_JSON = json.dumps({k: str(v) for k, v in DEFAULT_WEIGHTS.items()})
+_RISK_ROW_TEMPLATE = "(%s,%s,%s,%s,%s,%s,%s,%s,%s::jsonb,%s)"
+_RISK_UPSERT_SQL = """
+    INSERT INTO risk_scores
+        (trade_date, fuel_type, composite_score, mbe_component,
+         fx_volatility_component, political_delay_component,
+         threshold_breach_component, trend_momentum_component,
+         weight_vector, system_mode)
+    VALUES %s
+    ON CONFLICT (trade_date, fuel_type) DO UPDATE SET
+        composite_score=EXCLUDED.composite_score, mbe_component=EXCLUDED.mbe_component,
+        fx_volatility_component=EXCLUDED.fx_volatility_component,
+        political_delay_component=EXCLUDED.political_delay_component,
+        threshold_breach_component=EXCLUDED.threshold_breach_component,
+        trend_momentum_component=EXCLUDED.trend_momentum_component,
+        weight_vector=EXCLUDED.weight_vector, system_mode=EXCLUDED.system_mode, updated_at=NOW()
+"""
+
+
+_SNAPSHOT_UPSERT_SQL = """
+    INSERT INTO cost_base_snapshots
+        (trade_date, fuel_type, market_data_id, tax_parameter_id,
+         cif_component_tl, otv_component_tl, kdv_component_tl,
+         margin_component_tl, theoretical_cost_tl, actual_pump_price_tl,
+         implied_cif_usd_ton, cost_gap_tl, cost_gap_pct, source)
+    VALUES %s
+    ON CONFLICT (trade_date, fuel_type) DO UPDATE SET
+        market_data_id=EXCLUDED.market_data_id, tax_parameter_id=EXCLUDED.tax_parameter_id,
+        cif_component_tl=EXCLUDED.cif_component_tl, otv_component_tl=EXCLUDED.otv_component_tl,
+        kdv_component_tl=EXCLUDED.kdv_component_tl, margin_component_tl=EXCLUDED.margin_component_tl,
+        theoretical_cost_tl=EXCLUDED.theoretical_cost_tl, actual_pump_price_tl=EXCLUDED.actual_pump_price_tl,
+        implied_cif_usd_ton=EXCLUDED.implied_cif_usd_ton, cost_gap_tl=EXCLUDED.cost_gap_tl,
+        cost_gap_pct=EXCLUDED.cost_gap_pct, source=EXCLUDED.source, updated_at=NOW()
+    RETURNING fuel_type, id
+"""
+_MBE_UPSERT_SQL = """
+    INSERT INTO mbe_calculations
+        (trade_date, fuel_type, cost_snapshot_id, nc_forward, nc_base,
+         mbe_value, mbe_pct, sma_5, sma_10, delta_mbe, delta_mbe_3,
+         trend_direction, regime, since_last_change_days, sma_window, source)
+    VALUES %s
+    ON CONFLICT (trade_date, fuel_type) DO UPDATE SET
+        cost_snapshot_id=EXCLUDED.cost_snapshot_id, nc_forward=EXCLUDED.nc_forward,
+        nc_base=EXCLUDED.nc_base, mbe_value=EXCLUDED.mbe_value, mbe_pct=EXCLUDED.mbe_pct,
+        sma_5=EXCLUDED.sma_5, sma_10=EXCLUDED.sma_10, delta_mbe=EXCLUDED.delta_mbe,
+        delta_mbe_3=EXCLUDED.delta_mbe_3, trend_direction=EXCLUDED.trend_direction,
+        regime=EXCLUDED.regime, since_last_change_days=EXCLUDED.since_last_change_days,
+        sma_window=EXCLUDED.sma_window, source=EXCLUDED.source, updated_at=NOW()
+"""
 
 
-# ── Task 5: Günlük MBE Hesaplama ────────────────────────────────────────────
+def _sd(v) -> Decimal:
+    """DB değerini güvenli şekilde Decimal'e çevirir (None → 0)."""
+    return Decimal(str(v)) if v is not None else Decimal("0")
+
+
+@celery_app.task(bind=True, max_retries=2, default_retry_delay=120)
+def calculate_daily_mbe_and_risk(self):
+    """
+    Günlük MBE + risk hesaplama tek task'ta.
+
+    Zamanlama: Veri toplamadan 10 dk sonra (18:10 / 10:25 TSİ).
+    MBE için okunan değerler (MBE geçmişi, since_last_change) risk
+    bileşenlerinde bellekten kullanılır; iki ayrı task'ın aynı satırları
+    tekrar okuması önlenir. Yazımlar tek transaction'da yapılır.
+    """
+    logger.info("Günlük MBE + risk hesaplama başlıyor...")
+    try:
+        results = _calculate_mbe_and_risk_sync()
+        logger.info("MBE + risk hesaplama tamamlandı: %s", results)
+        return results
+    except Exception as exc:
+        logger.exception("MBE + risk hesaplama hatası: %s", exc)
+        raise self.retry(exc=exc)
 
 
 @celery_app.task(bind=True, max_retries=2, default_retry_delay=120)
@@ -641,8 +893,8 @@ def calculate_daily_mbe(self):
     """
     Günlük MBE hesaplama: cost_base_snapshots + mbe_calculations.
 
-    Zamanlama: Veri toplamadan 10 dk sonra (18:10 / 08:10 TSİ).
-    daily_market_data ve tax_parameters üzerinden hesaplama yapar.
+    Beat zamanlamasında calculate_daily_mbe_and_risk kullanılır;
+    bu task manuel tetikleme için korunur.
     """
     logger.info("Günlük MBE hesaplama başlıyor...")
     try:
@@ -654,208 +906,414 @@ def calculate_daily_mbe(self):
         raise self.retry(exc=exc)
 
 
-def _calculate_mbe_sync() -> dict:
-    """Sync MBE hesaplama — psycopg2 ile doğrudan DB erişimi."""
-    import math
-    import psycopg2
-    import psycopg2.extras
-    from decimal import ROUND_HALF_UP
+def _load_tax_lookup(cur):
+    """
+    Tüm vergi parametrelerini yükleyip (yakıt, tarih) → vergi satırı
+    döndüren arama fonksiyonu üretir.
+    """
+    cur.execute("SELECT fuel_type, valid_from, otv_fixed_tl, kdv_rate FROM tax_parameters ORDER BY fuel_type, valid_from")
+    # ORDER BY valid_from sayesinde her yakıt listesi zaten sıralı;
+    # paralel tarih listesi ile bisect (O(log N)) arama yapılır
+    tax_params = {}
+    tax_dates = {}
+    for r in cur.fetchall():
+        tax_params.setdefault(r[0], []).append({"valid_from": r[1], "otv": r[2], "kdv": r[3]})
+        tax_dates.setdefault(r[0], []).append(r[1])
 
-    DB_URL = settings.sync_database_url
-    RHO = {"benzin": Decimal("1180"), "motorin": Decimal("1190"), "lpg": Decimal("1750")}
-    PRECISION = Decimal("0.00000001")
-    FUEL_TYPES = ["benzin", "motorin", "lpg"]
+    def find_tax(ft, td):
+        idx = bisect.bisect_right(tax_dates.get(ft, []), td) - 1
+        return tax_params[ft][idx] if idx >= 0 else None
+
+    return find_tax
+
+
+def _fetch_prev_mbe_rows(cur, today: date) -> dict[str, list[tuple]]:
+    """
+    Tüm yakıt tipleri için bugünden önceki son 10 MBE kaydını tek sorguda çeker.
 
-    def _sd(v):
-        return Decimal(str(v)) if v is not None else Decimal("0")
+    Returns:
+        Yakıt tipi → en yeni → en eski
+        (nc_forward, mbe_value, nc_base, since_last_change_days) listesi.
+    """
+    cur.execute("""
+        SELECT fuel_type, nc_forward, mbe_value, nc_base, since_last_change_days FROM (
+            SELECT fuel_type, trade_date, nc_forward, mbe_value, nc_base,
+                   since_last_change_days,
+                   row_number() OVER (PARTITION BY fuel_type ORDER BY trade_date DESC) AS rn
+            FROM mbe_calculations
+            WHERE fuel_type = ANY(%s::fuel_type_enum[]) AND trade_date<%s
+        ) t
+        WHERE rn <= 10
+        ORDER BY fuel_type, rn
+    """, (_SYNC_FUEL_TYPES, today))
+    prev_rows: dict[str, list[tuple]] = {}
+    for r in cur.fetchall():
+        prev_rows.setdefault(r[0], []).append(r[1:])
+    return prev_rows
+
+
+def _compute_mbe_for_fuel(
+    cur, ft: str, today: date, find_tax, prev_rows: list[tuple]
+) -> dict | str:
+    """
+    Tek yakıt tipi için cost snapshot + MBE satırlarını hesaplar.
+
+    Yazım yapılmaz; satırlar _write_mbe_results ile tüm yakıtlar için
+    toplu yazılır.
+
+    Args:
+        prev_rows: _fetch_prev_mbe_rows çıktısındaki bu yakıta ait
+            önceki MBE kayıtları (en yeni → en eski).
+
+    Returns:
+        Başarılıysa MBE sonuç sözlüğü (risk hesabı için ara değerler dahil),
+        hesaplama yapılamadıysa atlama nedeni (str).
+    """
+    rho = _RHO[ft]
+
+    # Bugünün market data'sını çek
+    cur.execute(
+        "SELECT id, brent_usd_bbl, usd_try_rate, pump_price_tl_lt, cif_med_usd_ton "
+        "FROM daily_market_data WHERE trade_date=%s AND fuel_type=%s",
+        (today, ft)
+    )
+    row = cur.fetchone()
+    if not row:
+        logger.warning("%s için %s market data bulunamadı", ft, today)
+        return "market_data_yok"
+
+    md_id, brent, fx, pump, cif = row
+    if brent is None or fx is None:
+        return "brent_veya_fx_null"
+
+    brent_d = _sd(brent)
+    fx_d = _sd(fx)
+    cif_d = _sd(cif) if cif else (brent_d * Decimal("7.33")).quantize(_PRECISION, rounding=ROUND_HALF_UP)
+    pump_d = _sd(pump) if pump else Decimal("0")
+
+    # Fiyat değişimi tespiti — önceki günün pompa fiyatıyla karşılaştır
+    price_changed = False
+    if pump_d:
+        cur.execute(
+            "SELECT pump_price_tl_lt FROM daily_market_data "
+            "WHERE fuel_type=%s AND trade_date<%s AND pump_price_tl_lt IS NOT NULL "
+            "ORDER BY trade_date DESC LIMIT 1",
+            (ft, today)
+        )
+        prev_pump_row = cur.fetchone()
+        if prev_pump_row:
+            prev_pump_d = _sd(prev_pump_row[0])
+            price_changed = abs(pump_d - prev_pump_d) > Decimal("0.01")
+
+    # Tax param
+    tp = find_tax(ft, today)
+    if not tp:
+        return "tax_param_yok"
+    otv = _sd(tp["otv"])
+    kdv = _sd(tp["kdv"])
+
+    # Cost snapshot hesapla
+    nc_fwd = (cif_d * fx_d / rho).quantize(_PRECISION, rounding=ROUND_HALF_UP)
+    otv_comp = otv
+    pre_kdv = nc_fwd + otv_comp + Decimal("0.04")  # marj
+    kdv_comp = (pre_kdv * kdv).quantize(_PRECISION, rounding=ROUND_HALF_UP)
+    theoretical = (pre_kdv + kdv_comp).quantize(_PRECISION, rounding=ROUND_HALF_UP)
+    cost_gap = (pump_d - theoretical).quantize(_PRECISION, rounding=ROUND_HALF_UP) if pump_d else Decimal("0")
+    cost_gap_pct = ((cost_gap / theoretical) * Decimal("100")).quantize(_PRECISION, rounding=ROUND_HALF_UP) if theoretical else Decimal("0")
+
+    # tax_parameter id bul
+    cur.execute(
+        "SELECT id FROM tax_parameters WHERE fuel_type=%s AND valid_from<=%s ORDER BY valid_from DESC LIMIT 1",
+        (ft, today)
+    )
+    tp_row = cur.fetchone()
+    tp_id = tp_row[0] if tp_row else 1
+
+    # Cost snapshot satırı — yazım _write_mbe_results'ta toplu yapılır
+    snapshot_row = (
+        today, ft, md_id, tp_id,
+        float(nc_fwd), float(otv_comp), float(kdv_comp),
+        0.04, float(theoretical), float(pump_d),
+        float(cif_d) if cif else None, float(cost_gap), float(cost_gap_pct), "celery",
+    )
+
+    # MBE hesapla — son 10 günlük nc_forward geçmişi
+    prev_nc = [Decimal(str(r[0])) for r in prev_rows][::-1]  # eski→yeni
+
+    # SMA-5 (nc_base'den önce hesaplanmalı — fiyat değişiminde nc_base = sma5)
+    all_nc = prev_nc + [nc_fwd]
+    window5 = all_nc[-5:] if len(all_nc) >= 5 else all_nc
+    sma5 = sum(window5) / Decimal(str(len(window5)))
+
+    # SMA-10
+    window10 = all_nc[-10:] if len(all_nc) >= 10 else all_nc
+    sma10 = sum(window10) / Decimal(str(len(window10)))
+
+    # nc_base: fiyat değişiminde SMA-5 ile güncelle, yoksa öncekini koru
+    if price_changed:
+        nc_base = sma5
+        logger.info(
+            "%s fiyat değişimi tespit edildi: %s → %s, nc_base=%s",
+            ft, prev_pump_d, pump_d, nc_base,
+        )
+    else:
+        nc_base = Decimal(str(prev_rows[0][2])) if prev_rows else nc_fwd
+
+    # MBE
+    mbe_val = (sma5 - nc_base).quantize(_PRECISION, rounding=ROUND_HALF_UP)
+    mbe_pct = ((mbe_val / nc_base) * Decimal("100")).quantize(_PRECISION, rounding=ROUND_HALF_UP) if nc_base != 0 else Decimal("0")
+
+    # Delta MBE — son 3 MBE (en yeni → en eski)
+    prev_mbe = [Decimal(str(r[1])) for r in prev_rows[:3]]
+    delta_mbe = float(mbe_val - prev_mbe[0]) if prev_mbe else None
+    delta_mbe_3 = float(mbe_val - prev_mbe[2]) if len(prev_mbe) >= 3 else None
+
+    # Trend
+    trend = "no_change"
+    if len(all_nc) >= 3:
+        if all_nc[-1] > all_nc[-3]: trend = "increase"
+        elif all_nc[-1] < all_nc[-3]: trend = "decrease"
+
+    # since_last_change — fiyat değişiminde sıfırla
+    if price_changed:
+        dslc = 1
+    else:
+        dslc = (prev_rows[0][3] + 1) if prev_rows else 1
+
+    # MBE satırı — cost_snapshot_id yazım sırasında eklenir
+    mbe_row = (
+        float(nc_fwd), float(nc_base),
+        float(mbe_val), float(mbe_pct), float(sma5), float(sma10),
+        delta_mbe, delta_mbe_3, trend, 0, dslc, 5, "celery",
+    )
+
+    logger.info("%s MBE=%s nc_fwd=%s", ft, mbe_val, nc_fwd)
+    return {
+        "mbe": float(mbe_val),
+        "nc_fwd": float(nc_fwd),
+        "dslc": dslc,
+        "snapshot_row": snapshot_row,
+        "mbe_row": mbe_row,
+        # Bugün dahil en yeni → en eski son 3 MBE (risk trend momentum için)
+        "mbe_hist": [float(mbe_val)] + [float(m) for m in prev_mbe[:2]],
+    }
+
+
+def _fetch_fx_history(cur, today: date) -> dict[str, list[float]]:
+    """
+    Tüm yakıt tipleri için son 5 günün USD/TRY kurlarını tek sorguda çeker.
+
+    Returns:
+        Yakıt tipi → en yeni → en eski kur listesi.
+    """
+    cur.execute("""
+        SELECT fuel_type, usd_try_rate FROM (
+            SELECT fuel_type, trade_date, usd_try_rate,
+                   row_number() OVER (PARTITION BY fuel_type ORDER BY trade_date DESC) AS rn
+            FROM daily_market_data
+            WHERE fuel_type = ANY(%s::fuel_type_enum[]) AND trade_date<=%s
+              AND usd_try_rate IS NOT NULL
+        ) t
+        WHERE rn <= 5
+        ORDER BY fuel_type, trade_date DESC
+    """, (_SYNC_FUEL_TYPES, today))
+    fx_history: dict[str, list[float]] = {}
+    for ft, rate in cur.fetchall():
+        fx_history.setdefault(ft, []).append(float(rate))
+    return fx_history
+
+
+def _compute_risk_row(
+    ft: str,
+    today: date,
+    mbe_val: float,
+    dslc: int,
+    mbe_hist: list[float],
+    fx_rows: list[float],
+) -> tuple:
+    """
+    Tek yakıt tipi için risk bileşenlerini hesaplar (DB erişimi yok).
+
+    Args:
+        mbe_val: Bugünün MBE değeri.
+        dslc: Son fiyat değişiminden bu yana geçen gün.
+        mbe_hist: En yeni → en eski son 3 MBE değeri (bugün dahil).
+        fx_rows: En yeni → en eski son 5 USD/TRY kuru.
+
+    Returns:
+        risk_scores upsert satırı (_RISK_ROW_TEMPLATE sırasıyla).
+    """
+    # MBE bileşeni: |MBE| / 5, normalize [0,1]
+    mbe_abs = abs(mbe_val)
+    mbe_norm = min(1.0, mbe_abs / 5.0)
+
+    # FX volatilite: son 5 günün USD/TRY standart sapması
+    fx_vol = 0.0
+    if len(fx_rows) >= 2:
+        mean_fx = sum(fx_rows) / len(fx_rows)
+        fx_vol = math.sqrt(sum((x - mean_fx) ** 2 for x in fx_rows) / (len(fx_rows) - 1))
+    fx_norm = min(1.0, fx_vol / 2.0)
+
+    # Politik gecikme: dslc / 60
+    pol_norm = min(1.0, dslc / 60.0)
+
+    # Threshold breach: MBE > 0.1 ise aktif
+    thresh_norm = min(1.0, mbe_abs / 1.0) if mbe_abs > 0.1 else 0.0
+
+    # Trend momentum: son 3 MBE değişim oranı
+    mom = 0.5
+    if len(mbe_hist) >= 3:
+        m1, m3 = mbe_hist[0], mbe_hist[2]
+        mr = (m1 - m3) / max(abs(m3), 0.01)
+        mom = min(1.0, max(0.0, (mr + 1) / 2))
+
+    # Composite skor
+    composite = min(1.0, max(0.0,
+        0.30 * mbe_norm + 0.15 * fx_norm + 0.20 * pol_norm +
+        0.20 * thresh_norm + 0.15 * mom
+    ))
+    sm = "crisis" if composite >= 0.80 else ("high_alert" if composite >= 0.60 else "normal")
+
+    logger.info("%s risk=%s mode=%s", ft, round(composite, 4), sm)
+    return (today, ft, round(composite, 4), round(mbe_norm, 4), round(fx_norm, 4),
+            round(pol_norm, 4), round(thresh_norm, 4), round(mom, 4), _RISK_WEIGHTS_JSON, sm)
+
+
+def _bulk_write(
+    cur, sql: str, rows: list[tuple], template: str | None = None, fetch: bool = False
+) -> list[tuple]:
+    """
+    Satırları tek çok-satırlı INSERT ile yazar (psycopg2 execute_values).
+
+    Sync task'lardaki tüm toplu yazımlar bu yardımcıdan geçer; satır sayısı
+    büyüdüğünde (bölgesel fiyatlar vb.) sayfa başına 1000 satır gönderilir.
+
+    Args:
+        sql: Tek ``VALUES %s`` yer tutuculu INSERT ifadesi
+        rows: Yazılacak satır tuple'ları
+        template: Satır şablonu (cast gereken kolonlar için)
+        fetch: RETURNING sonuçları döndürülsün mü
+
+    Returns:
+        fetch=True ise RETURNING satırları, aksi halde boş liste
+    """
+    if not rows:
+        return []
+    result = psycopg2.extras.execute_values(
+        cur, sql, rows, template=template, page_size=1000, fetch=fetch
+    )
+    return result if fetch else []
 
+
+def _write_mbe_results(cur, mbe_by_fuel: dict[str, dict]) -> None:
+    """
+    Tüm yakıtların cost snapshot ve MBE satırlarını iki toplu upsert ile yazar.
+
+    Snapshot id'leri RETURNING ile alınır ve her yakıtın sonucuna
+    ``cs_id`` olarak eklenir.
+    """
+    if not mbe_by_fuel:
+        return
+    returned = _bulk_write(
+        cur,
+        _SNAPSHOT_UPSERT_SQL,
+        [mbe["snapshot_row"] for mbe in mbe_by_fuel.values()],
+        fetch=True,
+    )
+    cs_ids = {ft: cs_id for ft, cs_id in returned}
+
+    mbe_rows = []
+    for ft, mbe in mbe_by_fuel.items():
+        mbe["cs_id"] = cs_ids[ft]
+        row = mbe["snapshot_row"]
+        mbe_rows.append((row[0], ft, mbe["cs_id"], *mbe["mbe_row"]))
+    _bulk_write(cur, _MBE_UPSERT_SQL, mbe_rows)
+    logger.info("MBE toplu yazıldı: %d yakıt (%s)", len(mbe_rows), ", ".join(mbe_by_fuel))
+
+
+def _upsert_risk_rows(cur, rows: list[tuple]) -> None:
+    """Risk satırlarını tek çok-satırlı INSERT ... ON CONFLICT ile yazar."""
+    _bulk_write(cur, _RISK_UPSERT_SQL, rows, template=_RISK_ROW_TEMPLATE)
+
+
+def _calculate_mbe_sync() -> dict:
+    """Sync MBE hesaplama — psycopg2 ile doğrudan DB erişimi."""
     today = date.today()
-    conn = psycopg2.connect(DB_URL)
+    conn = psycopg2.connect(settings.sync_database_url)
     conn.autocommit = False
     cur = conn.cursor()
     results = {}
 
     try:
-        # Tax params yükle
-        cur.execute("SELECT fuel_type, valid_from, otv_fixed_tl, kdv_rate FROM tax_parameters ORDER BY fuel_type, valid_from")
-        tax_params = {}
-        for r in cur.fetchall():
-            tax_params.setdefault(r[0], []).append({"valid_from": r[1], "otv": r[2], "kdv": r[3]})
+        find_tax = _load_tax_lookup(cur)
+        prev_mbe_rows = _fetch_prev_mbe_rows(cur, today)
+
+        mbe_by_fuel = {}
+        for ft in _SYNC_FUEL_TYPES:
+            mbe = _compute_mbe_for_fuel(cur, ft, today, find_tax, prev_mbe_rows.get(ft, []))
+            if isinstance(mbe, str):
+                results[ft] = mbe
+                continue
+            mbe_by_fuel[ft] = mbe
 
-        def find_tax(ft, td):
-            tps = tax_params.get(ft, [])
-            valid = [t for t in tps if t["valid_from"] <= td]
-            return valid[-1] if valid else None
+        _write_mbe_results(cur, mbe_by_fuel)
+        for ft, mbe in mbe_by_fuel.items():
+            results[ft] = {"mbe": mbe["mbe"], "nc_fwd": mbe["nc_fwd"], "cs_id": mbe["cs_id"]}
 
-        for ft in FUEL_TYPES:
-            rho = RHO[ft]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
 
-            # Bugünün market data'sını çek
-            cur.execute(
-                "SELECT id, brent_usd_bbl, usd_try_rate, pump_price_tl_lt, cif_med_usd_ton "
-                "FROM daily_market_data WHERE trade_date=%s AND fuel_type=%s",
-                (today, ft)
-            )
-            row = cur.fetchone()
-            if not row:
-                results[ft] = "market_data_yok"
-                logger.warning("%s için %s market data bulunamadı", ft, today)
-                continue
+    return results
 
-            md_id, brent, fx, pump, cif = row
-            if brent is None or fx is None:
-                results[ft] = "brent_veya_fx_null"
-                continue
 
-            brent_d = _sd(brent)
-            fx_d = _sd(fx)
-            cif_d = _sd(cif) if cif else (brent_d * Decimal("7.33")).quantize(PRECISION, rounding=ROUND_HALF_UP)
-            pump_d = _sd(pump) if pump else Decimal("0")
-
-            # Fiyat değişimi tespiti — önceki günün pompa fiyatıyla karşılaştır
-            price_changed = False
-            if pump_d:
-                cur.execute(
-                    "SELECT pump_price_tl_lt FROM daily_market_data "
-                    "WHERE fuel_type=%s AND trade_date<%s AND pump_price_tl_lt IS NOT NULL "
-                    "ORDER BY trade_date DESC LIMIT 1",
-                    (ft, today)
-                )
-                prev_pump_row = cur.fetchone()
-                if prev_pump_row:
-                    prev_pump_d = _sd(prev_pump_row[0])
-                    price_changed = abs(pump_d - prev_pump_d) > Decimal("0.01")
-
-            # Tax param
-            tp = find_tax(ft, today)
-            if not tp:
-                results[ft] = "tax_param_yok"
+def _calculate_mbe_and_risk_sync() -> dict:
+    """
+    Sync MBE + risk hesaplama — tek bağlantı, tek transaction.
+
+    MBE adımında hesaplanan/okunan değerler (bugünün MBE'si,
+    since_last_change, önceki MBE'ler) risk adımına bellekten aktarılır;
+    mbe_calculations tekrar okunmaz.
+    """
+    today = date.today()
+    conn = psycopg2.connect(settings.sync_database_url)
+    conn.autocommit = False
+    cur = conn.cursor()
+    results = {}
+
+    try:
+        find_tax = _load_tax_lookup(cur)
+        prev_mbe_rows = _fetch_prev_mbe_rows(cur, today)
+
+        mbe_by_fuel = {}
+        for ft in _SYNC_FUEL_TYPES:
+            mbe = _compute_mbe_for_fuel(cur, ft, today, find_tax, prev_mbe_rows.get(ft, []))
+            if isinstance(mbe, str):
+                results[ft] = {"mbe": mbe, "risk": "mbe_yok"}
                 continue
-            otv = _sd(tp["otv"])
-            kdv = _sd(tp["kdv"])
-
-            # Cost snapshot hesapla
-            nc_fwd = (cif_d * fx_d / rho).quantize(PRECISION, rounding=ROUND_HALF_UP)
-            otv_comp = otv
-            pre_kdv = nc_fwd + otv_comp + Decimal("0.04")  # marj
-            kdv_comp = (pre_kdv * kdv).quantize(PRECISION, rounding=ROUND_HALF_UP)
-            theoretical = (pre_kdv + kdv_comp).quantize(PRECISION, rounding=ROUND_HALF_UP)
-            cost_gap = (pump_d - theoretical).quantize(PRECISION, rounding=ROUND_HALF_UP) if pump_d else Decimal("0")
-            cost_gap_pct = ((cost_gap / theoretical) * Decimal("100")).quantize(PRECISION, rounding=ROUND_HALF_UP) if theoretical else Decimal("0")
-
-            # tax_parameter id bul
-            cur.execute(
-                "SELECT id FROM tax_parameters WHERE fuel_type=%s AND valid_from<=%s ORDER BY valid_from DESC LIMIT 1",
-                (ft, today)
+            mbe_by_fuel[ft] = mbe
+
+        # Snapshot + MBE yazımı: yakıt başına değil, tablo başına tek upsert
+        _write_mbe_results(cur, mbe_by_fuel)
+
+        # Risk: FX geçmişi tek sorgu, risk satırları tek çok-satırlı upsert
+        fx_history = _fetch_fx_history(cur, today) if mbe_by_fuel else {}
+        risk_rows = []
+        for ft, mbe in mbe_by_fuel.items():
+            row = _compute_risk_row(
+                ft, today, mbe["mbe"], mbe["dslc"], mbe["mbe_hist"],
+                fx_history.get(ft, []),
             )
-            tp_row = cur.fetchone()
-            tp_id = tp_row[0] if tp_row else 1
-
-            # Cost snapshot upsert
-            cur.execute("""
-                INSERT INTO cost_base_snapshots
-                    (trade_date, fuel_type, market_data_id, tax_parameter_id,
-                     cif_component_tl, otv_component_tl, kdv_component_tl,
-                     margin_component_tl, theoretical_cost_tl, actual_pump_price_tl,
-                     implied_cif_usd_ton, cost_gap_tl, cost_gap_pct, source)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                ON CONFLICT (trade_date, fuel_type) DO UPDATE SET
-                    market_data_id=EXCLUDED.market_data_id, tax_parameter_id=EXCLUDED.tax_parameter_id,
-                    cif_component_tl=EXCLUDED.cif_component_tl, otv_component_tl=EXCLUDED.otv_component_tl,
-                    kdv_component_tl=EXCLUDED.kdv_component_tl, margin_component_tl=EXCLUDED.margin_component_tl,
-                    theoretical_cost_tl=EXCLUDED.theoretical_cost_tl, actual_pump_price_tl=EXCLUDED.actual_pump_price_tl,
-                    implied_cif_usd_ton=EXCLUDED.implied_cif_usd_ton, cost_gap_tl=EXCLUDED.cost_gap_tl,
-                    cost_gap_pct=EXCLUDED.cost_gap_pct, source=EXCLUDED.source, updated_at=NOW()
-                RETURNING id
-            """, (today, ft, md_id, tp_id,
-                   float(nc_fwd), float(otv_comp), float(kdv_comp),
-                   0.04, float(theoretical), float(pump_d),
-                   float(cif_d) if cif else None, float(cost_gap), float(cost_gap_pct), "celery"))
-            cs_id = cur.fetchone()[0]
-
-            # MBE hesapla — son 10 günlük nc_forward geçmişi al
-            cur.execute(
-                "SELECT nc_forward FROM mbe_calculations WHERE fuel_type=%s AND trade_date<%s ORDER BY trade_date DESC LIMIT 10",
-                (ft, today)
-            )
-            prev_nc = [Decimal(str(r[0])) for r in cur.fetchall()][::-1]  # eski→yeni
-
-            # SMA-5 (nc_base'den önce hesaplanmalı — fiyat değişiminde nc_base = sma5)
-            all_nc = prev_nc + [nc_fwd]
-            window5 = all_nc[-5:] if len(all_nc) >= 5 else all_nc
-            sma5 = sum(window5) / Decimal(str(len(window5)))
-
-            # SMA-10
-            window10 = all_nc[-10:] if len(all_nc) >= 10 else all_nc
-            sma10 = sum(window10) / Decimal(str(len(window10)))
-
-            # nc_base: fiyat değişiminde SMA-5 ile güncelle, yoksa öncekini koru
-            if price_changed:
-                nc_base = sma5
-                logger.info(
-                    "%s fiyat değişimi tespit edildi: %s → %s, nc_base=%s",
-                    ft, prev_pump_d, pump_d, nc_base,
-                )
-            else:
-                cur.execute(
-                    "SELECT nc_base FROM mbe_calculations "
-                    "WHERE fuel_type=%s AND trade_date<%s ORDER BY trade_date DESC LIMIT 1",
-                    (ft, today)
-                )
-                prev_base_row = cur.fetchone()
-                nc_base = Decimal(str(prev_base_row[0])) if prev_base_row else nc_fwd
-
-            # MBE
-            mbe_val = (sma5 - nc_base).quantize(PRECISION, rounding=ROUND_HALF_UP)
-            mbe_pct = ((mbe_val / nc_base) * Decimal("100")).quantize(PRECISION, rounding=ROUND_HALF_UP) if nc_base != 0 else Decimal("0")
-
-            # Delta MBE
-            cur.execute(
-                "SELECT mbe_value FROM mbe_calculations WHERE fuel_type=%s AND trade_date<%s ORDER BY trade_date DESC LIMIT 3",
-                (ft, today)
-            )
-            prev_mbe = [Decimal(str(r[0])) for r in cur.fetchall()]
-            delta_mbe = float(mbe_val - prev_mbe[0]) if prev_mbe else None
-            delta_mbe_3 = float(mbe_val - prev_mbe[2]) if len(prev_mbe) >= 3 else None
-
-            # Trend
-            trend = "no_change"
-            if len(all_nc) >= 3:
-                if all_nc[-1] > all_nc[-3]: trend = "increase"
-                elif all_nc[-1] < all_nc[-3]: trend = "decrease"
-
-            # since_last_change — fiyat değişiminde sıfırla
-            if price_changed:
-                dslc = 1
-            else:
-                cur.execute(
-                    "SELECT since_last_change_days FROM mbe_calculations "
-                    "WHERE fuel_type=%s AND trade_date<%s ORDER BY trade_date DESC LIMIT 1",
-                    (ft, today)
-                )
-                slc_row = cur.fetchone()
-                dslc = (slc_row[0] + 1) if slc_row else 1
-
-            # MBE upsert
-            cur.execute("""
-                INSERT INTO mbe_calculations
-                    (trade_date, fuel_type, cost_snapshot_id, nc_forward, nc_base,
-                     mbe_value, mbe_pct, sma_5, sma_10, delta_mbe, delta_mbe_3,
-                     trend_direction, regime, since_last_change_days, sma_window, source)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                ON CONFLICT (trade_date, fuel_type) DO UPDATE SET
-                    cost_snapshot_id=EXCLUDED.cost_snapshot_id, nc_forward=EXCLUDED.nc_forward,
-                    nc_base=EXCLUDED.nc_base, mbe_value=EXCLUDED.mbe_value, mbe_pct=EXCLUDED.mbe_pct,
-                    sma_5=EXCLUDED.sma_5, sma_10=EXCLUDED.sma_10, delta_mbe=EXCLUDED.delta_mbe,
-                    delta_mbe_3=EXCLUDED.delta_mbe_3, trend_direction=EXCLUDED.trend_direction,
-                    regime=EXCLUDED.regime, since_last_change_days=EXCLUDED.since_last_change_days,
-                    sma_window=EXCLUDED.sma_window, source=EXCLUDED.source, updated_at=NOW()
-            """, (today, ft, cs_id, float(nc_fwd), float(nc_base),
-                   float(mbe_val), float(mbe_pct), float(sma5), float(sma10),
-                   delta_mbe, delta_mbe_3, trend, 0, dslc, 5, "celery"))
-
-            results[ft] = {"mbe": float(mbe_val), "nc_fwd": float(nc_fwd), "cs_id": cs_id}
-            logger.info("%s MBE=%s nc_fwd=%s", ft, mbe_val, nc_fwd)
+            risk_rows.append(row)
+            results[ft] = {
+                "mbe": {"mbe": mbe["mbe"], "nc_fwd": mbe["nc_fwd"], "cs_id": mbe["cs_id"]},
+                "risk": {"composite": row[2], "mode": row[9]},
+            }
+        _upsert_risk_rows(cur, risk_rows)
 
         conn.commit()
     except Exception:
@@ -876,8 +1334,9 @@ def calculate_daily_risk(self):
     """
     Günlük risk skoru hesaplama.
 
-    Zamanlama: MBE hesaplamasından 10 dk sonra (18:20 / 08:20 TSİ).
     MBE, FX volatilite, politik gecikme, threshold breach, trend momentum.
+    Beat zamanlamasında calculate_daily_mbe_and_risk kullanılır;
+    bu task manuel tetikleme için korunur.
     """
     logger.info("Günlük risk hesaplama başlıyor...")
     try:
@@ -891,95 +1350,44 @@ def calculate_daily_risk(self):
 
 def _calculate_risk_sync() -> dict:
     """Sync risk hesaplama — psycopg2 ile doğrudan DB erişimi."""
-    import math
-    import psycopg2
-
-    DB_URL = settings.sync_database_url
-    FUEL_TYPES = ["benzin", "motorin", "lpg"]
-    WJ = '{"mbe": "0.30", "fx_volatility": "0.15", "political_delay": "0.20", "threshold_breach": "0.20", "trend_momentum": "0.15"}'
-
     today = date.today()
-    conn = psycopg2.connect(DB_URL)
+    conn = psycopg2.connect(settings.sync_database_url)
     conn.autocommit = False
     cur = conn.cursor()
     results = {}
 
     try:
-        for ft in FUEL_TYPES:
-            # Bugünün MBE'sini al
-            cur.execute(
-                "SELECT mbe_value, since_last_change_days FROM mbe_calculations WHERE fuel_type=%s AND trade_date=%s",
-                (ft, today)
-            )
-            mbe_row = cur.fetchone()
-            if not mbe_row:
+        # Tüm yakıtlar için bugün dahil son 3 MBE (en yeni → en eski) tek sorguda
+        cur.execute("""
+            SELECT fuel_type, trade_date, mbe_value, since_last_change_days FROM (
+                SELECT fuel_type, trade_date, mbe_value, since_last_change_days,
+                       row_number() OVER (PARTITION BY fuel_type ORDER BY trade_date DESC) AS rn
+                FROM mbe_calculations
+                WHERE fuel_type = ANY(%s::fuel_type_enum[]) AND trade_date<=%s
+            ) t
+            WHERE rn <= 3
+            ORDER BY fuel_type, trade_date DESC
+        """, (_SYNC_FUEL_TYPES, today))
+        mbe_rows_by_fuel = {}
+        for r in cur.fetchall():
+            mbe_rows_by_fuel.setdefault(r[0], []).append(r[1:])
+
+        fx_history = _fetch_fx_history(cur, today)
+        risk_rows = []
+        for ft in _SYNC_FUEL_TYPES:
+            mbe_rows = mbe_rows_by_fuel.get(ft, [])
+            if not mbe_rows or mbe_rows[0][0] != today:
                 results[ft] = "mbe_yok"
                 continue
 
-            mbe_val = float(mbe_row[0])
-            dslc = mbe_row[1] or 1
-
-            # MBE bileşeni: |MBE| / 5, normalize [0,1]
-            mbe_abs = abs(mbe_val)
-            mbe_norm = min(1.0, mbe_abs / 5.0)
-
-            # FX volatilite: son 5 günün USD/TRY standart sapması
-            cur.execute(
-                "SELECT usd_try_rate FROM daily_market_data WHERE fuel_type=%s AND trade_date<=%s AND usd_try_rate IS NOT NULL ORDER BY trade_date DESC LIMIT 5",
-                (ft, today)
-            )
-            fx_rows = [float(r[0]) for r in cur.fetchall()]
-            fx_vol = 0.0
-            if len(fx_rows) >= 2:
-                mean_fx = sum(fx_rows) / len(fx_rows)
-                fx_vol = math.sqrt(sum((x - mean_fx) ** 2 for x in fx_rows) / (len(fx_rows) - 1))
-            fx_norm = min(1.0, fx_vol / 2.0)
-
-            # Politik gecikme: dslc / 60
-            pol_norm = min(1.0, dslc / 60.0)
-
-            # Threshold breach: MBE > 0.1 ise aktif
-            thresh_norm = min(1.0, mbe_abs / 1.0) if mbe_abs > 0.1 else 0.0
-
-            # Trend momentum: son 3 MBE değişim oranı
-            cur.execute(
-                "SELECT mbe_value FROM mbe_calculations WHERE fuel_type=%s AND trade_date<=%s ORDER BY trade_date DESC LIMIT 3",
-                (ft, today)
+            mbe_hist = [float(r[1]) for r in mbe_rows]
+            dslc = mbe_rows[0][2] or 1
+            row = _compute_risk_row(
+                ft, today, mbe_hist[0], dslc, mbe_hist, fx_history.get(ft, [])
             )
-            mbe_hist = [float(r[0]) for r in cur.fetchall()]
-            mom = 0.5
-            if len(mbe_hist) >= 3:
-                m1, m3 = mbe_hist[0], mbe_hist[2]
-                mr = (m1 - m3) / max(abs(m3), 0.01)
-                mom = min(1.0, max(0.0, (mr + 1) / 2))
-
-            # Composite skor
-            composite = min(1.0, max(0.0,
-                0.30 * mbe_norm + 0.15 * fx_norm + 0.20 * pol_norm +
-                0.20 * thresh_norm + 0.15 * mom
-            ))
-            sm = "crisis" if composite >= 0.80 else ("high_alert" if composite >= 0.60 else "normal")
-
-            # Risk upsert
-            cur.execute("""
-                INSERT INTO risk_scores
-                    (trade_date, fuel_type, composite_score, mbe_component,
-                     fx_volatility_component, political_delay_component,
-                     threshold_breach_component, trend_momentum_component,
-                     weight_vector, system_mode)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s::jsonb,%s)
-                ON CONFLICT (trade_date, fuel_type) DO UPDATE SET
-                    composite_score=EXCLUDED.composite_score, mbe_component=EXCLUDED.mbe_component,
-                    fx_volatility_component=EXCLUDED.fx_volatility_component,
-                    political_delay_component=EXCLUDED.political_delay_component,
-                    threshold_breach_component=EXCLUDED.threshold_breach_component,
-                    trend_momentum_component=EXCLUDED.trend_momentum_component,
-                    weight_vector=EXCLUDED.weight_vector, system_mode=EXCLUDED.system_mode, updated_at=NOW()
-            """, (today, ft, round(composite, 4), round(mbe_norm, 4), round(fx_norm, 4),
-                   round(pol_norm, 4), round(thresh_norm, 4), round(mom, 4), WJ, sm))
-
-            results[ft] = {"composite": round(composite, 4), "mode": sm}
-            logger.info("%s risk=%s mode=%s", ft, round(composite, 4), sm)
+            risk_rows.append(row)
+            results[ft] = {"composite": row[2], "mode": row[9]}
+        _upsert_risk_rows(cur, risk_rows)
 
         conn.commit()
     except Exception:
@@ -1003,11 +1411,63 @@ def health_check():
     DB, Redis ve ML model durumunu kontrol eder.
     """
     logger.info("Sağlık kontrolü başlıyor...")
-    result = asyncio.run(_check_health())
+    result = run_async(_check_health())
     logger.info("Sağlık kontrolü tamamlandı: %s", result)
     return result
 
 
+_redis_client = None
+
+
+def _get_redis_client():
+    """
+    Sağlık kontrolü için process başına tek async Redis client döndürür.
+
+    Client kendi connection pool'unu tutar; her kontrolde yeni
+    TCP bağlantısı açılmaz. Async client worker'ın kalıcı event
+    loop'unda çalışır, ping event loop'u bloklamaz.
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.asyncio.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+            # Kontroller arası 30 dk boşta kalan bağlantı NAT/firewall
+            # tarafından sessizce düşürülmesin
+            socket_keepalive=True,
+            health_check_interval=30,
+        )
+    return _redis_client
+
+
+async def _close_redis_client() -> None:
+    """Worker kapanışında Redis connection pool'unu kalıcı loop üzerinde kapatır."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+register_loop_cleanup(_close_redis_client)
+
+
+# Sağlık kontrolü bağlantıları AUTOCOMMIT — ORM session kurulmaz,
+# SELECT 1 öncesinde ayrı BEGIN round-trip'i gitmez (pool ortak)
+_HEALTH_ENGINE = read_engine
+
+
+async def _ping_db() -> None:
+    """DB'ye SELECT 1 gönderir; bağlantı yoksa exception fırlatır."""
+    async with _HEALTH_ENGINE.connect() as conn:
+        await conn.execute(sa_text("SELECT 1"))
+
+
+async def _ping_redis() -> None:
+    """Redis'e PING gönderir; bağlantı yoksa exception fırlatır."""
+    await _get_redis_client().ping()
+
+
 async def _check_health() -> dict:
     """DB bağlantısı, Redis ve ML model durumunu kontrol et."""
     status = {
@@ -1017,38 +1477,73 @@ async def _check_health() -> dict:
         "timestamp": datetime.now(UTC).isoformat(),
     }
 
-    # DB kontrolü
-    try:
-        from sqlalchemy import text as sa_text
+    # DB, Redis ve ML kontrolleri birbirinden bağımsız — eşzamanlı çalıştırılır
+    db_res, redis_res, ml_res = await asyncio.gather(
+        _ping_db(), _ping_redis(), _check_ml(), return_exceptions=True
+    )
+    if isinstance(db_res, BaseException):
+        logger.warning("DB sağlık kontrolü başarısız: %s", db_res)
+    else:
+        status["db"] = True
+    if isinstance(redis_res, BaseException):
+        logger.warning("Redis sağlık kontrolü başarısız: %s", redis_res)
+    else:
+        status["redis"] = True
 
-        from src.config.database import async_session_factory
+    status["ml_model"] = ml_res is True
 
-        async with async_session_factory() as session:
-            await session.execute(sa_text("SELECT 1"))
-        status["db"] = True
-    except Exception as e:
-        logger.warning("DB sağlık kontrolü başarısız: %s", e)
+    return status
 
-    # Redis kontrolü
-    try:
-        import redis
 
-        r = redis.from_url(settings.REDIS_URL)
-        r.ping()
-        status["redis"] = True
-    except Exception as e:
-        logger.warning("Redis sağlık kontrolü başarısız: %s", e)
+async def _check_ml() -> bool:
+    """
+    ML model hazırlık durumunu döndürür.
 
-    # ML model kontrolü
-    try:
-        from src.ml.predictor import get_predictor
+    Process'te cache'lenen durum okunur; henüz kontrol edilmediyse model
+    yükleme (disk I/O) thread'de yapılır, event loop bloklanmaz.
+    """
+    if _ml_ready is None:
+        return await asyncio.to_thread(_refresh_ml_state)
+    return _ml_ready
 
+
+# ML model hazır mı? — worker başlangıcında ve saatlik refresh task'ında
+# güncellenir (None: henüz kontrol edilmedi)
+_ml_ready: bool | None = None
+
+
+def _refresh_ml_state() -> bool:
+    """Predictor'ı (gerekirse) yükleyip model hazırlık durumunu cache'ler."""
+    global _ml_ready
+    try:
         predictor = get_predictor()
-        status["ml_model"] = predictor.is_loaded
+        if not predictor.is_loaded:
+            predictor.load_model()
+        _ml_ready = bool(predictor.is_loaded)
     except Exception as e:
         logger.warning("ML model sağlık kontrolü başarısız: %s", e)
+        _ml_ready = False
+    return _ml_ready
 
-    return status
+
+@worker_process_init.connect
+def _init_ml_state(**kwargs) -> None:
+    """Fork sonrası her worker process'i model durumunu bir kez yükler."""
+    _refresh_ml_state()
+    logger.info("ML model durumu: %s", "hazır" if _ml_ready else "yok")
+
+
+@celery_app.task
+def refresh_predictor_state():
+    """
+    ML model hazırlık durumunu yeniler.
+
+    Zamanlama: Her saat başı.
+    Yeni eğitilen model dosyası health_check'e bu task ile yansır.
+    """
+    ready = _refresh_ml_state()
+    logger.info("ML model durumu yenilendi: %s", ready)
+    return {"ml_model": ready}
 
 
 # ── Task 7: Günlük ML Tahmin v5 ─────────────────────────────────────────────
@@ -1068,6 +1563,8 @@ def run_daily_prediction_v5(self):
     logger.info("v5 günlük ML tahmin başlıyor...")
 
     try:
+        # v5 predictor modeli/joblib dosyalarıyla birlikte ağır bir modül;
+        # v1 task'larının import'unu etkilememesi için burada lazy kalır
         from src.predictor_v5.predictor import predict_all
 
         results = predict_all()
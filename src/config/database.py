@@ -5,9 +5,12 @@ SQLAlchemy async engine, session factory ve FastAPI dependency injection.
 """
 
 import logging
+import socket
 from collections.abc import AsyncGenerator
 
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -17,16 +20,89 @@ from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# TCP keepalive: boşta bekleyen bağlantı 60 sn sonra yoklanır,
+# 3 yanıtsız yoklamada (10 sn arayla) kernel bağlantıyı düşürür
+_TCP_KEEPALIVE_OPTS = (
+    ("TCP_KEEPIDLE", 60),
+    ("TCP_KEEPINTVL", 10),
+    ("TCP_KEEPCNT", 3),
+)
+
 # --- Async Engine ---
+# pool_pre_ping kapalı — her checkout'ta ekstra SELECT 1 round-trip'i
+# yerine ölü bağlantılar TCP keepalive + pool_recycle ile ayıklanır.
+# Keepalive ayarlanamayan bağlantılar checkout'ta tek tek ping'lenir
+# (_ping_without_keepalive).
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,
     pool_size=10,
     max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+    pool_pre_ping=False,
+    pool_recycle=1800,
+    connect_args={
+        "timeout": 10,
+        "command_timeout": 30,
+        "server_settings": {"application_name": "yakit_analizi"},
+        # asyncpg tarafı: aynı SQL metni bağlantı başına bir kez parse edilir
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # SQLAlchemy asyncpg dialect'i tarafı: prepared statement nesneleri
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE // 2,
+    },
 )
 
+
+# connection_record.info anahtarı: keepalive yok, checkout'ta ping gerekir
+_NEEDS_PING = "needs_ping"
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _enable_tcp_keepalive(dbapi_connection, connection_record) -> None:
+    """
+    Yeni asyncpg bağlantısının soketinde TCP keepalive'ı açar.
+
+    Soket alınamaz veya ayar başarısız olursa bağlantı işaretlenir ve
+    her checkout'ta pool_pre_ping gibi yoklanır.
+    """
+    try:
+        transport = dbapi_connection.driver_connection._transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family == socket.AF_UNIX:
+            return
+        if sock is None:
+            raise RuntimeError("bağlantı soketi alınamadı")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for name, value in _TCP_KEEPALIVE_OPTS:
+            opt = getattr(socket, name, None)
+            if opt is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, opt, value)
+    except Exception as e:
+        connection_record.info[_NEEDS_PING] = True
+        logger.warning(
+            "TCP keepalive ayarlanamadı, bağlantı checkout'ta ping'lenecek: %s", e
+        )
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _ping_without_keepalive(dbapi_connection, connection_record, connection_proxy) -> None:
+    """
+    Keepalive'sız bağlantıyı checkout öncesi yoklar (pool_pre_ping yedeği).
+
+    Ping başarısızsa DisconnectionError ile pool bağlantıyı atar ve
+    yenisiyle tekrar dener.
+    """
+    if not connection_record.info.get(_NEEDS_PING):
+        return
+    try:
+        engine.dialect.do_ping(dbapi_connection)
+    except Exception as e:
+        raise exc.DisconnectionError("Bağlantı ping'e yanıt vermedi") from e
+
+
+# --- Salt Okunur Bağlantılar ---
+# AUTOCOMMIT kopyası aynı pool'u paylaşır; sorgu öncesi BEGIN gönderilmez
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
 # --- Session Factory ---
 async_session_factory = async_sessionmaker(
     bind=engine,
@@ -57,6 +133,22 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncConnection, None]:
+    """
+    FastAPI dependency: salt okunur endpoint'ler için Core bağlantısı.
+
+    ORM session (identity map, unit-of-work) ve transaction kurulmaz;
+    repository'ler Core select + .mappings() ile satır eşlemesi döndürür.
+
+    Kullanım:
+        @router.get("/")
+        async def endpoint(conn: AsyncConnection = Depends(get_read_db)):
+            ...
+    """
+    async with read_engine.connect() as conn:
+        yield conn
+
+
 async def dispose_engine() -> None:
     """Uygulama kapanırken engine bağlantı havuzunu temizler."""
     await engine.dispose()
@@ -8,17 +8,20 @@ Tüm veritabanı erişimi async olarak çalışır.
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 from decimal import Decimal
 from typing import Optional, Sequence
 
-from sqlalchemy import select, update, and_
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.models.alerts import Alert
 
 logger = logging.getLogger(__name__)
 
+# Salt okunur sorgular Core tablo üzerinden çalışır — ORM hydration yapılmaz
+_ALERT_TABLE = Alert.__table__
+
 
 async def create_alert(
     session: AsyncSession,
@@ -37,24 +40,31 @@ async def create_alert(
     """
     Yeni bir alert oluşturur.
 
+    Tek satırlık INSERT ... RETURNING ile yazılır — session.add + flush
+    unit-of-work turu yapılmaz.
+
     Returns:
         Oluşturulan Alert nesnesi.
     """
-    alert = Alert(
-        alert_level=alert_level,
-        alert_type=alert_type,
-        fuel_type=fuel_type,
-        title=title,
-        message=message,
-        metric_name=metric_name,
-        metric_value=metric_value,
-        threshold_value=threshold_value,
-        threshold_config_id=threshold_config_id,
-        risk_score_id=risk_score_id,
-        channels_sent=channels_sent,
+    stmt = (
+        insert(Alert)
+        .values(
+            alert_level=alert_level,
+            alert_type=alert_type,
+            fuel_type=fuel_type,
+            title=title,
+            message=message,
+            metric_name=metric_name,
+            metric_value=metric_value,
+            threshold_value=threshold_value,
+            threshold_config_id=threshold_config_id,
+            risk_score_id=risk_score_id,
+            channels_sent=channels_sent,
+        )
+        .returning(Alert)
     )
-    session.add(alert)
-    await session.flush()
+    result = await session.execute(stmt)
+    alert = result.scalar_one()
     logger.info(
         "Alert oluşturuldu: id=%s, level=%s, type=%s",
         alert.id,
@@ -64,65 +74,97 @@ async def create_alert(
     return alert
 
 
-async def get_alert_by_id(
+async def bulk_create_alerts(
     session: AsyncSession,
+    rows: Sequence[dict],
+) -> list[int]:
+    """
+    Birden fazla alert'i tek çağrıda oluşturur.
+
+    Satırlar create_alert ile aynı alan adlarını taşır. INSERT,
+    SQLAlchemy'nin insertmanyvalues yolu ile çok satırlı VALUES olarak
+    gider — alert başına ayrı round-trip yapılmaz.
+
+    Returns:
+        Oluşturulan alert ID'leri (satır sırasıyla).
+    """
+    if not rows:
+        return []
+
+    stmt = insert(_ALERT_TABLE).returning(
+        _ALERT_TABLE.c.id, sort_by_parameter_order=True
+    )
+    result = await session.execute(stmt, list(rows))
+    ids = list(result.scalars().all())
+    logger.info("%d alert toplu oluşturuldu", len(ids))
+    return ids
+
+
+async def get_alert_by_id(
+    session: AsyncSession | AsyncConnection,
     alert_id: int,
-) -> Optional[Alert]:
-    """ID ile alert getirir."""
-    stmt = select(Alert).where(Alert.id == alert_id)
+) -> Optional[RowMapping]:
+    """
+    ID ile alert getirir.
+
+    Salt okunur — ORM nesnesi yerine kolon adı → değer eşlemesi döner.
+    """
+    stmt = select(_ALERT_TABLE).where(_ALERT_TABLE.c.id == alert_id)
     result = await session.execute(stmt)
-    return result.scalar_one_or_none()
+    return result.mappings().one_or_none()
 
 
 async def get_alerts(
-    session: AsyncSession,
+    session: AsyncSession | AsyncConnection,
     fuel_type: str | None = None,
     unread_only: bool = False,
     unresolved_only: bool = False,
     limit: int = 100,
-) -> Sequence[Alert]:
+) -> Sequence[RowMapping]:
     """
     Alert'leri filtreli olarak döndürür.
 
+    Salt okunur — Core select çalışır, ORM nesnesi oluşturulmaz; session
+    yerine get_read_db bağlantısı da verilebilir.
+
     Args:
-        session: Async veritabanı oturumu.
+        session: Async veritabanı oturumu veya salt okunur bağlantı.
         fuel_type: Yakıt tipi filtresi (None ise tümü).
         unread_only: Sadece okunmamışları getir.
         unresolved_only: Sadece çözülmemişleri getir.
         limit: Maksimum kayıt sayısı.
 
     Returns:
-        Alert listesi.
+        Alert satır eşlemeleri listesi.
     """
-    stmt = select(Alert).order_by(Alert.created_at.desc()).limit(limit)
-
-    conditions = []
+    # Ardışık .where() çağrıları AND ile birleşir; filtre değerleri bind
+    # parametre olduğundan her filtre kombinasyonu SQLAlchemy'nin derlenmiş
+    # SQL cache'inde tek girdi olarak yeniden kullanılır
+    table = _ALERT_TABLE
+    stmt = select(table).order_by(table.c.created_at.desc()).limit(limit)
     if fuel_type is not None:
-        conditions.append(Alert.fuel_type == fuel_type)
+        stmt = stmt.where(table.c.fuel_type == fuel_type)
     if unread_only:
-        conditions.append(Alert.is_read == False)  # noqa: E712
+        stmt = stmt.where(table.c.is_read == False)  # noqa: E712
     if unresolved_only:
-        conditions.append(Alert.is_resolved == False)  # noqa: E712
-
-    if conditions:
-        stmt = stmt.where(and_(*conditions))
+        stmt = stmt.where(table.c.is_resolved == False)  # noqa: E712
 
     result = await session.execute(stmt)
-    return result.scalars().all()
+    return result.mappings().all()
 
 
 async def get_unread_alerts(
-    session: AsyncSession,
+    session: AsyncSession | AsyncConnection,
     limit: int = 100,
-) -> Sequence[Alert]:
+) -> Sequence[RowMapping]:
     """Okunmamış alert'leri döndürür."""
     return await get_alerts(session, unread_only=True, limit=limit)
 
 
 async def get_unresolved_alerts(
-    session: AsyncSession,
+    session: AsyncSession | AsyncConnection,
     limit: int = 100,
-) -> Sequence[Alert]:
+) -> Sequence[RowMapping]:
     """Çözülmemiş alert'leri döndürür."""
     return await get_alerts(session, unresolved_only=True, limit=limit)
 
@@ -130,21 +172,21 @@ async def get_unresolved_alerts(
 async def mark_alert_read(
     session: AsyncSession,
     alert_id: int,
-) -> Optional[Alert]:
+) -> Optional[RowMapping]:
     """
     Alert'i okundu olarak işaretler.
 
     Returns:
-        Güncellenen Alert veya None.
+        Güncellenen satırın eşlemesi veya None.
     """
     stmt = (
-        update(Alert)
-        .where(Alert.id == alert_id)
+        update(_ALERT_TABLE)
+        .where(_ALERT_TABLE.c.id == alert_id)
         .values(is_read=True)
-        .returning(Alert)
+        .returning(*_ALERT_TABLE.c)
     )
     result = await session.execute(stmt)
-    row = result.scalar_one_or_none()
+    row = result.mappings().one_or_none()
 
     if row is not None:
         logger.info("Alert okundu olarak işaretlendi: id=%s", alert_id)
@@ -156,7 +198,7 @@ async def resolve_alert(
     session: AsyncSession,
     alert_id: int,
     resolved_reason: str | None = None,
-) -> Optional[Alert]:
+) -> Optional[RowMapping]:
     """
     Alert'i çözüldü olarak işaretler.
 
@@ -166,20 +208,20 @@ async def resolve_alert(
         resolved_reason: Çözüm nedeni açıklaması.
 
     Returns:
-        Güncellenen Alert veya None.
+        Güncellenen satırın eşlemesi veya None.
     """
     stmt = (
-        update(Alert)
-        .where(Alert.id == alert_id)
+        update(_ALERT_TABLE)
+        .where(_ALERT_TABLE.c.id == alert_id)
         .values(
             is_resolved=True,
-            resolved_at=datetime.utcnow(),
+            resolved_at=func.now(),
             resolved_reason=resolved_reason,
         )
-        .returning(Alert)
+        .returning(*_ALERT_TABLE.c)
     )
     result = await session.execute(stmt)
-    row = result.scalar_one_or_none()
+    row = result.mappings().one_or_none()
 
     if row is not None:
         logger.info(
@@ -12,13 +12,17 @@ from datetime import date
 from decimal import Decimal
 from typing import Optional, Sequence
 
-from sqlalchemy import select, update, and_, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, insert, select, update, and_, func
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.models.political_delay_history import PoliticalDelayHistory
 
 logger = logging.getLogger(__name__)
 
+# Salt okunur sorgular Core tablo üzerinden çalışır — ORM hydration yapılmaz
+_DELAY_TABLE = PoliticalDelayHistory.__table__
+
 
 async def create_delay_record(
     session: AsyncSession,
@@ -30,18 +34,24 @@ async def create_delay_record(
     """
     Yeni gecikme takip kaydı oluşturur (WATCHING durumuna geçişte).
 
+    Tek satırlık INSERT ... RETURNING ile yazılır (session.add + flush yok).
+
     Returns:
         Oluşturulan PoliticalDelayHistory.
     """
-    record = PoliticalDelayHistory(
-        fuel_type=fuel_type,
-        expected_change_date=expected_change_date,
-        mbe_at_expected=mbe_at_expected,
-        status="watching",
-        regime_event_id=regime_event_id,
+    stmt = (
+        insert(PoliticalDelayHistory)
+        .values(
+            fuel_type=fuel_type,
+            expected_change_date=expected_change_date,
+            mbe_at_expected=mbe_at_expected,
+            status="watching",
+            regime_event_id=regime_event_id,
+        )
+        .returning(PoliticalDelayHistory)
     )
-    session.add(record)
-    await session.flush()
+    result = await session.execute(stmt)
+    record = result.scalar_one()
     logger.info(
         "Gecikme kaydı oluşturuldu: id=%s, yakıt=%s, beklenen=%s",
         record.id,
@@ -52,40 +62,44 @@ async def create_delay_record(
 
 
 async def get_delay_by_id(
-    session: AsyncSession,
+    session: AsyncSession | AsyncConnection,
     record_id: int,
-) -> Optional[PoliticalDelayHistory]:
-    """ID ile gecikme kaydı getirir."""
-    stmt = select(PoliticalDelayHistory).where(PoliticalDelayHistory.id == record_id)
+) -> Optional[RowMapping]:
+    """
+    ID ile gecikme kaydı getirir.
+
+    Salt okunur — ORM nesnesi yerine kolon adı → değer eşlemesi döner.
+    """
+    stmt = select(_DELAY_TABLE).where(_DELAY_TABLE.c.id == record_id)
     result = await session.execute(stmt)
-    return result.scalar_one_or_none()
+    return result.mappings().one_or_none()
 
 
 async def get_pending_delays(
-    session: AsyncSession,
+    session: AsyncSession | AsyncConnection,
     fuel_type: str | None = None,
-) -> Sequence[PoliticalDelayHistory]:
+) -> Sequence[RowMapping]:
     """
     Bekleyen (watching) gecikme kayıtlarını döndürür.
 
     Args:
-        session: Async veritabanı oturumu.
+        session: Async veritabanı oturumu veya salt okunur bağlantı.
         fuel_type: Yakıt tipi filtresi (None ise tümü).
 
     Returns:
-        PoliticalDelayHistory listesi.
+        Kayıt eşlemeleri listesi (ORM nesnesi oluşturulmaz).
     """
     stmt = (
-        select(PoliticalDelayHistory)
-        .where(PoliticalDelayHistory.status == "watching")
-        .order_by(PoliticalDelayHistory.expected_change_date.asc())
+        select(_DELAY_TABLE)
+        .where(_DELAY_TABLE.c.status == "watching")
+        .order_by(_DELAY_TABLE.c.expected_change_date.asc())
     )
 
     if fuel_type is not None:
-        stmt = stmt.where(PoliticalDelayHistory.fuel_type == fuel_type)
+        stmt = stmt.where(_DELAY_TABLE.c.fuel_type == fuel_type)
 
     result = await session.execute(stmt)
-    return result.scalars().all()
+    return result.mappings().all()
 
 
 async def close_delay_record(
@@ -97,7 +111,7 @@ async def close_delay_record(
     accumulated_pressure_pct: Decimal,
     status: str = "closed",
     price_change_id: int | None = None,
-) -> Optional[PoliticalDelayHistory]:
+) -> Optional[int]:
     """
     Gecikme kaydını kapatır (zam geldi veya absorbe edildi).
 
@@ -112,7 +126,7 @@ async def close_delay_record(
         price_change_id: İlişkili fiyat değişikliği ID.
 
     Returns:
-        Güncellenen PoliticalDelayHistory veya None.
+        Güncellenen kaydın ID'si, kayıt yoksa None.
     """
     stmt = (
         update(PoliticalDelayHistory)
@@ -125,7 +139,7 @@ async def close_delay_record(
             status=status,
             price_change_id=price_change_id,
         )
-        .returning(PoliticalDelayHistory)
+        .returning(PoliticalDelayHistory.id)
     )
     result = await session.execute(stmt)
     row = result.scalar_one_or_none()
@@ -142,39 +156,42 @@ async def close_delay_record(
 
 
 async def get_delay_history(
-    session: AsyncSession,
+    session: AsyncSession | AsyncConnection,
     fuel_type: str,
     limit: int = 50,
-) -> Sequence[PoliticalDelayHistory]:
+) -> Sequence[RowMapping]:
     """
     Belirli yakıt tipi için gecikme geçmişini döndürür.
 
     Args:
-        session: Async veritabanı oturumu.
+        session: Async veritabanı oturumu veya salt okunur bağlantı.
         fuel_type: Yakıt tipi.
         limit: Maksimum kayıt sayısı.
 
     Returns:
-        PoliticalDelayHistory listesi (en yeniden en eskiye).
+        Kayıt eşlemeleri listesi (en yeniden en eskiye). Salt okunur —
+        ORM nesnesi oluşturulmaz.
     """
     stmt = (
-        select(PoliticalDelayHistory)
-        .where(PoliticalDelayHistory.fuel_type == fuel_type)
-        .order_by(PoliticalDelayHistory.expected_change_date.desc())
+        select(_DELAY_TABLE)
+        .where(_DELAY_TABLE.c.fuel_type == fuel_type)
+        .order_by(_DELAY_TABLE.c.expected_change_date.desc())
         .limit(limit)
     )
     result = await session.execute(stmt)
-    return result.scalars().all()
+    return result.mappings().all()
 
 
 async def get_delay_stats(
-    session: AsyncSession,
+    session: AsyncSession | AsyncConnection,
     fuel_type: str,
 ) -> dict:
     """
     Belirli yakıt tipi için gecikme istatistiklerini hesaplar.
 
     Sadece kapatılmış (closed, partial_close) kayıtları sayar.
+    avg/stddev sunucu tarafında float8'e cast edilir (numeric → Decimal
+    dönüşümü yapılmaz).
 
     Returns:
         Dict: count, avg_delay, max_delay, min_delay, std_delay
@@ -182,10 +199,10 @@ async def get_delay_stats(
     stmt = (
         select(
             func.count(PoliticalDelayHistory.id).label("count"),
-            func.avg(PoliticalDelayHistory.delay_days).label("avg_delay"),
+            func.avg(PoliticalDelayHistory.delay_days).cast(Float).label("avg_delay"),
             func.max(PoliticalDelayHistory.delay_days).label("max_delay"),
             func.min(PoliticalDelayHistory.delay_days).label("min_delay"),
-            func.stddev_pop(PoliticalDelayHistory.delay_days).label("std_delay"),
+            func.stddev_pop(PoliticalDelayHistory.delay_days).cast(Float).label("std_delay"),
         )
         .where(
             and_(
@@ -200,8 +217,8 @@ async def get_delay_stats(
     return {
         "fuel_type": fuel_type,
         "count": row.count or 0,
-        "avg_delay": str(round(row.avg_delay, 2)) if row.avg_delay is not None else "0",
+        "avg_delay": round(row.avg_delay or 0.0, 2),
         "max_delay": row.max_delay or 0,
         "min_delay": row.min_delay or 0,
-        "std_delay": str(round(row.std_delay, 2)) if row.std_delay is not None else "0",
+        "std_delay": round(row.std_delay or 0.0, 2),
     }
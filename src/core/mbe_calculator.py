@@ -45,8 +45,16 @@ REGIME_PARAMS: dict[int, tuple[int, Decimal]] = {
 }
 
 # Varsayilan yuvarlatma hassasiyeti
+# quantize(PRECISION, ROUND_HALF_UP) — rounding pozisyonel verilir;
+# C decimal modulunde keyword arguman ayristirma maliyeti quantize'in
+# kendisinden fazladir (~2x)
 PRECISION = Decimal("0.00000001")  # 8 ondalik
 
+# Sik kullanilan Decimal sabitleri — her cagrida yeniden olusturulmaz
+_ZERO = Decimal("0")
+_ONE = Decimal("1")
+_HUNDRED = Decimal("100")
+
 
 # --- Yardimci Fonksiyonlar ---
 
@@ -68,9 +76,18 @@ def _safe_decimal(value: int | float | str | Decimal | None) -> Decimal:
     """
     if value is None:
         raise ValueError("Decimal'e donusturulemez: None deger")
+    # Sik gelen tipler icin hizli yol — type() kontrolu MRO taramasi yapmaz;
+    # int dogrudan (kayipsiz) donusur, str() ara adimina gerek yoktur
+    value_type = type(value)
+    if value_type is Decimal:
+        return value
+    if value_type is int:
+        return Decimal(value)
     if isinstance(value, Decimal):
         return value
     try:
+        if value_type is str:
+            return Decimal(value)
         return Decimal(str(value))
     except (InvalidOperation, ValueError) as e:
         raise ValueError(f"Decimal'e donusturulemez: {value!r}") from e
@@ -85,6 +102,13 @@ class RegimeConfig(NamedTuple):
     m_total: Decimal
 
 
+# Rejim konfigurasyonlari import aninda bir kez olusturulur
+_REGIME_CONFIGS: dict[int, RegimeConfig] = {
+    regime: RegimeConfig(window=window, m_total=m_total)
+    for regime, (window, m_total) in REGIME_PARAMS.items()
+}
+
+
 @dataclass
 class CostSnapshot:
     """Maliyet ayristirma snapshot sonucu."""
@@ -144,11 +168,52 @@ def calculate_nc_forward(
     fx = _safe_decimal(fx_rate)
     r = _safe_decimal(rho)
 
-    if r == Decimal("0"):
+    if r == _ZERO:
         raise ZeroDivisionError("rho (yogunluk sabiti) sifir olamaz")
 
     result = (cif * fx) / r
-    return result.quantize(PRECISION, rounding=ROUND_HALF_UP)
+    return result.quantize(PRECISION, ROUND_HALF_UP)
+
+
+def calculate_nc_forward_series(
+    cif_values: list[Decimal | int | float | str],
+    fx_values: list[Decimal | int | float | str],
+    rho: Decimal | int | float | str,
+) -> list[Decimal]:
+    """
+    Bir seri icin NC_forward degerlerini tek geciste hesaplar.
+
+    Her eleman calculate_nc_forward(cif, fx, rho) ile aynidir; rho bir kez
+    donusturulup dogrulanir, satir basina fonksiyon cagrisi yapilmaz.
+
+    Args:
+        cif_values: CIF Akdeniz fiyatlari (USD/ton).
+        fx_values: USD/TRY doviz kurlari (cif_values ile ayni uzunlukta).
+        rho: Yogunluk sabiti (ton -> litre).
+
+    Returns:
+        NC_forward degerleri listesi (TL/litre).
+
+    Raises:
+        ValueError: Seri uzunluklari farkli veya gecersiz deger.
+        ZeroDivisionError: rho sifir ise.
+    """
+    if len(cif_values) != len(fx_values):
+        raise ValueError(
+            f"CIF ve FX serileri ayni uzunlukta olmali: "
+            f"{len(cif_values)} != {len(fx_values)}"
+        )
+
+    r = _safe_decimal(rho)
+    if r == _ZERO:
+        raise ZeroDivisionError("rho (yogunluk sabiti) sifir olamaz")
+
+    return [
+        ((_safe_decimal(cif) * _safe_decimal(fx)) / r).quantize(
+            PRECISION, ROUND_HALF_UP
+        )
+        for cif, fx in zip(cif_values, fx_values, strict=True)
+    ]
 
 
 def calculate_nc_base_from_pump(
@@ -179,12 +244,12 @@ def calculate_nc_base_from_pump(
     k = _safe_decimal(kdv)
     m = _safe_decimal(m_total)
 
-    denominator = Decimal("1") + k
-    if denominator == Decimal("0"):
+    denominator = _ONE + k
+    if denominator == _ZERO:
         raise ZeroDivisionError("(1 + kdv) sifir olamaz — kdv = -1 gecersiz")
 
     result = (pp - m) / denominator - o
-    return result.quantize(PRECISION, rounding=ROUND_HALF_UP)
+    return result.quantize(PRECISION, ROUND_HALF_UP)
 
 
 def calculate_sma(
@@ -212,19 +277,123 @@ def calculate_sma(
     if not series:
         raise ValueError("SMA hesabi icin en az 1 veri noktasi gerekli")
 
+    # Kayan pencere: toplam her adimda yeni elemanla artar, pencereden
+    # cikan elemanla azalir — O(N*w) yerine O(N). Seri degerleri 8 ondalikli
+    # oldugundan Decimal toplami kesindir, sonuc dilim toplamiyla aynidir.
     result: list[Decimal] = []
-    for i in range(len(series)):
-        # Pencere baslangiç indeksi (0'dan kucuk olamaz)
-        start = max(0, i - window + 1)
-        window_data = series[start : i + 1]
-        count = Decimal(str(len(window_data)))
-        total = sum(window_data)
-        avg = (total / count).quantize(PRECISION, rounding=ROUND_HALF_UP)
+    running_total = _ZERO
+    for i, value in enumerate(series):
+        running_total += value
+        if i >= window:
+            running_total -= series[i - window]
+        count = Decimal(min(i + 1, window))
+        avg = (running_total / count).quantize(PRECISION, ROUND_HALF_UP)
         result.append(avg)
 
     return result
 
 
+def calculate_sma_last(
+    series: list[Decimal],
+    window: int,
+) -> Decimal:
+    """
+    Serinin yalnizca son SMA degerini hesaplar.
+
+    calculate_sma(series, window)[-1] ile aynidir; tum seri yerine sadece
+    son min(window, len(series)) eleman toplanir.
+
+    Args:
+        series: Decimal degerlerden olusan seri.
+        window: Pencere genisligi.
+
+    Returns:
+        Son SMA degeri.
+
+    Raises:
+        ValueError: window < 1 veya series bos ise.
+    """
+    if not series:
+        raise ValueError("SMA hesabi icin en az 1 veri noktasi gerekli")
+    return calculate_sma_at(series, window, len(series) - 1)
+
+
+def calculate_sma_last_multi(
+    series: list[Decimal],
+    windows: tuple[int, ...],
+) -> dict[int, Decimal]:
+    """
+    Birden fazla pencere icin son SMA degerlerini tek geciste hesaplar.
+
+    Seri sondan geriye bir kez taranir; toplam her pencere sinirinda
+    ortalamaya cevrilir. Sonuclar calculate_sma_last(series, w) ile aynidir.
+
+    Args:
+        series: Decimal degerlerden olusan seri.
+        windows: Pencere genislikleri (or: (window, 5, 10)).
+
+    Returns:
+        {pencere: son SMA degeri} sozlugu.
+
+    Raises:
+        ValueError: Herhangi bir pencere < 1 veya series bos ise.
+    """
+    if not series:
+        raise ValueError("SMA hesabi icin en az 1 veri noktasi gerekli")
+    for w in windows:
+        if w < 1:
+            raise ValueError(f"SMA pencere genisligi en az 1 olmalidir, verilen: {w}")
+
+    wanted = set(windows)
+    result: dict[int, Decimal] = {}
+    total = _ZERO
+    count = 0
+    for value in reversed(series[-max(wanted):]):
+        total += value
+        count += 1
+        if count in wanted:
+            result[count] = (total / Decimal(count)).quantize(PRECISION, ROUND_HALF_UP)
+
+    # Seriden uzun pencereler mevcut tum verinin ortalamasini alir
+    if len(result) < len(wanted):
+        avg = (total / Decimal(count)).quantize(PRECISION, ROUND_HALF_UP)
+        for w in wanted:
+            result.setdefault(w, avg)
+    return result
+
+
+def calculate_sma_at(
+    series: list[Decimal],
+    window: int,
+    index: int,
+) -> Decimal:
+    """
+    Serinin tek bir indeksindeki SMA degerini hesaplar.
+
+    calculate_sma(series, window)[index] ile aynidir; yalnizca o indekse
+    ait pencere toplanir.
+
+    Args:
+        series: Decimal degerlerden olusan seri.
+        window: Pencere genisligi.
+        index: SMA degeri istenen indeks (0 <= index < len(series)).
+
+    Returns:
+        Indeksteki SMA degeri.
+
+    Raises:
+        ValueError: window < 1 veya index seri disinda ise.
+    """
+    if window < 1:
+        raise ValueError(f"SMA pencere genisligi en az 1 olmalidir, verilen: {window}")
+    if not 0 <= index < len(series):
+        raise ValueError(f"SMA indeksi seri disinda: {index} (uzunluk {len(series)})")
+
+    start = max(0, index - window + 1)
+    total = sum(series[start:index + 1], _ZERO)
+    return (total / Decimal(index + 1 - start)).quantize(PRECISION, ROUND_HALF_UP)
+
+
 def calculate_mbe(
     nc_forward_series: list[Decimal],
     nc_base_sma: Decimal,
@@ -249,12 +418,11 @@ def calculate_mbe(
     if not nc_forward_series:
         raise ValueError("MBE hesabi icin en az 1 NC_forward degeri gerekli")
 
-    sma_values = calculate_sma(nc_forward_series, window)
     # Son SMA degeri = guncel SMA
-    current_sma = sma_values[-1]
+    current_sma = calculate_sma_last(nc_forward_series, window)
 
     mbe = current_sma - nc_base_sma
-    return mbe.quantize(PRECISION, rounding=ROUND_HALF_UP)
+    return mbe.quantize(PRECISION, ROUND_HALF_UP)
 
 
 def calculate_cost_snapshot(
@@ -302,34 +470,39 @@ def calculate_cost_snapshot(
     # OTV bileseni
     otv_component = otv
 
+    # Ortak ara degerler: vergi oncesi tutar ve KDV carpani bir kez hesaplanir
+    pre_tax = cif_component + otv
+    one_plus_kdv = _ONE + kdv
+
     # KDV bileseni
-    kdv_component = ((cif_component + otv) * kdv).quantize(PRECISION, rounding=ROUND_HALF_UP)
+    kdv_component = (pre_tax * kdv).quantize(PRECISION, ROUND_HALF_UP)
 
     # Marj bileseni
     margin_component = m
 
     # Teorik maliyet = (CIF + OTV) * (1 + KDV) + marj
-    theoretical = ((cif_component + otv) * (Decimal("1") + kdv) + m).quantize(
-        PRECISION, rounding=ROUND_HALF_UP
-    )
+    theoretical = (pre_tax * one_plus_kdv + m).quantize(PRECISION, ROUND_HALF_UP)
 
     # Ima edilen CIF (ters hesaplama)
+    # NC_base = (pump - marj) / (1 + KDV) - OTV  (calculate_nc_base_from_pump ile ayni)
     # implied_cif = NC_base * rho / FX
     implied_cif: Decimal | None = None
-    if fx > Decimal("0") and r > Decimal("0"):
-        nc_base = calculate_nc_base_from_pump(pp, otv, kdv, m)
-        implied_cif = ((nc_base * r) / fx).quantize(PRECISION, rounding=ROUND_HALF_UP)
+    if fx > _ZERO and r > _ZERO:
+        if one_plus_kdv == _ZERO:
+            raise ZeroDivisionError("(1 + kdv) sifir olamaz — kdv = -1 gecersiz")
+        nc_base = ((pp - m) / one_plus_kdv - otv).quantize(PRECISION, ROUND_HALF_UP)
+        implied_cif = ((nc_base * r) / fx).quantize(PRECISION, ROUND_HALF_UP)
 
     # Maliyet farki
-    cost_gap = (pp - theoretical).quantize(PRECISION, rounding=ROUND_HALF_UP)
+    cost_gap = (pp - theoretical).quantize(PRECISION, ROUND_HALF_UP)
 
     # Maliyet farki yuzdesi
-    if theoretical != Decimal("0"):
-        cost_gap_pct = ((cost_gap / theoretical) * Decimal("100")).quantize(
-            PRECISION, rounding=ROUND_HALF_UP
+    if theoretical != _ZERO:
+        cost_gap_pct = ((cost_gap / theoretical) * _HUNDRED).quantize(
+            PRECISION, ROUND_HALF_UP
         )
     else:
-        cost_gap_pct = Decimal("0")
+        cost_gap_pct = _ZERO
 
     return CostSnapshot(
         cif_component_tl=cif_component,
@@ -368,9 +541,20 @@ def detect_trend(
 
     # Lookback penceresi
     actual_lookback = min(lookback, len(sma_series))
-    start_val = sma_series[-actual_lookback]
-    end_val = sma_series[-1]
+    return detect_trend_pair(sma_series[-actual_lookback], sma_series[-1])
 
+
+def detect_trend_pair(start_val: Decimal, end_val: Decimal) -> str:
+    """
+    Pencerenin ilk ve son degerini karsilastirarak trend yonunu dondurur.
+
+    Args:
+        start_val: Lookback penceresinin ilk degeri.
+        end_val: Lookback penceresinin son degeri.
+
+    Returns:
+        Trend yonu: 'increase', 'decrease', 'no_change'
+    """
     if end_val > start_val:
         return "increase"
     elif end_val < start_val:
@@ -397,8 +581,7 @@ def get_regime_config(regime: int) -> RegimeConfig:
             f"Gecersiz rejim kodu: {regime}. "
             f"Gecerli kodlar: {list(REGIME_PARAMS.keys())}"
         )
-    window, m_total = REGIME_PARAMS[regime]
-    return RegimeConfig(window=window, m_total=m_total)
+    return _REGIME_CONFIGS[regime]
 
 
 def get_rho(fuel_type: str) -> Decimal:
@@ -451,39 +634,40 @@ def calculate_full_mbe(
     # Son NC_forward degeri
     nc_fwd = nc_forward_series[-1]
 
-    # SMA hesaplamalari
-    sma_all = calculate_sma(nc_forward_series, window)
-    current_sma = sma_all[-1]
-
-    # 5 ve 10 gunluk SMA
-    sma_5_vals = calculate_sma(nc_forward_series, 5)
-    sma_5 = sma_5_vals[-1] if len(nc_forward_series) >= 1 else None
-
-    sma_10_vals = calculate_sma(nc_forward_series, 10)
-    sma_10 = sma_10_vals[-1] if len(nc_forward_series) >= 1 else None
+    # SMA hesaplamalari — rejim penceresi, 5 ve 10 gunluk son degerler
+    # tek geciste; tum seri yerine yalnizca kullanilan uclar
+    n = len(nc_forward_series)
+    last_smas = calculate_sma_last_multi(nc_forward_series, (window, 5, 10))
+    current_sma = last_smas[window]
+    sma_5 = last_smas[5]
+    sma_10 = last_smas[10]
 
     # MBE hesaplama
-    mbe_value = (current_sma - nc_base).quantize(PRECISION, rounding=ROUND_HALF_UP)
+    mbe_value = (current_sma - nc_base).quantize(PRECISION, ROUND_HALF_UP)
 
     # MBE yuzdesi
-    if nc_base != Decimal("0"):
-        mbe_pct = ((mbe_value / nc_base) * Decimal("100")).quantize(
-            PRECISION, rounding=ROUND_HALF_UP
+    if nc_base != _ZERO:
+        mbe_pct = ((mbe_value / nc_base) * _HUNDRED).quantize(
+            PRECISION, ROUND_HALF_UP
         )
     else:
-        mbe_pct = Decimal("0")
+        mbe_pct = _ZERO
 
     # Delta MBE
     delta_mbe: Decimal | None = None
     if previous_mbe is not None:
-        delta_mbe = (mbe_value - previous_mbe).quantize(PRECISION, rounding=ROUND_HALF_UP)
+        delta_mbe = (mbe_value - previous_mbe).quantize(PRECISION, ROUND_HALF_UP)
 
     delta_mbe_3: Decimal | None = None
     if mbe_3_days_ago is not None:
-        delta_mbe_3 = (mbe_value - mbe_3_days_ago).quantize(PRECISION, rounding=ROUND_HALF_UP)
+        delta_mbe_3 = (mbe_value - mbe_3_days_ago).quantize(PRECISION, ROUND_HALF_UP)
 
-    # Trend
-    trend_direction = detect_trend(sma_all, lookback=3)
+    # Trend (detect_trend(sma_serisi, lookback=3) ile ayni)
+    if n < 2:
+        trend_direction = "no_change"
+    else:
+        trend_start = calculate_sma_at(nc_forward_series, window, n - min(3, n))
+        trend_direction = detect_trend_pair(trend_start, current_sma)
 
     return MBEResult(
         nc_forward=nc_fwd,
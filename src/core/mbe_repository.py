@@ -7,10 +7,12 @@ Tum fonksiyonlar async olarak calisir, AsyncSession kullanir.
 """
 
 import logging
+from collections.abc import AsyncGenerator
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import select, text
+from sqlalchemy import Row, exists, literal, select, text
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,6 +21,98 @@ from src.models.mbe_calculations import MBECalculation
 
 logger = logging.getLogger(__name__)
 
+# get_latest_mbe_all donus sirasi
+_FUEL_TYPES = ("benzin", "motorin", "lpg")
+
+# *_range_thin varsayilan kolonlari — idx_*_fuel_date INCLUDE listesiyle
+# ayni tutulur ki sorgu index-only scan ile karsilansin
+_COST_SNAPSHOT_THIN_COLUMNS = (
+    CostBaseSnapshot.trade_date,
+    CostBaseSnapshot.cif_component_tl,
+    CostBaseSnapshot.margin_component_tl,
+    CostBaseSnapshot.theoretical_cost_tl,
+    CostBaseSnapshot.actual_pump_price_tl,
+    CostBaseSnapshot.implied_cif_usd_ton,
+    CostBaseSnapshot.cost_gap_tl,
+    CostBaseSnapshot.cost_gap_pct,
+)
+_MBE_THIN_COLUMNS = (
+    MBECalculation.trade_date,
+    MBECalculation.mbe_value,
+    MBECalculation.mbe_pct,
+    MBECalculation.nc_forward,
+    MBECalculation.nc_base,
+    MBECalculation.trend_direction,
+)
+
+# iter_*_range akislarinda sunucu tarafli cursor'dan tek seferde cekilen satir
+_STREAM_BATCH_SIZE = 500
+
+# UPSERT catisma anahtari — guncellenmez
+_CONFLICT_KEYS = ("trade_date", "fuel_type")
+
+# DO UPDATE SET disinda kalan kolonlar
+_UPSERT_SKIP_COLUMNS = frozenset({"id", "created_at", "updated_at", *_CONFLICT_KEYS})
+
+
+def _build_upsert(
+    model: type[CostBaseSnapshot] | type[MBECalculation],
+    constraint: str,
+    *,
+    id_only: bool = False,
+) -> Insert:
+    """
+    Model icin sabit INSERT ... ON CONFLICT DO UPDATE ... RETURNING ifadesi.
+
+    VALUES kismi yoktur; satirlar execute() parametresi olarak verilir
+    (ORM bulk INSERT / insertmanyvalues). Ifade modul yuklenirken bir kez
+    kurulur ve cache anahtari batch boyutundan bagimsizdir; her cagrida
+    yalnizca parametreler degisir, derlenmis SQL cache'ten gelir.
+    Guncelleme degerleri EXCLUDED uzerinden okunur. id_only=True ise
+    yalnizca PK dondurulur (ORM nesnesi olusturulmaz).
+    """
+    stmt = pg_insert(model)
+    update_fields = {
+        col.name: stmt.excluded[col.name]
+        for col in model.__table__.c
+        if col.name not in _UPSERT_SKIP_COLUMNS
+    }
+    update_fields["updated_at"] = text("NOW()")
+    return stmt.on_conflict_do_update(
+        constraint=constraint,
+        set_=update_fields,
+    ).returning(model.id if id_only else model, sort_by_parameter_order=True)
+
+
+_COST_SNAPSHOT_UPSERT = _build_upsert(CostBaseSnapshot, "uq_cost_snapshot_date_fuel")
+_MBE_CALCULATION_UPSERT = _build_upsert(MBECalculation, "uq_mbe_calc_date_fuel")
+_COST_SNAPSHOT_UPSERT_ID = _build_upsert(
+    CostBaseSnapshot, "uq_cost_snapshot_date_fuel", id_only=True
+)
+_MBE_CALCULATION_UPSERT_ID = _build_upsert(
+    MBECalculation, "uq_mbe_calc_date_fuel", id_only=True
+)
+
+
+async def _bulk_upsert(
+    session: AsyncSession,
+    stmt: Insert,
+    rows: list[dict],
+) -> list:
+    """
+    Satir listesini onceden kurulmus UPSERT ifadesiyle tek round-trip'te yazar.
+
+    Ayni (trade_date, fuel_type) anahtari batch icinde birden fazla kez
+    gecerse sonuncusu kullanilir (Postgres ayni satiri tek komutta iki kez
+    guncellemeye izin vermez).
+    """
+    if not rows:
+        return []
+
+    deduped = {(r["trade_date"], r["fuel_type"]): r for r in rows}
+    result = await session.execute(stmt, list(deduped.values()))
+    return list(result.scalars().all())
+
 
 # --- Cost Base Snapshot Islemleri ---
 
@@ -83,20 +177,7 @@ async def upsert_cost_snapshot(
         "source": source,
     }
 
-    stmt = pg_insert(CostBaseSnapshot).values(**values)
-
-    update_fields = {
-        k: v for k, v in values.items() if k not in ("trade_date", "fuel_type")
-    }
-    update_fields["updated_at"] = text("NOW()")
-
-    stmt = stmt.on_conflict_do_update(
-        constraint="uq_cost_snapshot_date_fuel",
-        set_=update_fields,
-    ).returning(CostBaseSnapshot)
-
-    result = await session.execute(stmt)
-    row = result.scalar_one()
+    (row,) = await upsert_cost_snapshots_bulk(session, [values])
 
     logger.info(
         "Maliyet snapshot upsert: %s / %s (teorik=%s, gercek=%s, fark=%s)",
@@ -110,6 +191,78 @@ async def upsert_cost_snapshot(
     return row
 
 
+async def upsert_cost_snapshot_id(
+    session: AsyncSession,
+    *,
+    trade_date: date,
+    fuel_type: str,
+    market_data_id: int,
+    tax_parameter_id: int,
+    cif_component_tl: Decimal,
+    otv_component_tl: Decimal,
+    kdv_component_tl: Decimal,
+    margin_component_tl: Decimal,
+    theoretical_cost_tl: Decimal,
+    actual_pump_price_tl: Decimal,
+    implied_cif_usd_ton: Decimal | None,
+    cost_gap_tl: Decimal,
+    cost_gap_pct: Decimal,
+    source: str = "system",
+) -> int:
+    """
+    upsert_cost_snapshot ile ayni UPSERT; yalnizca kaydin ID'sini dondurur.
+
+    RETURNING id kullanilir, ORM nesnesi olusturulmaz ve identity map'e
+    eklenmez. Sonraki adimda yalnizca cost_snapshot_id gereken (or:
+    upsert_mbe_calculation) yazma zincirleri icindir.
+
+    Args:
+        upsert_cost_snapshot ile ayni.
+
+    Returns:
+        Eklenen veya guncellenen kaydin ID'si.
+    """
+    values = {
+        "trade_date": trade_date,
+        "fuel_type": fuel_type,
+        "market_data_id": market_data_id,
+        "tax_parameter_id": tax_parameter_id,
+        "cif_component_tl": cif_component_tl,
+        "otv_component_tl": otv_component_tl,
+        "kdv_component_tl": kdv_component_tl,
+        "margin_component_tl": margin_component_tl,
+        "theoretical_cost_tl": theoretical_cost_tl,
+        "actual_pump_price_tl": actual_pump_price_tl,
+        "implied_cif_usd_ton": implied_cif_usd_ton,
+        "cost_gap_tl": cost_gap_tl,
+        "cost_gap_pct": cost_gap_pct,
+        "source": source,
+    }
+    (row_id,) = await _bulk_upsert(session, _COST_SNAPSHOT_UPSERT_ID, [values])
+    return row_id
+
+
+async def upsert_cost_snapshots_bulk(
+    session: AsyncSession,
+    rows: list[dict],
+) -> list[CostBaseSnapshot]:
+    """
+    Birden fazla maliyet snapshot'ini tek round-trip ile UPSERT eder.
+
+    Args:
+        session: Async veritabani oturumu.
+        rows: upsert_cost_snapshot parametreleriyle ayni anahtarlara sahip
+            dict listesi (tum satirlarda ayni anahtar kumesi).
+
+    Returns:
+        Eklenen veya guncellenen CostBaseSnapshot kayitlari.
+    """
+    result = await _bulk_upsert(session, _COST_SNAPSHOT_UPSERT, rows)
+    if len(rows) > 1:
+        logger.info("Maliyet snapshot toplu upsert: %d satir", len(result))
+    return result
+
+
 async def get_cost_snapshot(
     session: AsyncSession,
     trade_date: date,
@@ -137,6 +290,34 @@ async def get_cost_snapshot(
     return result.scalar_one_or_none()
 
 
+async def cost_snapshot_exists(
+    session: AsyncSession,
+    trade_date: date,
+    fuel_type: str,
+) -> bool:
+    """
+    Belirli tarih ve yakit tipi icin maliyet snapshot'i var mi?
+
+    SELECT EXISTS(...) ile tek boolean doner; satir ve iliskileri
+    (selectin) yuklenmez. Idempotency kontrolleri icindir.
+
+    Args:
+        session: Async veritabani oturumu.
+        trade_date: Islem tarihi.
+        fuel_type: Yakit tipi.
+
+    Returns:
+        Kayit varsa True.
+    """
+    stmt = select(literal(True)).where(
+        exists().where(
+            CostBaseSnapshot.trade_date == trade_date,
+            CostBaseSnapshot.fuel_type == fuel_type,
+        )
+    )
+    return bool(await session.scalar(stmt))
+
+
 async def get_cost_snapshots_range(
     session: AsyncSession,
     fuel_type: str,
@@ -168,6 +349,79 @@ async def get_cost_snapshots_range(
     return list(result.scalars().all())
 
 
+async def iter_cost_snapshots_range(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+) -> AsyncGenerator[CostBaseSnapshot, None]:
+    """
+    Tarih araligindaki maliyet snapshot'larini akis olarak dondurur.
+
+    Uzun araliklar (export, grafik) icin: tum liste bellege alinmaz,
+    satirlar sunucu tarafli cursor'dan _STREAM_BATCH_SIZE'lik partilerle
+    cekilir. Liste gereken yerlerde get_cost_snapshots_range kullanilir.
+
+    Args:
+        session: Async veritabani oturumu.
+        fuel_type: Yakit tipi.
+        start_date: Baslangic tarihi (dahil).
+        end_date: Bitis tarihi (dahil).
+
+    Yields:
+        CostBaseSnapshot (trade_date'e gore sirali).
+    """
+    stmt = (
+        select(CostBaseSnapshot)
+        .where(
+            CostBaseSnapshot.fuel_type == fuel_type,
+            CostBaseSnapshot.trade_date >= start_date,
+            CostBaseSnapshot.trade_date <= end_date,
+        )
+        .order_by(CostBaseSnapshot.trade_date.asc())
+        .execution_options(yield_per=_STREAM_BATCH_SIZE)
+    )
+    result = await session.stream_scalars(stmt)
+    async for row in result:
+        yield row
+
+
+async def get_cost_snapshots_range_thin(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+    columns: tuple = _COST_SNAPSHOT_THIN_COLUMNS,
+) -> list[Row]:
+    """
+    Tarih araligindaki maliyet snapshot'larini yalnizca secili kolonlarla dondurur.
+
+    ORM nesnesi (ve selectin iliskileri) yuklenmez; varsayilan kolonlar
+    idx_cost_snapshot_fuel_date kapsayan indeksinden okunur.
+
+    Args:
+        session: Async veritabani oturumu.
+        fuel_type: Yakit tipi.
+        start_date: Baslangic tarihi (dahil).
+        end_date: Bitis tarihi (dahil).
+        columns: Okunacak kolonlar.
+
+    Returns:
+        Row listesi (trade_date'e gore sirali, kolonlara attribute ile erisilir).
+    """
+    stmt = (
+        select(*columns)
+        .where(
+            CostBaseSnapshot.fuel_type == fuel_type,
+            CostBaseSnapshot.trade_date >= start_date,
+            CostBaseSnapshot.trade_date <= end_date,
+        )
+        .order_by(CostBaseSnapshot.trade_date.asc())
+    )
+    result = await session.execute(stmt)
+    return list(result.all())
+
+
 # --- MBE Calculation Islemleri ---
 
 
@@ -237,20 +491,7 @@ async def upsert_mbe_calculation(
         "source": source,
     }
 
-    stmt = pg_insert(MBECalculation).values(**values)
-
-    update_fields = {
-        k: v for k, v in values.items() if k not in ("trade_date", "fuel_type")
-    }
-    update_fields["updated_at"] = text("NOW()")
-
-    stmt = stmt.on_conflict_do_update(
-        constraint="uq_mbe_calc_date_fuel",
-        set_=update_fields,
-    ).returning(MBECalculation)
-
-    result = await session.execute(stmt)
-    row = result.scalar_one()
+    (row,) = await upsert_mbe_calculations_bulk(session, [values])
 
     logger.info(
         "MBE hesaplama upsert: %s / %s (mbe=%s, trend=%s, regime=%d)",
@@ -264,6 +505,80 @@ async def upsert_mbe_calculation(
     return row
 
 
+async def upsert_mbe_calculation_id(
+    session: AsyncSession,
+    *,
+    trade_date: date,
+    fuel_type: str,
+    cost_snapshot_id: int,
+    nc_forward: Decimal,
+    nc_base: Decimal,
+    mbe_value: Decimal,
+    mbe_pct: Decimal,
+    sma_5: Decimal | None = None,
+    sma_10: Decimal | None = None,
+    delta_mbe: Decimal | None = None,
+    delta_mbe_3: Decimal | None = None,
+    trend_direction: str = "no_change",
+    regime: int = 0,
+    since_last_change_days: int = 0,
+    sma_window: int = 5,
+    source: str = "system",
+) -> int:
+    """
+    upsert_mbe_calculation ile ayni UPSERT; yalnizca kaydin ID'sini dondurur.
+
+    RETURNING id kullanilir, ORM nesnesi olusturulmaz.
+
+    Args:
+        upsert_mbe_calculation ile ayni.
+
+    Returns:
+        Eklenen veya guncellenen kaydin ID'si.
+    """
+    values = {
+        "trade_date": trade_date,
+        "fuel_type": fuel_type,
+        "cost_snapshot_id": cost_snapshot_id,
+        "nc_forward": nc_forward,
+        "nc_base": nc_base,
+        "mbe_value": mbe_value,
+        "mbe_pct": mbe_pct,
+        "sma_5": sma_5,
+        "sma_10": sma_10,
+        "delta_mbe": delta_mbe,
+        "delta_mbe_3": delta_mbe_3,
+        "trend_direction": trend_direction,
+        "regime": regime,
+        "since_last_change_days": since_last_change_days,
+        "sma_window": sma_window,
+        "source": source,
+    }
+    (row_id,) = await _bulk_upsert(session, _MBE_CALCULATION_UPSERT_ID, [values])
+    return row_id
+
+
+async def upsert_mbe_calculations_bulk(
+    session: AsyncSession,
+    rows: list[dict],
+) -> list[MBECalculation]:
+    """
+    Birden fazla MBE hesaplamasini tek round-trip ile UPSERT eder.
+
+    Args:
+        session: Async veritabani oturumu.
+        rows: upsert_mbe_calculation parametreleriyle ayni anahtarlara sahip
+            dict listesi (tum satirlarda ayni anahtar kumesi).
+
+    Returns:
+        Eklenen veya guncellenen MBECalculation kayitlari.
+    """
+    result = await _bulk_upsert(session, _MBE_CALCULATION_UPSERT, rows)
+    if len(rows) > 1:
+        logger.info("MBE hesaplama toplu upsert: %d satir", len(result))
+    return result
+
+
 async def get_latest_mbe(
     session: AsyncSession,
     fuel_type: str,
@@ -294,15 +609,21 @@ async def get_latest_mbe_all(
     """
     Tum yakit tipleri icin en son MBE hesaplamalarini dondurur.
 
+    Tek sorgu: SELECT DISTINCT ON (fuel_type) ... ORDER BY fuel_type,
+    trade_date DESC — her yakit tipi icin ayri round-trip yapilmaz.
+
     Returns:
-        MBECalculation listesi.
+        MBECalculation listesi (benzin, motorin, lpg sirasiyla).
     """
-    results = []
-    for fuel_type in ("benzin", "motorin", "lpg"):
-        mbe = await get_latest_mbe(session, fuel_type)
-        if mbe is not None:
-            results.append(mbe)
-    return results
+    stmt = (
+        select(MBECalculation)
+        .distinct(MBECalculation.fuel_type)
+        .where(MBECalculation.fuel_type.in_(_FUEL_TYPES))
+        .order_by(MBECalculation.fuel_type, MBECalculation.trade_date.desc())
+    )
+    result = await session.execute(stmt)
+    rows = result.scalars().all()
+    return sorted(rows, key=lambda r: _FUEL_TYPES.index(r.fuel_type))
 
 
 async def get_mbe_range(
@@ -336,6 +657,79 @@ async def get_mbe_range(
     return list(result.scalars().all())
 
 
+async def iter_mbe_range(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+) -> AsyncGenerator[MBECalculation, None]:
+    """
+    Tarih araligindaki MBE hesaplamalarini akis olarak dondurur.
+
+    Uzun araliklar (export, grafik) icin: tum liste bellege alinmaz,
+    satirlar sunucu tarafli cursor'dan _STREAM_BATCH_SIZE'lik partilerle
+    cekilir. Liste gereken yerlerde get_mbe_range kullanilir.
+
+    Args:
+        session: Async veritabani oturumu.
+        fuel_type: Yakit tipi.
+        start_date: Baslangic tarihi (dahil).
+        end_date: Bitis tarihi (dahil).
+
+    Yields:
+        MBECalculation (trade_date'e gore sirali).
+    """
+    stmt = (
+        select(MBECalculation)
+        .where(
+            MBECalculation.fuel_type == fuel_type,
+            MBECalculation.trade_date >= start_date,
+            MBECalculation.trade_date <= end_date,
+        )
+        .order_by(MBECalculation.trade_date.asc())
+        .execution_options(yield_per=_STREAM_BATCH_SIZE)
+    )
+    result = await session.stream_scalars(stmt)
+    async for row in result:
+        yield row
+
+
+async def get_mbe_range_thin(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+    columns: tuple = _MBE_THIN_COLUMNS,
+) -> list[Row]:
+    """
+    Tarih araligindaki MBE hesaplamalarini yalnizca secili kolonlarla dondurur.
+
+    ORM nesnesi yuklenmez; varsayilan kolonlar idx_mbe_calc_fuel_date
+    kapsayan indeksinden okunur.
+
+    Args:
+        session: Async veritabani oturumu.
+        fuel_type: Yakit tipi.
+        start_date: Baslangic tarihi (dahil).
+        end_date: Bitis tarihi (dahil).
+        columns: Okunacak kolonlar.
+
+    Returns:
+        Row listesi (trade_date'e gore sirali, kolonlara attribute ile erisilir).
+    """
+    stmt = (
+        select(*columns)
+        .where(
+            MBECalculation.fuel_type == fuel_type,
+            MBECalculation.trade_date >= start_date,
+            MBECalculation.trade_date <= end_date,
+        )
+        .order_by(MBECalculation.trade_date.asc())
+    )
+    result = await session.execute(stmt)
+    return list(result.all())
+
+
 async def get_mbe_at_date(
     session: AsyncSession,
     trade_date: date,
@@ -361,3 +755,30 @@ async def get_mbe_at_date(
     )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
+
+
+async def mbe_exists(
+    session: AsyncSession,
+    trade_date: date,
+    fuel_type: str,
+) -> bool:
+    """
+    Belirli tarih ve yakit tipi icin MBE hesaplamasi var mi?
+
+    SELECT EXISTS(...) ile tek boolean doner; ORM nesnesi yuklenmez.
+
+    Args:
+        session: Async veritabani oturumu.
+        trade_date: Islem tarihi.
+        fuel_type: Yakit tipi.
+
+    Returns:
+        Kayit varsa True.
+    """
+    stmt = select(literal(True)).where(
+        exists().where(
+            MBECalculation.trade_date == trade_date,
+            MBECalculation.fuel_type == fuel_type,
+        )
+    )
+    return bool(await session.scalar(stmt))
@@ -14,21 +14,33 @@ Durumlar:
 Kısa düşüşler (< 5 gün): Aynı watching devam, ilk cross_date korunur.
 
 Tüm hesaplamalar Decimal ile yapılır — float YASAK.
+(replay_delay_series NumPy'yi yalnızca bool/indeks dizileri için kullanır;
+MBE karşılaştırmaları Decimal ile yapılır.)
 """
 
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 from typing import Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # --- Sabitler ---
 BELOW_THRESHOLD_RESET = 5  # Eşik altında bu kadar gün kalınca ABSORBE_EDİLDİ
 
+# Sık kullanılan Decimal sabitleri — her çağrıda yeniden oluşturulmaz
+_ZERO = Decimal("0")
+_Z_PRECISION = Decimal("0.01")
+_Z_ANOMALY = Decimal("3")  # std=0 iken ortalamanın üstü → anormal
+_Z_NORMAL_LIMIT = Decimal("1.0")
+_Z_ALERT_LIMIT = Decimal("2.0")
+
 
 class DelayState(str, Enum):
     """Politik gecikme takip durumları."""
@@ -40,7 +52,15 @@ class DelayState(str, Enum):
     PARTIAL_CLOSE = "partial_close"
 
 
-@dataclass
+# Serileştirilmiş değer → DelayState (from_dict'te Enum __call__ yerine).
+# Üyeler de anahtar: str-Enum üyesinin hash'i değerinin hash'inden farklıdır.
+_DELAY_STATE_BY_VALUE: dict = {
+    **{member.value: member for member in DelayState},
+    **{member: member for member in DelayState},
+}
+
+
+@dataclass(slots=True)
 class DelayTracker:
     """
     Politik gecikme state machine durumu.
@@ -74,19 +94,35 @@ class DelayTracker:
     @classmethod
     def from_dict(cls, data: dict) -> "DelayTracker":
         """Dict'ten state oluştur."""
+        get = data.get
         return cls(
-            state=DelayState(data.get("state", "idle")),
-            threshold_cross_date=data.get("threshold_cross_date"),
-            current_delay_days=data.get("current_delay_days", 0),
-            mbe_at_cross=Decimal(str(data.get("mbe_at_cross", "0"))),
-            mbe_max=Decimal(str(data.get("mbe_max", "0"))),
-            regime=data.get("regime"),
-            z_score=Decimal(str(data.get("z_score", "0"))),
-            below_threshold_streak=data.get("below_threshold_streak", 0),
+            _delay_state(get("state", "idle")),
+            get("threshold_cross_date"),
+            get("current_delay_days", 0),
+            _to_decimal(get("mbe_at_cross", "0")),
+            _to_decimal(get("mbe_max", "0")),
+            get("regime"),
+            _to_decimal(get("z_score", "0")),
+            get("below_threshold_streak", 0),
         )
 
 
-@dataclass
+def _delay_state(value) -> DelayState:
+    """Serileştirilmiş durumu DelayState'e çevirir (geçersiz değerde ValueError)."""
+    state = _DELAY_STATE_BY_VALUE.get(value)
+    if state is None:
+        return DelayState(value)
+    return state
+
+
+def _to_decimal(value) -> Decimal:
+    """Serileştirilmiş değeri Decimal'e çevirir (JSON'dan gelen str için str() atlanır)."""
+    if type(value) is str:
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+@dataclass(slots=True)
 class DelayTransition:
     """Durum geçişi sonucu."""
 
@@ -178,7 +214,7 @@ def _handle_idle(
         tracker.mbe_max = current_mbe
         tracker.regime = regime_type
         tracker.below_threshold_streak = 0
-        tracker.z_score = Decimal("0")
+        tracker.z_score = _ZERO
 
         logger.info(
             "IDLE → WATCHING: MBE=%s ≥ θ=%s, tarih=%s",
@@ -229,13 +265,32 @@ def _handle_watching(
     # Z-score hesapla
     if historical_mean_delay is not None and historical_std_delay is not None:
         tracker.z_score = calculate_z_score(
-            Decimal(str(tracker.current_delay_days)),
+            Decimal(tracker.current_delay_days),
             historical_mean_delay,
             historical_std_delay,
         )
 
     # --- Fiyat değişikliği kontrolü ---
-    if price_changed and not partial_change:
+    # (z-score yukarıda hesaplanır: kapanan kaydın tracker'ı son z'yi taşır)
+    if price_changed:
+        if partial_change:
+            # Kademeli zam → PARTIAL_CLOSE
+            tracker.state = DelayState.PARTIAL_CLOSE
+
+            logger.info(
+                "WATCHING → PARTIAL_CLOSE: Kademeli zam, gecikme=%d gün",
+                tracker.current_delay_days,
+            )
+
+            return DelayTransition(
+                previous_state=DelayState.WATCHING,
+                new_state=DelayState.PARTIAL_CLOSE,
+                reason=f"Kademeli fiyat değişikliği, gecikme={tracker.current_delay_days} gün",
+                tracker=tracker,
+                should_close_record=True,
+                close_status="partial_close",
+            )
+
         # Tam zam → CLOSED
         tracker.state = DelayState.CLOSED
 
@@ -253,24 +308,6 @@ def _handle_watching(
             close_status="closed",
         )
 
-    if price_changed and partial_change:
-        # Kademeli zam → PARTIAL_CLOSE
-        tracker.state = DelayState.PARTIAL_CLOSE
-
-        logger.info(
-            "WATCHING → PARTIAL_CLOSE: Kademeli zam, gecikme=%d gün",
-            tracker.current_delay_days,
-        )
-
-        return DelayTransition(
-            previous_state=DelayState.WATCHING,
-            new_state=DelayState.PARTIAL_CLOSE,
-            reason=f"Kademeli fiyat değişikliği, gecikme={tracker.current_delay_days} gün",
-            tracker=tracker,
-            should_close_record=True,
-            close_status="partial_close",
-        )
-
     # --- Eşik altı kontrolü (5 gün kuralı) ---
     if current_mbe < threshold:
         tracker.below_threshold_streak += 1
@@ -313,6 +350,120 @@ def _handle_watching(
     )
 
 
+def replay_delay_series(
+    mbe_values: Sequence[Decimal],
+    threshold: Decimal,
+    price_changed: Sequence[bool],
+    dates: Sequence[str],
+) -> list[DelayTransition]:
+    """
+    Geçmiş seriyi IDLE'dan başlayarak tek seferde oynatır.
+
+    Her gün için update_tracker çağırmakla aynı geçişleri üretir (tam zam,
+    rejim ve z-score olmadan), fakat günler tek tek gezilmez: eşik üstü
+    günler, fiyat değişikliği günleri ve 5 gün üst üste eşik altı
+    pencerelerinin bitişleri sıralı indeks dizilerine çevrilir ve bir
+    sonraki geçiş searchsorted ile bulunur. Yalnızca durum değiştiren
+    günler için DelayTransition oluşturulur; her biri kendi tracker
+    kopyasını taşır.
+
+    Args:
+        mbe_values: Günlük MBE değerleri.
+        threshold: Eşik değeri (θ).
+        price_changed: Gün bazında zam geldi mi?
+        dates: Gün bazında ISO tarih.
+
+    Returns:
+        Durum değiştiren DelayTransition listesi (tarih sırasıyla).
+    """
+    n = len(mbe_values)
+    above = np.fromiter(
+        (mbe >= threshold for mbe in mbe_values), dtype=bool, count=n,
+    )
+    below_sum = np.concatenate(([0], np.cumsum(~above)))
+    # i günü biten BELOW_THRESHOLD_RESET günlük pencerenin tamamı eşik altı
+    window_ends = np.flatnonzero(
+        below_sum[BELOW_THRESHOLD_RESET:] - below_sum[:-BELOW_THRESHOLD_RESET]
+        == BELOW_THRESHOLD_RESET
+    ) + (BELOW_THRESHOLD_RESET - 1)
+    cross_days = np.flatnonzero(above)
+    change_days = np.flatnonzero(np.asarray(price_changed, dtype=bool))
+
+    transitions: list[DelayTransition] = []
+    day = 0
+    while True:
+        # IDLE → WATCHING: ilk eşik üstü gün
+        pos = np.searchsorted(cross_days, day)
+        if pos == len(cross_days):
+            break
+        start = int(cross_days[pos])
+        cross_mbe = mbe_values[start]
+        tracker = DelayTracker(
+            DelayState.WATCHING, dates[start], 0, cross_mbe, cross_mbe,
+        )
+        transitions.append(DelayTransition(
+            previous_state=DelayState.IDLE,
+            new_state=DelayState.WATCHING,
+            reason=f"MBE ({cross_mbe}) >= eşik ({threshold})",
+            tracker=tracker,
+            should_create_record=True,
+        ))
+
+        # WATCHING sonu: ilk zam günü veya ilk tam eşik altı pencere
+        pos = np.searchsorted(change_days, start + 1)
+        close_day = int(change_days[pos]) if pos < len(change_days) else n
+        pos = np.searchsorted(window_ends, start + BELOW_THRESHOLD_RESET)
+        absorb_day = int(window_ends[pos]) if pos < len(window_ends) else n
+        end = min(close_day, absorb_day)
+        if end >= n:
+            break
+
+        streak = 0
+        while end - streak - 1 > start and not above[end - streak - 1]:
+            streak += 1
+        tracker = DelayTracker(
+            DelayState.CLOSED, dates[start], end - start, cross_mbe,
+            max(mbe_values[start:end + 1]), None, _ZERO, streak,
+        )
+        if close_day <= absorb_day:
+            transitions.append(DelayTransition(
+                previous_state=DelayState.WATCHING,
+                new_state=DelayState.CLOSED,
+                reason=f"Fiyat değişikliği (tam zam), gecikme={end - start} gün",
+                tracker=tracker,
+                should_close_record=True,
+                close_status="closed",
+            ))
+        else:
+            tracker.state = DelayState.ABSORBED
+            tracker.below_threshold_streak = BELOW_THRESHOLD_RESET
+            transitions.append(DelayTransition(
+                previous_state=DelayState.WATCHING,
+                new_state=DelayState.ABSORBED,
+                reason=f"{BELOW_THRESHOLD_RESET} gün eşik altında → absorbe edildi",
+                tracker=tracker,
+                should_close_record=True,
+                close_status="absorbed",
+            ))
+
+        # Terminal durumdan ertesi gün IDLE'a dönülür (MBE bakılmaz)
+        if end + 1 >= n:
+            break
+        idle = DelayTracker(
+            DelayState.IDLE, tracker.threshold_cross_date, 0, tracker.mbe_at_cross,
+            tracker.mbe_max, None, _ZERO, 0,
+        )
+        transitions.append(DelayTransition(
+            previous_state=tracker.state,
+            new_state=DelayState.IDLE,
+            reason="Terminal durumdan IDLE'a dönüldü",
+            tracker=idle,
+        ))
+        day = end + 2
+
+    return transitions
+
+
 def calculate_z_score(
     current_delay: Decimal,
     historical_mean: Decimal,
@@ -336,14 +487,14 @@ def calculate_z_score(
     Returns:
         Z-skoru (Decimal).
     """
-    if historical_std == Decimal("0"):
+    if historical_std == _ZERO:
         # Std sapma sıfırsa — tek gözlem veya hep aynı gecikme
         if current_delay > historical_mean:
-            return Decimal("3")  # Anormal olarak işaretle
-        return Decimal("0")
+            return _Z_ANOMALY  # Anormal olarak işaretle
+        return _ZERO
 
     z = (current_delay - historical_mean) / historical_std
-    return z.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return z.quantize(_Z_PRECISION, ROUND_HALF_UP)
 
 
 def interpret_z_score(z: Decimal) -> str:
@@ -356,8 +507,8 @@ def interpret_z_score(z: Decimal) -> str:
     Returns:
         Yorum string'i: "normal", "dikkat" veya "anormal".
     """
-    if z < Decimal("1.0"):
+    if z < _Z_NORMAL_LIMIT:
         return "normal"
-    if z < Decimal("2.0"):
+    if z < _Z_ALERT_LIMIT:
         return "dikkat"
     return "anormal"
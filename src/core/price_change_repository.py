@@ -6,10 +6,12 @@ Tum fonksiyonlar async olarak calisir, AsyncSession kullanir.
 """
 
 import logging
+from collections.abc import AsyncGenerator
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import select, text
+from sqlalchemy import Row, func, select, text
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,6 +19,50 @@ from src.models.price_changes import PriceChange
 
 logger = logging.getLogger(__name__)
 
+# get_latest_price_changes_all donus sirasi
+_FUEL_TYPES = ("benzin", "motorin", "lpg")
+
+# Akis sorgularinda sunucu tarafli cursor'dan tek seferde cekilen satir sayisi
+_STREAM_BATCH_SIZE = 500
+
+# DO UPDATE SET disinda kalan kolonlar (PK, zaman damgalari, cakisma anahtari)
+_UPSERT_SKIP_COLUMNS = frozenset(
+    {"id", "created_at", "updated_at", "fuel_type", "change_date"}
+)
+
+
+def _build_upsert() -> Insert:
+    """
+    price_changes icin sabit INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+
+    VALUES kismi yoktur; satir execute() parametresi olarak verilir.
+    Ifade modul yuklenirken bir kez kurulur, her cagrida yalnizca
+    parametreler degisir ve derlenmis SQL cache'ten gelir. Guncelleme
+    degerleri EXCLUDED uzerinden okunur.
+    """
+    stmt = pg_insert(PriceChange)
+    update_fields = {
+        col.name: stmt.excluded[col.name]
+        for col in PriceChange.__table__.c
+        if col.name not in _UPSERT_SKIP_COLUMNS
+    }
+    update_fields["updated_at"] = text("NOW()")
+    return stmt.on_conflict_do_update(
+        constraint="uq_price_change_fuel_date",
+        set_=update_fields,
+    ).returning(PriceChange)
+
+
+_PRICE_CHANGE_UPSERT = _build_upsert()
+
+# get_latest_price_change_summary kolonlari — idx_price_change_fuel_date
+# kapsayan indeksinden (INCLUDE new_price, direction) okunur
+_SUMMARY_COLUMNS = (
+    PriceChange.change_date,
+    PriceChange.new_price,
+    PriceChange.direction,
+)
+
 
 async def upsert_price_change(
     session: AsyncSession,
@@ -35,7 +81,8 @@ async def upsert_price_change(
     """
     Fiyat degisikligi ekler veya gunceller (UPSERT).
 
-    ON CONFLICT (fuel_type, change_date) DO UPDATE ile calisir.
+    ON CONFLICT (fuel_type, change_date) DO UPDATE ile calisir; modul
+    yuklenirken kurulan _PRICE_CHANGE_UPSERT ifadesi kullanilir.
 
     Args:
         session: Async veritabani oturumu.
@@ -66,19 +113,7 @@ async def upsert_price_change(
         "notes": notes,
     }
 
-    stmt = pg_insert(PriceChange).values(**values)
-
-    update_fields = {
-        k: v for k, v in values.items() if k not in ("fuel_type", "change_date")
-    }
-    update_fields["updated_at"] = text("NOW()")
-
-    stmt = stmt.on_conflict_do_update(
-        constraint="uq_price_change_fuel_date",
-        set_=update_fields,
-    ).returning(PriceChange)
-
-    result = await session.execute(stmt)
+    result = await session.execute(_PRICE_CHANGE_UPSERT, [values])
     row = result.scalar_one()
 
     logger.info(
@@ -117,21 +152,55 @@ async def get_latest_price_change(
     return result.scalar_one_or_none()
 
 
+async def get_latest_price_change_summary(
+    session: AsyncSession,
+    fuel_type: str,
+) -> Row | None:
+    """
+    Belirli yakit tipi icin en son fiyat degisikliginin ozetini dondurur.
+
+    ORM nesnesi yuklenmez; yalnizca (change_date, new_price, direction)
+    okunur ve Postgres sonucu idx_price_change_fuel_date kapsayan
+    indeksinden (index-only scan) dondurebilir.
+
+    Args:
+        session: Async veritabani oturumu.
+        fuel_type: Yakit tipi.
+
+    Returns:
+        (change_date, new_price, direction) Row'u veya None.
+    """
+    stmt = (
+        select(*_SUMMARY_COLUMNS)
+        .where(PriceChange.fuel_type == fuel_type)
+        .order_by(PriceChange.change_date.desc())
+        .limit(1)
+    )
+    result = await session.execute(stmt)
+    return result.one_or_none()
+
+
 async def get_latest_price_changes_all(
     session: AsyncSession,
 ) -> list[PriceChange]:
     """
     Tum yakit tipleri icin en son fiyat degisikliklerini dondurur.
 
+    Tek sorgu: SELECT DISTINCT ON (fuel_type) ... ORDER BY fuel_type,
+    change_date DESC — her yakit tipi icin ayri round-trip yapilmaz.
+
     Returns:
-        PriceChange listesi.
+        PriceChange listesi (benzin, motorin, lpg sirasiyla).
     """
-    results = []
-    for fuel_type in ("benzin", "motorin", "lpg"):
-        pc = await get_latest_price_change(session, fuel_type)
-        if pc is not None:
-            results.append(pc)
-    return results
+    stmt = (
+        select(PriceChange)
+        .distinct(PriceChange.fuel_type)
+        .where(PriceChange.fuel_type.in_(_FUEL_TYPES))
+        .order_by(PriceChange.fuel_type, PriceChange.change_date.desc())
+    )
+    result = await session.execute(stmt)
+    rows = result.scalars().all()
+    return sorted(rows, key=lambda r: _FUEL_TYPES.index(r.fuel_type))
 
 
 async def get_price_changes_by_fuel(
@@ -191,6 +260,89 @@ async def get_price_changes_range(
     return list(result.scalars().all())
 
 
+async def get_price_change_stats_range(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+) -> dict:
+    """
+    Tarih araligindaki fiyat degisikliklerinin ozet istatistiklerini dondurur.
+
+    Toplamalar sunucu tarafinda tek sorguda hesaplanir; satirlar ve
+    PriceChange nesneleri Python'a tasinmaz. Ortalama, kolon olcegine
+    (8 ondalik) sunucuda yuvarlanir.
+
+    Args:
+        session: Async veritabani oturumu.
+        fuel_type: Yakit tipi.
+        start_date: Baslangic tarihi (dahil).
+        end_date: Bitis tarihi (dahil).
+
+    Returns:
+        Dict: count, avg_change_pct, max_change_amount, increase_count
+    """
+    stmt = select(
+        func.count(PriceChange.id).label("count"),
+        func.round(func.avg(PriceChange.change_pct), 8).label("avg_change_pct"),
+        func.max(PriceChange.change_amount).label("max_change_amount"),
+        func.count(PriceChange.id)
+        .filter(PriceChange.direction == "increase")
+        .label("increase_count"),
+    ).where(
+        PriceChange.fuel_type == fuel_type,
+        PriceChange.change_date >= start_date,
+        PriceChange.change_date <= end_date,
+    )
+    result = await session.execute(stmt)
+    row = result.one()
+
+    return {
+        "fuel_type": fuel_type,
+        "count": row.count or 0,
+        "avg_change_pct": row.avg_change_pct or Decimal("0"),
+        "max_change_amount": row.max_change_amount or Decimal("0"),
+        "increase_count": row.increase_count or 0,
+    }
+
+
+async def iter_price_changes_range(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+) -> AsyncGenerator[PriceChange, None]:
+    """
+    Tarih araligindaki fiyat degisikliklerini akis olarak dondurur.
+
+    Yillara yayilan araliklar icin: tum liste bellege alinmaz, satirlar
+    sunucu tarafli cursor'dan _STREAM_BATCH_SIZE'lik partilerle cekilir.
+    Liste gereken yerlerde get_price_changes_range kullanilir.
+
+    Args:
+        session: Async veritabani oturumu.
+        fuel_type: Yakit tipi.
+        start_date: Baslangic tarihi (dahil).
+        end_date: Bitis tarihi (dahil).
+
+    Yields:
+        PriceChange (change_date ASC sirali).
+    """
+    stmt = (
+        select(PriceChange)
+        .where(
+            PriceChange.fuel_type == fuel_type,
+            PriceChange.change_date >= start_date,
+            PriceChange.change_date <= end_date,
+        )
+        .order_by(PriceChange.change_date.asc())
+        .execution_options(yield_per=_STREAM_BATCH_SIZE)
+    )
+    result = await session.stream_scalars(stmt)
+    async for row in result:
+        yield row
+
+
 async def create_price_change(
     session: AsyncSession,
     *,
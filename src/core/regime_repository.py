@@ -8,6 +8,7 @@ Tüm veritabanı erişimi async olarak çalışır.
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncGenerator
 from datetime import date
 from typing import Optional, Sequence
 
@@ -18,6 +19,9 @@ from src.models.regime_events import RegimeEvent
 
 logger = logging.getLogger(__name__)
 
+# Akış sorgularında sunucu tarafı cursor'dan tek seferde çekilen satır sayısı
+_STREAM_BATCH_SIZE = 500
+
 
 async def create_regime_event(
     session: AsyncSession,
@@ -133,6 +137,41 @@ async def get_event_history(
     return result.scalars().all()
 
 
+async def iter_event_history(
+    session: AsyncSession,
+    event_type: Optional[str] = None,
+    limit: int = 10_000,
+) -> AsyncGenerator[RegimeEvent, None]:
+    """
+    Rejim olayı geçmişini akış olarak döndürür.
+
+    Analiz için büyük limitlerde: tüm liste belleğe alınmaz, satırlar
+    sunucu tarafı cursor'dan _STREAM_BATCH_SIZE'lık partilerle çekilir.
+    Küçük listeler için get_event_history kullanılır.
+
+    Args:
+        session: Async veritabanı oturumu.
+        event_type: Filtrelenecek olay tipi (None ise tümü).
+        limit: Maksimum kayıt sayısı.
+
+    Yields:
+        RegimeEvent (en yeniden en eskiye).
+    """
+    stmt = (
+        select(RegimeEvent)
+        .order_by(RegimeEvent.start_date.desc())
+        .limit(limit)
+        .execution_options(yield_per=_STREAM_BATCH_SIZE)
+    )
+
+    if event_type is not None:
+        stmt = stmt.where(RegimeEvent.event_type == event_type)
+
+    result = await session.stream_scalars(stmt)
+    async for row in result:
+        yield row
+
+
 async def deactivate_event(
     session: AsyncSession,
     event_id: int,
@@ -12,6 +12,8 @@ Formül:
                   + 0.15 × normalize(trend_momentum)
 
 Tüm hesaplamalar Decimal ile yapılır — float YASAK.
+(İstisna: calculate_risk_score_batch — yalnızca analiz/backtest taraması
+için float64; kaydedilen skorlar her zaman calculate_risk_score'dan gelir.)
 """
 
 from __future__ import annotations
@@ -21,6 +23,8 @@ from dataclasses import dataclass, field
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # --- Varsayılan Ağırlık Vektörü ---
@@ -32,8 +36,36 @@ DEFAULT_WEIGHTS: dict[str, Decimal] = {
     "trend_momentum": Decimal("0.15"),
 }
 
+# Varsayılan normalizasyon aralıkları: bileşen → (min, max)
+_DEFAULT_RANGES: dict[str, tuple[Decimal, Decimal]] = {
+    "mbe": (Decimal("0"), Decimal("1")),
+    "fx_volatility": (Decimal("0"), Decimal("0.10")),
+    "political_delay": (Decimal("0"), Decimal("60")),
+    "threshold_breach": (Decimal("0"), Decimal("1")),
+    "trend_momentum": (Decimal("-1"), Decimal("1")),
+}
+
+# Sık kullanılan Decimal sabitleri — her çağrıda yeniden oluşturulmaz.
+# quantize(_SCORE_PRECISION, ROUND_HALF_UP): rounding pozisyonel verilir
+# (keyword argüman ayrıştırma maliyeti quantize'ın kendisinden fazladır).
+_ZERO = Decimal("0")
+_ONE = Decimal("1")
+_SCORE_PRECISION = Decimal("0.0001")
+_CRISIS_THRESHOLD = Decimal("0.80")
+_HIGH_ALERT_THRESHOLD = Decimal("0.60")
+
+# Varsayılan aralıkların (min, max - min) hali, bileşen sırasıyla.
+# Varsayılan yapılandırmada aralık farkı ve sıfır-aralık kontrolü her
+# çağrıda tekrarlanmaz (tüm varsayılan aralıklar sıfırdan geniştir).
+_DEFAULT_SPANS: tuple[tuple[Decimal, Decimal], ...] = tuple(
+    (min_val, max_val - min_val) for min_val, max_val in _DEFAULT_RANGES.values()
+)
+
+# DEFAULT_WEIGHTS'in JSON uyumlu hali (her RiskResult'a kopyası verilir)
+_DEFAULT_WEIGHT_VECTOR: dict[str, str] = {k: str(v) for k, v in DEFAULT_WEIGHTS.items()}
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RiskComponents:
     """Risk skoru hesaplaması için girdi bileşenleri."""
 
@@ -44,7 +76,7 @@ class RiskComponents:
     trend_momentum: Decimal
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskResult:
     """Risk skoru hesaplama sonucu."""
 
@@ -81,18 +113,45 @@ def normalize_component(
     if max_val == min_val:
         # Sıfıra bölme koruması — eğer aralık yoksa değer min'de mi max'da mı bak
         if value <= min_val:
-            return Decimal("0")
-        return Decimal("1")
+            return _ZERO
+        return _ONE
 
     normalized = (value - min_val) / (max_val - min_val)
 
     # Clamp [0, 1]
-    if normalized < Decimal("0"):
-        return Decimal("0")
-    if normalized > Decimal("1"):
-        return Decimal("1")
+    if normalized < _ZERO:
+        return _ZERO
+    if normalized > _ONE:
+        return _ONE
 
-    return normalized.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+    return normalized.quantize(_SCORE_PRECISION, ROUND_HALF_UP)
+
+
+def _normalize_span(value: Decimal, min_val: Decimal, span: Decimal) -> Decimal:
+    """normalize_component'in aralık farkı önceden hesaplanmış hali (span != 0)."""
+    normalized = (value - min_val) / span
+    if normalized < _ZERO:
+        return _ZERO
+    if normalized > _ONE:
+        return _ONE
+    return normalized.quantize(_SCORE_PRECISION, ROUND_HALF_UP)
+
+
+def _normalize_defaults(
+    components: RiskComponents,
+) -> tuple[Decimal, Decimal, Decimal, Decimal, Decimal]:
+    """Bileşenleri varsayılan aralıklarla normalize eder (sözlük araması yok)."""
+    (
+        (mbe_min, mbe_span), (fx_min, fx_span), (delay_min, delay_span),
+        (breach_min, breach_span), (trend_min, trend_span),
+    ) = _DEFAULT_SPANS
+    return (
+        _normalize_span(components.mbe_value, mbe_min, mbe_span),
+        _normalize_span(components.fx_volatility, fx_min, fx_span),
+        _normalize_span(components.political_delay, delay_min, delay_span),
+        _normalize_span(components.threshold_breach, breach_min, breach_span),
+        _normalize_span(components.trend_momentum, trend_min, trend_span),
+    )
 
 
 def calculate_risk_score(
@@ -115,37 +174,33 @@ def calculate_risk_score(
     if weights is None:
         weights = DEFAULT_WEIGHTS
 
-    # Varsayılan normalizasyon aralıkları
+    # Bileşenleri normalize et — varsayılan aralıklar için hazır (min, span)
+    # tablosu; verilen aralıklarda eksik anahtarlar varsayılana düşer.
     if normalization_ranges is None:
-        normalization_ranges = {
-            "mbe": (Decimal("0"), Decimal("1")),
-            "fx_volatility": (Decimal("0"), Decimal("0.10")),
-            "political_delay": (Decimal("0"), Decimal("60")),
-            "threshold_breach": (Decimal("0"), Decimal("1")),
-            "trend_momentum": (Decimal("-1"), Decimal("1")),
-        }
-
-    # Bileşenleri normalize et
-    mbe_norm = normalize_component(
-        components.mbe_value,
-        *normalization_ranges.get("mbe", (Decimal("0"), Decimal("1"))),
-    )
-    fx_norm = normalize_component(
-        components.fx_volatility,
-        *normalization_ranges.get("fx_volatility", (Decimal("0"), Decimal("0.10"))),
-    )
-    delay_norm = normalize_component(
-        components.political_delay,
-        *normalization_ranges.get("political_delay", (Decimal("0"), Decimal("60"))),
-    )
-    breach_norm = normalize_component(
-        components.threshold_breach,
-        *normalization_ranges.get("threshold_breach", (Decimal("0"), Decimal("1"))),
-    )
-    trend_norm = normalize_component(
-        components.trend_momentum,
-        *normalization_ranges.get("trend_momentum", (Decimal("-1"), Decimal("1"))),
-    )
+        mbe_norm, fx_norm, delay_norm, breach_norm, trend_norm = (
+            _normalize_defaults(components)
+        )
+    else:
+        ranges = normalization_ranges.get
+        mbe_norm = normalize_component(
+            components.mbe_value, *ranges("mbe", _DEFAULT_RANGES["mbe"]),
+        )
+        fx_norm = normalize_component(
+            components.fx_volatility,
+            *ranges("fx_volatility", _DEFAULT_RANGES["fx_volatility"]),
+        )
+        delay_norm = normalize_component(
+            components.political_delay,
+            *ranges("political_delay", _DEFAULT_RANGES["political_delay"]),
+        )
+        breach_norm = normalize_component(
+            components.threshold_breach,
+            *ranges("threshold_breach", _DEFAULT_RANGES["threshold_breach"]),
+        )
+        trend_norm = normalize_component(
+            components.trend_momentum,
+            *ranges("trend_momentum", _DEFAULT_RANGES["trend_momentum"]),
+        )
 
     # Ağırlıklı toplam
     composite = (
@@ -154,19 +209,22 @@ def calculate_risk_score(
         + weights["political_delay"] * delay_norm
         + weights["threshold_breach"] * breach_norm
         + weights["trend_momentum"] * trend_norm
-    ).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+    ).quantize(_SCORE_PRECISION, ROUND_HALF_UP)
 
     # Clamp [0, 1]
-    if composite < Decimal("0"):
-        composite = Decimal("0")
-    elif composite > Decimal("1"):
-        composite = Decimal("1")
+    if composite < _ZERO:
+        composite = _ZERO
+    elif composite > _ONE:
+        composite = _ONE
 
     # Sistem modunu belirle
     system_mode = _determine_system_mode(composite)
 
     # Ağırlık vektörünü string'e çevir (JSON uyumluluk)
-    weight_vector = {k: str(v) for k, v in weights.items()}
+    if weights is DEFAULT_WEIGHTS:
+        weight_vector = dict(_DEFAULT_WEIGHT_VECTOR)
+    else:
+        weight_vector = {k: str(v) for k, v in weights.items()}
 
     return RiskResult(
         composite_score=composite,
@@ -180,6 +238,73 @@ def calculate_risk_score(
     )
 
 
+# calculate_risk_score_batch kolon sırası
+_BATCH_COMPONENTS = (
+    "mbe", "fx_volatility", "political_delay", "threshold_breach", "trend_momentum",
+)
+
+# Artan sıralı mod eşikleri; searchsorted sonucu _MODE_NAMES indeksidir
+_MODE_THRESHOLDS = np.array(
+    [float(_HIGH_ALERT_THRESHOLD), float(_CRISIS_THRESHOLD)], dtype=np.float64,
+)
+_MODE_NAMES = ("normal", "high_alert", "crisis")
+
+
+def calculate_risk_score_batch(
+    components: np.ndarray,
+    normalization_ranges: dict[str, tuple[Decimal, Decimal]] | None = None,
+    weights: dict[str, Decimal] | None = None,
+) -> np.ndarray:
+    """
+    N gün için bileşik risk skorunu float64 olarak tek seferde hesaplar.
+
+    calculate_risk_score ile aynı formül (min-max normalize + clamp,
+    ağırlıklı toplam + clamp, mod eşikleri) NumPy broadcast ile uygulanır;
+    satır başına Python çağrısı ve RiskResult nesnesi oluşturulmaz.
+    Ara değerler 4 ondalığa yuvarlanmadığından sonuçlar Decimal yolundan
+    en fazla ~1e-4 sapabilir — veritabanına yazılacak skorlar için
+    calculate_risk_score kullanılır.
+
+    Args:
+        components: (N, 5) dizi; kolonlar sırasıyla mbe, fx_volatility,
+            political_delay, threshold_breach, trend_momentum.
+        normalization_ranges: Her bileşen için (min, max) aralıkları.
+        weights: Bileşen ağırlıkları. Belirtilmezse DEFAULT_WEIGHTS.
+
+    Returns:
+        (N, 7) dizi: composite, 5 normalize bileşen, mod kodu
+        (_MODE_NAMES indeksi: 0=normal, 1=high_alert, 2=crisis).
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    if normalization_ranges is None:
+        normalization_ranges = _DEFAULT_RANGES
+
+    comps = np.asarray(components, dtype=np.float64).reshape(-1, len(_BATCH_COMPONENTS))
+    bounds = np.array(
+        [
+            normalization_ranges.get(name, _DEFAULT_RANGES[name])
+            for name in _BATCH_COMPONENTS
+        ],
+        dtype=np.float64,
+    )
+    mins, maxs = bounds[:, 0], bounds[:, 1]
+    w = np.array([weights[name] for name in _BATCH_COMPONENTS], dtype=np.float64)
+
+    span = maxs - mins
+    flat = span == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        norm = (comps - mins) / np.where(flat, 1.0, span)
+    # Aralık yoksa: min'de veya altındaysa 0, üstündeyse 1 (normalize_component ile aynı)
+    norm = np.where(flat, (comps > mins).astype(np.float64), norm)
+    norm = np.clip(norm, 0.0, 1.0)
+
+    composite = np.clip(norm @ w, 0.0, 1.0)
+    # side="right": eşiğe eşit skor üst moda düşer (_determine_system_mode'daki >=)
+    mode = np.searchsorted(_MODE_THRESHOLDS, composite, side="right")
+    return np.column_stack((composite, norm, mode))
+
+
 def check_threshold_breach(
     composite_score: Decimal,
     threshold_open: Decimal,
@@ -245,10 +370,13 @@ def apply_regime_modifier(
     modifier = regime_modifier.get(active_regime_type)
     if modifier is None:
         return threshold_open
+    if modifier == 1:
+        # Etkisiz çarpan — çarpma ve float ayrıştırması atlanır, yuvarlama aynı
+        return threshold_open.quantize(_SCORE_PRECISION, ROUND_HALF_UP)
 
     modifier_decimal = Decimal(str(modifier))
     modified = (threshold_open * modifier_decimal).quantize(
-        Decimal("0.0001"), rounding=ROUND_HALF_UP
+        _SCORE_PRECISION, ROUND_HALF_UP
     )
 
     logger.info(
@@ -272,8 +400,8 @@ def _determine_system_mode(composite_score: Decimal) -> str:
     Returns:
         Sistem modu: "normal", "high_alert" veya "crisis".
     """
-    if composite_score >= Decimal("0.80"):
+    if composite_score >= _CRISIS_THRESHOLD:
         return "crisis"
-    if composite_score >= Decimal("0.60"):
+    if composite_score >= _HIGH_ALERT_THRESHOLD:
         return "high_alert"
     return "normal"
@@ -7,13 +7,15 @@ Tüm veritabanı erişimi async olarak çalışır.
 
 from __future__ import annotations
 
+import json
 import logging
+from collections.abc import AsyncGenerator
 from datetime import date
 from decimal import Decimal
 from typing import Optional, Sequence
 
-from sqlalchemy import select, and_
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import Row, and_, column, select, table, text
+from sqlalchemy.dialects.postgresql import Insert, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.risk_scores import RiskScore
@@ -21,6 +23,61 @@ from src.models.risk_scores import RiskScore
 logger = logging.getLogger(__name__)
 
 
+# get_risk_range_rows varsayılan kolonları (API yanıt şemasının okuduğu alanlar)
+_RANGE_ROW_COLUMNS = (
+    RiskScore.id,
+    RiskScore.trade_date,
+    RiskScore.fuel_type,
+    RiskScore.composite_score,
+    RiskScore.mbe_component,
+    RiskScore.fx_volatility_component,
+    RiskScore.political_delay_component,
+    RiskScore.threshold_breach_component,
+    RiskScore.trend_momentum_component,
+    RiskScore.system_mode,
+    RiskScore.created_at,
+)
+
+# Akış sorgularında sunucu tarafı cursor'dan tek seferde çekilen satır sayısı
+_STREAM_BATCH_SIZE = 500
+
+# ON CONFLICT DO UPDATE ile güncellenen kolonlar
+_UPDATE_COLUMNS = (
+    "composite_score",
+    "mbe_component",
+    "fx_volatility_component",
+    "political_delay_component",
+    "threshold_breach_component",
+    "trend_momentum_component",
+    "weight_vector",
+    "system_mode",
+    "triggered_alerts",
+)
+
+
+def _build_upsert(*, returning: bool = True) -> Insert:
+    """
+    risk_scores için sabit INSERT ... ON CONFLICT DO UPDATE ifadesi.
+
+    VALUES kısmı yoktur; satırlar execute() parametresi olarak verilir
+    (ORM bulk INSERT / insertmanyvalues — SQLAlchemy satırları çok
+    satırlı VALUES sayfalarına böler). İfade modül yüklenirken bir kez
+    kurulur. returning=False ise RETURNING eklenmez, nesne oluşturulmaz.
+    """
+    stmt = pg_insert(RiskScore)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_risk_score_date_fuel",
+        set_={name: stmt.excluded[name] for name in _UPDATE_COLUMNS},
+    )
+    if returning:
+        stmt = stmt.returning(RiskScore, sort_by_parameter_order=True)
+    return stmt
+
+
+_RISK_SCORE_UPSERT = _build_upsert()
+_RISK_SCORE_UPSERT_NO_RETURN = _build_upsert(returning=False)
+
+
 async def upsert_risk_score(
     session: AsyncSession,
     trade_date: date,
@@ -43,37 +100,19 @@ async def upsert_risk_score(
     Returns:
         Eklenen/güncellenen RiskScore nesnesi.
     """
-    stmt = pg_insert(RiskScore).values(
-        trade_date=trade_date,
-        fuel_type=fuel_type,
-        composite_score=composite_score,
-        mbe_component=mbe_component,
-        fx_volatility_component=fx_volatility_component,
-        political_delay_component=political_delay_component,
-        threshold_breach_component=threshold_breach_component,
-        trend_momentum_component=trend_momentum_component,
-        weight_vector=weight_vector,
-        system_mode=system_mode,
-        triggered_alerts=triggered_alerts,
-    )
-
-    stmt = stmt.on_conflict_do_update(
-        constraint="uq_risk_score_date_fuel",
-        set_={
-            "composite_score": stmt.excluded.composite_score,
-            "mbe_component": stmt.excluded.mbe_component,
-            "fx_volatility_component": stmt.excluded.fx_volatility_component,
-            "political_delay_component": stmt.excluded.political_delay_component,
-            "threshold_breach_component": stmt.excluded.threshold_breach_component,
-            "trend_momentum_component": stmt.excluded.trend_momentum_component,
-            "weight_vector": stmt.excluded.weight_vector,
-            "system_mode": stmt.excluded.system_mode,
-            "triggered_alerts": stmt.excluded.triggered_alerts,
-        },
-    ).returning(RiskScore)
-
-    result = await session.execute(stmt)
-    row = result.scalar_one()
+    (row,) = await upsert_risk_scores_bulk(session, [{
+        "trade_date": trade_date,
+        "fuel_type": fuel_type,
+        "composite_score": composite_score,
+        "mbe_component": mbe_component,
+        "fx_volatility_component": fx_volatility_component,
+        "political_delay_component": political_delay_component,
+        "threshold_breach_component": threshold_breach_component,
+        "trend_momentum_component": trend_momentum_component,
+        "weight_vector": weight_vector,
+        "system_mode": system_mode,
+        "triggered_alerts": triggered_alerts,
+    }])
     logger.info(
         "Risk skoru UPSERT: tarih=%s, yakıt=%s, skor=%s",
         trade_date,
@@ -83,6 +122,129 @@ async def upsert_risk_score(
     return row
 
 
+async def upsert_risk_scores_bulk(
+    session: AsyncSession,
+    rows: list[dict],
+    *,
+    returning: bool = True,
+) -> list[RiskScore]:
+    """
+    Birden fazla risk skorunu tek execute() ile UPSERT eder.
+
+    Aynı (trade_date, fuel_type) anahtarı birden fazla kez geçerse
+    sonuncusu kullanılır (Postgres aynı satırı tek komutta iki kez
+    güncellemeye izin vermez).
+
+    Args:
+        session: Async veritabanı oturumu.
+        rows: upsert_risk_score parametreleriyle aynı anahtarlara sahip
+            dict listesi (tüm satırlarda aynı anahtar kümesi).
+        returning: False ise RETURNING atlanır ve boş liste döner
+            (toplu yeniden hesaplamada nesne oluşturulmaz).
+
+    Returns:
+        Eklenen/güncellenen RiskScore nesneleri (returning=False ise []).
+    """
+    if not rows:
+        return []
+
+    deduped = list({(r["trade_date"], r["fuel_type"]): r for r in rows}.values())
+    if not returning:
+        await session.execute(_RISK_SCORE_UPSERT_NO_RETURN, deduped)
+        result = []
+    else:
+        result = list(
+            (await session.execute(_RISK_SCORE_UPSERT, deduped)).scalars().all()
+        )
+    if len(rows) > 1:
+        logger.info("Risk skoru toplu upsert: %d satır", len(deduped))
+    return result
+
+
+# COPY ile aktarılan kolonlar (risk_scores_stage tablosunun kolonları)
+_COPY_COLUMNS = (
+    "trade_date",
+    "fuel_type",
+    *_UPDATE_COLUMNS,
+)
+
+# Bu satır sayısının altında COPY yerine upsert_risk_scores_bulk kullanılır
+_COPY_THRESHOLD = 500
+
+_STAGE_TABLE = table("risk_scores_stage", *(column(name) for name in _COPY_COLUMNS))
+
+_CREATE_STAGE = text(
+    "CREATE TEMP TABLE risk_scores_stage ON COMMIT DROP AS "
+    f"SELECT {', '.join(_COPY_COLUMNS)} FROM risk_scores WITH NO DATA"
+)
+_DROP_STAGE = text("DROP TABLE risk_scores_stage")
+
+
+def _build_stage_merge() -> Insert:
+    """risk_scores_stage → risk_scores INSERT ... SELECT ... ON CONFLICT ifadesi."""
+    stmt = pg_insert(RiskScore).from_select(_COPY_COLUMNS, select(_STAGE_TABLE))
+    return stmt.on_conflict_do_update(
+        constraint="uq_risk_score_date_fuel",
+        set_={name: stmt.excluded[name] for name in _UPDATE_COLUMNS},
+    )
+
+
+_STAGE_MERGE = _build_stage_merge()
+
+
+def _jsonb_text(value: Optional[dict]) -> Optional[str]:
+    """JSONB değerini COPY için metne çevirir; None'ı JSON 'null' yapmaz."""
+    return json.dumps(value) if value is not None else None
+
+
+async def copy_risk_scores(
+    session: AsyncSession,
+    rows: list[dict],
+) -> int:
+    """
+    Geçmiş doldurma (backfill) için risk skorlarını COPY ile yazar.
+
+    Satırlar asyncpg copy_records_to_table ile geçici risk_scores_stage
+    tablosuna aktarılır, ardından tek INSERT ... SELECT ... ON CONFLICT
+    DO UPDATE ile risk_scores'a birleştirilir; geçici tablo hemen
+    kaldırılır (aynı transaction'da tekrar çağrılabilir). _COPY_THRESHOLD
+    altındaki satır sayısında upsert_risk_scores_bulk kullanılır.
+
+    Args:
+        session: Async veritabanı oturumu (asyncpg sürücüsü).
+        rows: upsert_risk_score parametreleriyle aynı anahtarlara sahip
+            dict listesi.
+
+    Returns:
+        Yazılan satır sayısı (aynı anahtarlı tekrarlar düşüldükten sonra).
+    """
+    deduped = list({(r["trade_date"], r["fuel_type"]): r for r in rows}.values())
+    if len(deduped) < _COPY_THRESHOLD:
+        await upsert_risk_scores_bulk(session, deduped, returning=False)
+        return len(deduped)
+
+    # JSONB kolonu COPY'de metin olarak gönderilir; None SQL NULL kalır
+    records = [
+        tuple(
+            _jsonb_text(row[name]) if name == "weight_vector" else row[name]
+            for name in _COPY_COLUMNS
+        )
+        for row in deduped
+    ]
+
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    await session.execute(_CREATE_STAGE)
+    await raw.driver_connection.copy_records_to_table(
+        "risk_scores_stage", records=records, columns=_COPY_COLUMNS,
+    )
+    await session.execute(_STAGE_MERGE)
+    await session.execute(_DROP_STAGE)
+
+    logger.info("Risk skoru COPY backfill: %d satır", len(records))
+    return len(records)
+
+
 async def get_latest_risk(
     session: AsyncSession,
     fuel_type: str,
@@ -120,6 +282,69 @@ async def get_risk_range(
     return result.scalars().all()
 
 
+async def get_risk_range_rows(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+    columns: tuple = _RANGE_ROW_COLUMNS,
+) -> list[Row]:
+    """
+    Tarih aralığındaki risk skorlarını yalnızca seçili kolonlarla döndürür.
+
+    ORM nesnesi oluşturulmaz; JSONB/ARRAY kolonları (weight_vector,
+    triggered_alerts) varsayılan olarak okunmaz.
+
+    Returns:
+        Row listesi (trade_date'e göre sıralı, kolonlara attribute ile erişilir).
+    """
+    stmt = (
+        select(*columns)
+        .where(
+            and_(
+                RiskScore.fuel_type == fuel_type,
+                RiskScore.trade_date >= start_date,
+                RiskScore.trade_date <= end_date,
+            )
+        )
+        .order_by(RiskScore.trade_date.asc())
+    )
+    result = await session.execute(stmt)
+    return list(result.all())
+
+
+async def iter_risk_range(
+    session: AsyncSession,
+    fuel_type: str,
+    start_date: date,
+    end_date: date,
+) -> AsyncGenerator[RiskScore, None]:
+    """
+    Tarih aralığındaki risk skorlarını akış olarak döndürür.
+
+    Çok yıllık aralıklar için: tüm liste belleğe alınmaz, satırlar sunucu
+    tarafı cursor'dan _STREAM_BATCH_SIZE'lık partilerle çekilir.
+
+    Yields:
+        RiskScore (trade_date'e göre sıralı).
+    """
+    stmt = (
+        select(RiskScore)
+        .where(
+            and_(
+                RiskScore.fuel_type == fuel_type,
+                RiskScore.trade_date >= start_date,
+                RiskScore.trade_date <= end_date,
+            )
+        )
+        .order_by(RiskScore.trade_date.asc())
+        .execution_options(yield_per=_STREAM_BATCH_SIZE)
+    )
+    result = await session.stream_scalars(stmt)
+    async for row in result:
+        yield row
+
+
 async def get_high_risk_days(
     session: AsyncSession,
     fuel_type: str,
@@ -5,6 +5,8 @@ Dinamik eşik parametrelerini yöneten servis. Hysteresis (açılış/kapanış)
 cooldown süresi ve varsayılan eşik seed'leme işlevlerini sağlar.
 
 Tüm hesaplamalar Decimal ile yapılır — float YASAK.
+(İstisna: check_hysteresis_batch — toplu alarm taraması için float64
+karşılaştırma maskesi; hesaplanan/kaydedilen değer yoktur.)
 """
 
 from __future__ import annotations
@@ -15,6 +17,8 @@ from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Optional, Sequence
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,6 +68,24 @@ DEFAULT_THRESHOLDS: list[ThresholdDef] = [
 ]
 
 
+# build_threshold_seed_data şablonları — valid_from dışındaki alanlar sabit,
+# modül yüklenirken bir kez kurulur (her çağrıda yalnızca kopyalanır)
+_SEED_TEMPLATES: tuple[dict, ...] = tuple(
+    {
+        "fuel_type": None,  # Tüm yakıt tipleri için geçerli
+        "metric_name": td.metric_name,
+        "alert_level": td.alert_level,
+        "threshold_open": td.threshold_open,
+        "threshold_close": td.threshold_close,
+        "cooldown_hours": td.cooldown_hours,
+        "regime_modifier": None,
+        "version": 1,
+        "valid_to": None,
+    }
+    for td in DEFAULT_THRESHOLDS
+)
+
+
 def check_hysteresis(
     current_value: Decimal,
     threshold_open: Decimal,
@@ -95,6 +117,42 @@ def check_hysteresis(
         return current_value > threshold_close
 
 
+def check_hysteresis_batch(
+    current_values,
+    thresholds_open,
+    thresholds_close,
+    previous_alerts_active,
+) -> np.ndarray:
+    """
+    check_hysteresis'in N değer için tek seferde çalışan hali.
+
+    Girdiler float64/bool dizilere bir kez çevrilir ve NumPy broadcast ile
+    karşılaştırılır (eşikler skaler de verilebilir). Float yalnızca
+    karşılaştırma maskesi için kullanılır; tek değerlik kontroller ve
+    kaydedilen eşikler Decimal kalır (check_hysteresis).
+
+    Değerler zaten float dizisiyken (ör. calculate_risk_score_batch
+    çıktısı) kazanç sağlar; Decimal listelerinde float dönüşümü
+    check_hysteresis döngüsünden pahalıdır.
+
+    Args:
+        current_values: Mevcut metrik değerleri.
+        thresholds_open: Alarm açılış eşikleri (üst).
+        thresholds_close: Alarm kapanış eşikleri (alt).
+        previous_alerts_active: Önceki alarm durumları.
+
+    Returns:
+        bool dizisi — True = alarm aktif olmalı.
+    """
+    values = np.asarray(current_values, dtype=np.float64)
+    opens = np.asarray(thresholds_open, dtype=np.float64)
+    closes = np.asarray(thresholds_close, dtype=np.float64)
+    active = np.asarray(previous_alerts_active, dtype=bool)
+
+    # Alarm açıkken kapanış eşiğinin üstünde kalmalı, kapalıyken açılışa ulaşmalı
+    return np.where(active, values > closes, values >= opens)
+
+
 def check_cooldown(
     last_alert_time: Optional[datetime],
     cooldown_hours: int,
@@ -149,22 +207,14 @@ def build_threshold_seed_data(valid_from: Optional[date] = None) -> list[dict]:
     if valid_from is None:
         valid_from = date.today()
 
-    seed_data = []
-    for td in DEFAULT_THRESHOLDS:
-        seed_data.append({
-            "fuel_type": None,  # Tüm yakıt tipleri için geçerli
-            "metric_name": td.metric_name,
-            "alert_level": td.alert_level,
-            "threshold_open": td.threshold_open,
-            "threshold_close": td.threshold_close,
-            "cooldown_hours": td.cooldown_hours,
-            "regime_modifier": None,
-            "version": 1,
-            "valid_from": valid_from,
-            "valid_to": None,
-        })
+    return [{**tpl, "valid_from": valid_from} for tpl in _SEED_TEMPLATES]
+
 
-    return seed_data
+def _as_decimal(value) -> Decimal:
+    """Değeri Decimal'e çevirir; zaten Decimal ise str() ayrıştırması atlanır."""
+    if type(value) is Decimal:
+        return value
+    return Decimal(str(value))
 
 
 def apply_regime_to_thresholds(
@@ -189,13 +239,13 @@ def apply_regime_to_thresholds(
     if modifier is None:
         return list(thresholds)
 
-    modifier_decimal = Decimal(str(modifier))
+    modifier_decimal = _as_decimal(modifier)
     modified = []
 
     for t in thresholds:
         t_copy = dict(t)
-        t_copy["threshold_open"] = Decimal(str(t["threshold_open"])) * modifier_decimal
-        t_copy["threshold_close"] = Decimal(str(t["threshold_close"])) * modifier_decimal
+        t_copy["threshold_open"] = _as_decimal(t["threshold_open"]) * modifier_decimal
+        t_copy["threshold_close"] = _as_decimal(t["threshold_close"]) * modifier_decimal
         modified.append(t_copy)
 
     logger.info(
@@ -9,7 +9,8 @@ import logging
 from datetime import date, timedelta
 from decimal import Decimal
 
-from sqlalchemy import select, text
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -101,6 +102,102 @@ async def upsert_market_data(
     return row
 
 
+# Toplu upsert'te NULL gelirse mevcut değeri koruyan opsiyonel alanlar
+_NULLABLE_MARKET_FIELDS = (
+    "brent_usd_bbl",
+    "cif_med_usd_ton",
+    "usd_try_rate",
+    "pump_price_tl_lt",
+    "distribution_margin_tl",
+    "raw_payload",
+)
+
+# Toplu upsert satırlarında eksik anahtarlar için varsayılanlar
+# (upsert_market_data parametre varsayılanlarıyla aynı). raw_payload
+# bilinçli olarak yok: JSONB kolonunda Python None JSON 'null' olarak
+# gönderilir ve COALESCE mevcut payload'ı ezer. Anahtar hiç gönderilmezse
+# excluded.raw_payload SQL NULL olur ve mevcut değer korunur.
+_MARKET_ROW_DEFAULTS = {
+    **dict.fromkeys(f for f in _NULLABLE_MARKET_FIELDS if f != "raw_payload"),
+    "data_quality_flag": "verified",
+    "source": "",
+}
+
+
+def _market_params(row: dict) -> dict:
+    """Toplu upsert satırını varsayılanlarla tamamlar; None raw_payload'ı atar."""
+    params = {**_MARKET_ROW_DEFAULTS, **row}
+    if "raw_payload" in params and params["raw_payload"] is None:
+        del params["raw_payload"]
+    return params
+
+
+def _build_market_upsert() -> Insert:
+    """
+    Sabit INSERT ... ON CONFLICT DO UPDATE ifadesi (VALUES kısmı yok).
+
+    Satırlar execute() parametresi olarak verilir; ifade modül yüklenirken
+    bir kez kurulur ve derlenmiş SQL cache'ten gelir. Opsiyonel alanlarda
+    None gelen değer mevcut kaydı ezmez (COALESCE(excluded, mevcut)).
+    """
+    stmt = pg_insert(DailyMarketData)
+    table = DailyMarketData.__table__
+
+    update_fields = {}
+    for key in (*_MARKET_ROW_DEFAULTS, "raw_payload"):
+        if key in _NULLABLE_MARKET_FIELDS:
+            update_fields[key] = func.coalesce(stmt.excluded[key], table.c[key])
+        else:
+            update_fields[key] = stmt.excluded[key]
+    update_fields["updated_at"] = text("NOW()")
+
+    return stmt.on_conflict_do_update(
+        constraint="uq_daily_market_date_fuel",
+        set_=update_fields,
+    )
+
+
+_MARKET_DATA_UPSERT = _build_market_upsert()
+
+
+async def bulk_upsert_market_data(
+    session: AsyncSession,
+    rows: list[dict],
+) -> int:
+    """
+    Birden fazla piyasa verisi satırını tek INSERT ... ON CONFLICT ile yazar.
+
+    upsert_market_data ile aynı semantik korunur: opsiyonel alanlarda None
+    gelen ya da eksik olan değer mevcut kaydı ezmez (None raw_payload hiç
+    gönderilmez, JSON 'null' yazılmaz). Aynı (trade_date,
+    fuel_type) anahtarı batch içinde birden fazla kez geçerse sonuncusu
+    kullanılır (Postgres aynı satırı tek komutta iki kez güncellemeye
+    izin vermez).
+
+    Args:
+        session: Async veritabanı oturumu
+        rows: trade_date ve fuel_type içeren satır sözlükleri
+
+    Returns:
+        Yazılan satır sayısı
+    """
+    if not rows:
+        return 0
+
+    deduped = {
+        (r["trade_date"], r["fuel_type"]): _market_params(r) for r in rows
+    }
+    params = list(deduped.values())
+    await session.execute(_MARKET_DATA_UPSERT, params)
+
+    logger.info(
+        "Piyasa verisi toplu upsert: %d satır (%s)",
+        len(params),
+        ", ".join(f"{r['trade_date']}/{r['fuel_type']}" for r in params),
+    )
+    return len(params)
+
+
 async def get_latest_data(
     session: AsyncSession,
     fuel_type: str,
@@ -25,6 +25,8 @@ from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any
 
+import numpy as np
+
 from src.core.mbe_calculator import (
     _safe_decimal,
     calculate_nc_forward,
@@ -115,6 +117,33 @@ def _compute_sma_float(series: list[float], window: int) -> float:
     return sum(window_data) / len(window_data)
 
 
+def calculate_sma_fast(series: np.ndarray | list[float], window: int) -> np.ndarray:
+    """
+    SMA serisinin float64 (numpy) karsiligi — goruntuleme/analiz icin.
+
+    calculate_sma ile ayni tanim (yetersiz veride mevcut ortalama), tek
+    cumsum gecisiyle hesaplanir. Sonuclar Decimal yoluyla ~1e-9 icinde
+    ortusur; veritabanina yazilan degerler her zaman mbe_calculator'daki
+    Decimal fonksiyonlarindan gelir, bu fonksiyon kayit icin kullanilmaz.
+
+    Raises:
+        ValueError: window < 1 veya series bos ise.
+    """
+    if window < 1:
+        raise ValueError(f"SMA pencere genisligi en az 1 olmalidir, verilen: {window}")
+    arr = np.asarray(series, dtype=np.float64)
+    if arr.size == 0:
+        raise ValueError("SMA hesabi icin en az 1 veri noktasi gerekli")
+
+    csum = np.cumsum(arr)
+    out = np.empty_like(csum)
+    head = min(window, arr.size)
+    out[:head] = csum[:head] / np.arange(1, head + 1)
+    if arr.size > window:
+        out[window:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
 def _compute_std_float(series: list[float]) -> float:
     """Float serisi icin standart sapma hesaplar."""
     if len(series) < 2:
@@ -155,15 +155,16 @@ class Alert(Base):
     # --- Kısıtlamalar ve İndeksler ---
     __table_args__ = (
         Index("idx_alert_level", "alert_level"),
-        Index("idx_alert_fuel", "fuel_type"),
+        # get_alerts: filtre + ORDER BY created_at DESC LIMIT N (008)
+        Index("idx_alert_fuel_created", "fuel_type", text("created_at DESC")),
         Index(
-            "idx_alert_unread",
-            "is_read",
+            "idx_alert_unread_created",
+            text("created_at DESC"),
             postgresql_where=text("is_read = FALSE"),
         ),
         Index(
-            "idx_alert_unresolved",
-            "is_resolved",
+            "idx_alert_unresolved_created",
+            text("created_at DESC"),
             postgresql_where=text("is_resolved = FALSE"),
         ),
         Index("idx_alert_created", "created_at"),
@@ -159,7 +159,21 @@ class CostBaseSnapshot(Base):
             name="uq_cost_snapshot_date_fuel",
         ),
         Index("idx_cost_snapshot_date", "trade_date"),
-        Index("idx_cost_snapshot_fuel_date", "fuel_type", "trade_date"),
+        # Kapsayan indeks: get_cost_snapshots_range_thin index-only scan ile okunur
+        Index(
+            "idx_cost_snapshot_fuel_date",
+            "fuel_type",
+            "trade_date",
+            postgresql_include=[
+                "cif_component_tl",
+                "margin_component_tl",
+                "theoretical_cost_tl",
+                "actual_pump_price_tl",
+                "implied_cif_usd_ton",
+                "cost_gap_tl",
+                "cost_gap_pct",
+            ],
+        ),
         Index("idx_cost_snapshot_market_data", "market_data_id"),
         Index("idx_cost_snapshot_tax_param", "tax_parameter_id"),
         {"comment": "Gunluk maliyet ayristirma snapshot'lari"},
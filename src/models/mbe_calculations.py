@@ -175,7 +175,15 @@ class MBECalculation(Base):
             name="uq_mbe_calc_date_fuel",
         ),
         Index("idx_mbe_calc_date", "trade_date"),
-        Index("idx_mbe_calc_fuel_date", "fuel_type", "trade_date"),
+        # Kapsayan indeks: get_mbe_range_thin index-only scan ile okunur
+        Index(
+            "idx_mbe_calc_fuel_date",
+            "fuel_type",
+            "trade_date",
+            postgresql_include=[
+                "mbe_value", "mbe_pct", "nc_forward", "nc_base", "trend_direction",
+            ],
+        ),
         Index("idx_mbe_calc_regime", "regime"),
         Index("idx_mbe_calc_snapshot", "cost_snapshot_id"),
         {"comment": "MBE (Maliyet Baz Etkisi) hesaplama sonuclari"},
@@ -125,7 +125,12 @@ class PriceChange(Base):
             name="uq_price_change_fuel_date",
         ),
         Index("idx_price_change_date", "change_date"),
-        Index("idx_price_change_fuel_date", "fuel_type", "change_date"),
+        Index(
+            "idx_price_change_fuel_date",
+            "fuel_type",
+            "change_date",
+            postgresql_include=["new_price", "direction"],
+        ),
         Index("idx_price_change_direction", "direction"),
         {"comment": "Gecmis akaryakit fiyat degisiklikleri (zam/indirim)"},
     )
@@ -7,6 +7,7 @@ v6: Kalibrasyon bypass, gevşetilmiş threshold, deterministik alarm entegrasyon
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
@@ -338,15 +339,25 @@ def predict_all(
     target_date: Optional[date] = None,
     db_url: Optional[str] = None,
 ) -> dict:
-    """3 yakıt tipi için tahmin."""
-    results = {}
-    for fuel in FUEL_TYPES:
+    """
+    3 yakıt tipi için tahmin.
+
+    Yakıt tipleri birbirinden bağımsız; her biri ayrı thread'de çalışır.
+    predict() süresinin çoğu psycopg2 sorguları ve LightGBM skorlaması —
+    ikisi de GIL'i bırakır. Celery prefork worker'ları daemon süreç
+    olduğundan alt süreç havuzu (ProcessPoolExecutor) açılamaz.
+    """
+
+    def _predict_safe(fuel: str) -> Optional[dict]:
         try:
-            results[fuel] = predict(fuel, target_date=target_date, db_url=db_url)
+            return predict(fuel, target_date=target_date, db_url=db_url)
         except Exception as exc:
             logger.error("predict_all hatasi: %s — %s", fuel, exc)
-            results[fuel] = None
-    return results
+            return None
+
+    with ThreadPoolExecutor(max_workers=len(FUEL_TYPES)) as executor:
+        futures = {fuel: executor.submit(_predict_safe, fuel) for fuel in FUEL_TYPES}
+        return {fuel: future.result() for fuel, future in futures.items()}
 
 
 def clear_model_cache() -> None:
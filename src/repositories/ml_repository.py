@@ -10,6 +10,7 @@ from datetime import date
 from decimal import Decimal
 
 from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -94,6 +95,81 @@ async def upsert_ml_prediction(
     return row
 
 
+# Toplu upsert satirlarinda eksik anahtarlar icin varsayilanlar
+# (upsert_ml_prediction parametre varsayilanlariyla ayni)
+_ML_ROW_DEFAULTS = {
+    "expected_change_tl": None,
+    "system_mode": "full",
+    "shap_top_features": None,
+}
+
+# DO UPDATE SET disinda kalan kolonlar
+_UPSERT_SKIP_COLUMNS = frozenset(
+    {"id", "created_at", "updated_at", "fuel_type", "prediction_date"}
+)
+
+
+def _build_upsert() -> Insert:
+    """
+    Sabit INSERT ... ON CONFLICT DO UPDATE ifadesi (VALUES kismi yok).
+
+    Satirlar execute() parametresi olarak verilir; ifade modul yuklenirken
+    bir kez kurulur ve derlenmis SQL cache'ten gelir.
+    """
+    stmt = pg_insert(MLPrediction)
+    update_fields = {
+        col.name: stmt.excluded[col.name]
+        for col in MLPrediction.__table__.c
+        if col.name not in _UPSERT_SKIP_COLUMNS
+    }
+    update_fields["updated_at"] = text("NOW()")
+    return stmt.on_conflict_do_update(
+        constraint="uq_ml_pred_fuel_date",
+        set_=update_fields,
+    )
+
+
+_ML_PREDICTION_UPSERT = _build_upsert()
+
+
+async def bulk_upsert_ml_predictions(
+    session: AsyncSession,
+    rows: list[dict],
+) -> int:
+    """
+    Birden fazla ML tahmin kaydini tek INSERT ... ON CONFLICT ile yazar.
+
+    Her satir upsert_ml_prediction ile ayni alanlari icerir. Tum satirlar
+    tek round-trip'te gonderilir; commit cagiranin sorumlulugundadir.
+    Ayni (prediction_date, fuel_type) anahtari batch icinde birden fazla
+    kez gecerse sonuncusu kullanilir.
+
+    Args:
+        session: Async veritabani oturumu.
+        rows: Tahmin satirlari (fuel_type, prediction_date, ... anahtarlari).
+
+    Returns:
+        Yazilan satir sayisi.
+    """
+    if not rows:
+        return 0
+
+    deduped = {
+        (r["prediction_date"], r["fuel_type"]): {**_ML_ROW_DEFAULTS, **r}
+        for r in rows
+    }
+    params = list(deduped.values())
+    await session.execute(_ML_PREDICTION_UPSERT, params)
+
+    logger.info(
+        "ML tahmin toplu upsert: %d kayit (%s)",
+        len(params),
+        ", ".join(r["fuel_type"] for r in params),
+    )
+
+    return len(params)
+
+
 async def get_latest_prediction(
     session: AsyncSession,
     fuel_type: str,
@@ -36,3 +36,26 @@ def sample_fx_rate():
         source="tcmb_evds",
         raw_data={"Tarih": "14-02-2026", "TP_DK_USD_S_YTL": "36.25"},
     )
+
+
+class _AsyncRowStream:
+    """session.stream_scalars() sonucunu taklit eden async iterator."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        self._it = iter(self._rows)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+@pytest.fixture
+def async_stream():
+    """Verilen satırları sırayla döndüren async iterator fabrikası."""
+    return _AsyncRowStream
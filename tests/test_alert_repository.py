@@ -0,0 +1,78 @@
+"""
+Alert repository birim testleri.
+
+Veritabanı gerektirmez — session mock'lanır, üretilen SQL yapısı
+ve dönüş değerleri doğrulanır.
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.alert_repository import bulk_create_alerts, get_alerts
+
+
+def _alert_row(fuel_type: str) -> dict:
+    return {
+        "alert_level": "warning",
+        "alert_type": "risk_threshold",
+        "fuel_type": fuel_type,
+        "title": f"{fuel_type} risk eşiği aşıldı",
+        "message": "Bileşik risk skoru eşiğin üzerinde",
+        "metric_name": "composite_score",
+        "metric_value": Decimal("0.72"),
+        "threshold_value": Decimal("0.60"),
+    }
+
+
+class TestBulkCreateAlerts:
+    """bulk_create_alerts testleri."""
+
+    @pytest.mark.asyncio
+    async def test_single_execute_for_all_rows(self):
+        """Tüm satırlar tek execute çağrısıyla yazılmalı, ID'ler dönmeli."""
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [11, 12, 13]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        rows = [_alert_row(ft) for ft in ("benzin", "motorin", "lpg")]
+        ids = await bulk_create_alerts(session, rows)
+
+        assert ids == [11, 12, 13]
+        session.execute.assert_awaited_once()
+        stmt, params = session.execute.call_args[0]
+        assert str(stmt).startswith("INSERT INTO alerts")
+        assert params == rows
+
+    @pytest.mark.asyncio
+    async def test_empty_rows_skip_db(self):
+        """Satır yoksa veritabanına gidilmemeli."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        assert await bulk_create_alerts(session, []) == []
+        session.execute.assert_not_called()
+
+
+class TestGetAlerts:
+    """get_alerts salt okunur sorgu testleri."""
+
+    @pytest.mark.asyncio
+    async def test_filters_and_mappings(self):
+        """Filtreler WHERE'e eklenmeli, sonuç satır eşlemesi olarak dönmeli."""
+        rows = [{"id": 1, "fuel_type": "benzin", "is_read": False}]
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = rows
+        conn = MagicMock()
+        conn.execute = AsyncMock(return_value=result)
+
+        alerts = await get_alerts(conn, fuel_type="benzin", unread_only=True, limit=5)
+
+        assert alerts == rows
+        result.scalars.assert_not_called()
+        sql = str(conn.execute.call_args[0][0])
+        assert "alerts.fuel_type = :fuel_type_1" in sql
+        assert "alerts.is_read = false" in sql
+        assert "ORDER BY alerts.created_at DESC" in sql
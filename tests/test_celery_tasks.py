@@ -77,6 +77,42 @@ class TestCeleryConfig:
 
         assert celery_app.conf.broker_url == settings.REDIS_URL
 
+    def test_run_async_reuses_worker_loop(self) -> None:
+        """run_async ardışık çağrılarda aynı event loop'u kullanmalı."""
+        import asyncio
+
+        from src.celery_app.celery_config import run_async
+
+        async def _current_loop():
+            return asyncio.get_running_loop()
+
+        first = run_async(_current_loop())
+        second = run_async(_current_loop())
+
+        assert first is second
+        assert not first.is_closed()
+
+    def test_worker_shutdown_runs_loop_cleanups(self) -> None:
+        """Worker kapanışında kayıtlı temizlikler ve engine dispose loop'ta çalışmalı."""
+        import asyncio
+
+        import src.celery_app.celery_config as config
+
+        loop = asyncio.new_event_loop()
+        cleanup = AsyncMock()
+        with (
+            patch.object(config, "_worker_loop", loop),
+            patch.object(config, "_loop_cleanups", [cleanup]),
+            patch(
+                "src.config.database.dispose_engine", new_callable=AsyncMock
+            ) as mock_dispose,
+        ):
+            config._shutdown_worker_loop()
+
+        cleanup.assert_awaited_once()
+        mock_dispose.assert_awaited_once()
+        assert loop.is_closed()
+
     def test_celery_beat_schedule_loaded(self) -> None:
         """Beat schedule yüklenmiş olmalı."""
         from src.celery_app.celery_config import celery_app
@@ -205,7 +241,24 @@ class TestSchedulerSettings:
         from src.config.settings import settings
 
         assert hasattr(settings, "NOTIFICATION_HOUR")
-        assert settings.NOTIFICATION_HOUR == 7
+        assert settings.NOTIFICATION_HOUR == 11
+
+    def test_morning_and_evening_settings(self) -> None:
+        """Sabah/akşam pipeline ayarları tek Settings tanımında olmalı."""
+        from src.config.settings import settings
+
+        assert hasattr(settings, "MORNING_DATA_FETCH_HOUR")
+        assert hasattr(settings, "MORNING_PREDICTION_HOUR")
+        assert hasattr(settings, "TELEGRAM_EVENING_NOTIFICATION_HOUR")
+
+    def test_settings_frozen(self) -> None:
+        """Settings örneği değiştirilemez olmalı."""
+        from pydantic import ValidationError
+
+        from src.config.settings import settings
+
+        with pytest.raises(ValidationError):
+            settings.NOTIFICATION_HOUR = 5
 
     def test_data_fetch_hour_unchanged(self) -> None:
         """Mevcut DATA_FETCH_HOUR değiştirilmemiş olmalı."""
@@ -271,20 +324,20 @@ class TestCollectDailyMarketData:
             "motorin": Decimal("41.20"),
         }
 
-        # Mock'ları kaynak modüllerde hedefle (lazy import olduğu için)
+        # Mock'ları tasks modülündeki isimlere hedefle (modül seviyesinde import)
         with (
             patch(
-                "src.data_collectors.brent_collector.fetch_brent_daily",
+                "src.celery_app.tasks.fetch_brent_daily",
                 new_callable=AsyncMock,
                 return_value=mock_brent,
             ),
             patch(
-                "src.data_collectors.fx_collector.fetch_usd_try_daily",
+                "src.celery_app.tasks.fetch_usd_try_daily",
                 new_callable=AsyncMock,
                 return_value=mock_fx,
             ),
             patch(
-                "src.data_collectors.epdk_collector.fetch_turkey_average",
+                "src.celery_app.tasks.fetch_istanbul_avrupa",
                 new_callable=AsyncMock,
                 return_value=mock_epdk,
             ),
@@ -308,17 +361,17 @@ class TestCollectDailyMarketData:
 
         with (
             patch(
-                "src.data_collectors.brent_collector.fetch_brent_daily",
+                "src.celery_app.tasks.fetch_brent_daily",
                 new_callable=AsyncMock,
                 side_effect=Exception("API hatası"),
             ),
             patch(
-                "src.data_collectors.fx_collector.fetch_usd_try_daily",
+                "src.celery_app.tasks.fetch_usd_try_daily",
                 new_callable=AsyncMock,
                 return_value=mock_fx,
             ),
             patch(
-                "src.data_collectors.epdk_collector.fetch_turkey_average",
+                "src.celery_app.tasks.fetch_istanbul_avrupa",
                 new_callable=AsyncMock,
                 return_value={"benzin": Decimal("43.50")},
             ),
@@ -338,17 +391,17 @@ class TestCollectDailyMarketData:
         """Collector None döndürdüğünde sonuç None olmalı."""
         with (
             patch(
-                "src.data_collectors.brent_collector.fetch_brent_daily",
+                "src.celery_app.tasks.fetch_brent_daily",
                 new_callable=AsyncMock,
                 return_value=None,
             ),
             patch(
-                "src.data_collectors.fx_collector.fetch_usd_try_daily",
+                "src.celery_app.tasks.fetch_usd_try_daily",
                 new_callable=AsyncMock,
                 return_value=None,
             ),
             patch(
-                "src.data_collectors.epdk_collector.fetch_turkey_average",
+                "src.celery_app.tasks.fetch_istanbul_avrupa",
                 new_callable=AsyncMock,
                 return_value={},
             ),
@@ -361,6 +414,172 @@ class TestCollectDailyMarketData:
         assert results["fx"] is None
         assert results["epdk"] is None
 
+    @pytest.mark.asyncio
+    async def test_collect_all_data_single_bulk_upsert(self) -> None:
+        """Üç yakıt tipi tek toplu upsert ve tek commit ile yazılmalı."""
+        mock_fx = MagicMock()
+        mock_fx.usd_try_rate = Decimal("36.25")
+        mock_fx.source = "tcmb_evds"
+
+        mock_session = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch(
+                "src.celery_app.tasks.fetch_brent_daily",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+            patch(
+                "src.celery_app.tasks.fetch_usd_try_daily",
+                new_callable=AsyncMock,
+                return_value=mock_fx,
+            ),
+            patch(
+                "src.celery_app.tasks.fetch_istanbul_avrupa",
+                new_callable=AsyncMock,
+                return_value={"benzin": Decimal("43.50")},
+            ),
+            patch(
+                "src.celery_app.tasks.async_session_factory",
+                MagicMock(return_value=mock_session),
+            ),
+            patch(
+                "src.celery_app.tasks.bulk_upsert_market_data",
+                new_callable=AsyncMock,
+                return_value=3,
+            ) as mock_upsert,
+        ):
+            from src.celery_app.tasks import _collect_all_data
+
+            results = await _collect_all_data()
+
+        assert results["db_saved"] == 3
+        assert mock_upsert.await_count == 1
+        mock_session.commit.assert_awaited_once()
+
+        rows = mock_upsert.call_args.args[1]
+        assert [r["fuel_type"] for r in rows] == ["benzin", "motorin", "lpg"]
+        # Çok satırlı VALUES için tüm satırlar aynı anahtarlara sahip olmalı
+        assert len({tuple(r) for r in rows}) == 1
+        assert rows[0]["source"] == "tcmb_evds+po_istanbul_avcilar"
+        assert rows[1]["source"] == "tcmb_evds"
+        assert rows[1]["pump_price_tl_lt"] is None
+        assert rows[0]["data_quality_flag"] == "estimated"
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_market_data_keeps_existing_on_null(self) -> None:
+        """Toplu upsert None gelen opsiyonel alanlarda mevcut değeri korumalı."""
+        from sqlalchemy.dialects import postgresql
+
+        from src.data_collectors.market_data_repository import (
+            bulk_upsert_market_data,
+        )
+
+        captured = {}
+
+        async def _capture(stmt, params):
+            captured["sql"] = str(stmt.compile(dialect=postgresql.dialect()))
+            captured["params"] = params
+
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=_capture)
+
+        rows = [
+            {
+                "trade_date": date(2026, 2, 16),
+                "fuel_type": ft,
+                "usd_try_rate": Decimal("36.25"),
+                "pump_price_tl_lt": None,
+                "source": "tcmb_evds",
+            }
+            for ft in ("benzin", "motorin")
+        ]
+
+        count = await bulk_upsert_market_data(session, rows)
+
+        assert count == 2
+        session.execute.assert_awaited_once()
+        sql = captured["sql"]
+        assert "ON CONFLICT ON CONSTRAINT uq_daily_market_date_fuel" in sql
+        assert "coalesce(excluded.pump_price_tl_lt, daily_market_data.pump_price_tl_lt)" in sql
+        assert "source = excluded.source" in sql
+        # Eksik opsiyonel alanlar None ile doldurulur (COALESCE mevcudu korur)
+        assert all(p["brent_usd_bbl"] is None for p in captured["params"])
+        assert all(p["data_quality_flag"] == "verified" for p in captured["params"])
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_market_data_keeps_existing_raw_payload(self) -> None:
+        """raw_payload'sız satırlar mevcut payload'ı JSON 'null' ile ezmemeli."""
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.orm import Session
+
+        from src.data_collectors.market_data_repository import (
+            bulk_upsert_market_data,
+        )
+
+        # Gerçek ORM bulk INSERT yolu; yalnızca DBAPI cursor'ı taklit edilir
+        engine = create_engine(
+            "postgresql+psycopg2://test@localhost/test",
+            creator=MagicMock,
+            _initialize=False,
+        )
+        sent = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            sent.append((statement, parameters))
+
+        rows = [
+            {"trade_date": date(2026, 2, 16), "fuel_type": "benzin", "source": "x"},
+            {
+                "trade_date": date(2026, 2, 16),
+                "fuel_type": "motorin",
+                "source": "x",
+                "raw_payload": None,
+            },
+        ]
+
+        with Session(engine) as sync_session:
+            session = MagicMock()
+            session.execute = AsyncMock(side_effect=sync_session.execute)
+            await bulk_upsert_market_data(session, rows)
+
+        assert len(sent) == 1
+        statement, parameters = sent[0]
+        assert "raw_payload = coalesce(excluded.raw_payload" in statement
+        # Kolon INSERT'te yok → excluded.raw_payload SQL NULL → mevcut korunur
+        assert "raw_payload" not in statement.split("ON CONFLICT")[0]
+        assert all("raw_payload" not in p for p in parameters)
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_market_data_dedupes_conflict_key(self) -> None:
+        """Aynı (trade_date, fuel_type) iki kez gelirse sonuncusu yazılmalı."""
+        from src.data_collectors.market_data_repository import (
+            _MARKET_DATA_UPSERT,
+            bulk_upsert_market_data,
+        )
+
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        rows = [
+            {"trade_date": date(2026, 2, 16), "fuel_type": "benzin", "source": "a"},
+            {"trade_date": date(2026, 2, 16), "fuel_type": "motorin", "source": "a"},
+            {"trade_date": date(2026, 2, 16), "fuel_type": "benzin", "source": "b"},
+        ]
+
+        count = await bulk_upsert_market_data(session, rows)
+
+        assert count == 2
+        stmt, params = session.execute.await_args.args
+        assert stmt is _MARKET_DATA_UPSERT
+        assert [(p["fuel_type"], p["source"]) for p in params] == [
+            ("benzin", "b"),
+            ("motorin", "a"),
+        ]
+
 
 # ============================================================
 # Task Fonksiyon Testleri — run_daily_prediction
@@ -396,7 +615,7 @@ class TestRunDailyPrediction:
         mock_predictor.load_model.return_value = False
 
         with patch(
-            "src.ml.predictor.get_predictor",
+            "src.celery_app.tasks.get_predictor",
             return_value=mock_predictor,
         ):
             from src.celery_app.tasks import _run_predictions
@@ -436,15 +655,15 @@ class TestRunDailyPrediction:
 
         with (
             patch(
-                "src.ml.predictor.get_predictor",
+                "src.celery_app.tasks.get_predictor",
                 return_value=mock_predictor,
             ),
             patch(
-                "src.config.database.async_session_factory",
+                "src.celery_app.tasks.async_session_factory",
                 mock_session_factory,
             ),
             patch(
-                "src.repositories.ml_repository.upsert_ml_prediction",
+                "src.celery_app.tasks.bulk_upsert_ml_predictions",
                 new_callable=AsyncMock,
             ) as mock_upsert,
         ):
@@ -458,8 +677,208 @@ class TestRunDailyPrediction:
         assert results["benzin"]["direction"] == "stable"
         assert results["motorin"]["direction"] == "stable"
 
-        # upsert 2 kez çağrılmış olmalı
-        assert mock_upsert.call_count == 2
+        # Tüm yakıtlar tek toplu upsert ile yazılmış olmalı
+        assert mock_upsert.call_count == 1
+        rows = mock_upsert.call_args.args[1]
+        assert [r["fuel_type"] for r in rows] == ["benzin", "motorin", "lpg"]
+        mock_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_ml_predictions_single_statement(self) -> None:
+        """Tüm yakıtların tahminleri tek çok-satırlı INSERT ile yazılmalı."""
+        from sqlalchemy.dialects import postgresql
+
+        from src.repositories.ml_repository import bulk_upsert_ml_predictions
+
+        captured = []
+
+        async def _capture(stmt, params):
+            captured.append((stmt.compile(dialect=postgresql.dialect()), params))
+
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=_capture)
+
+        rows = [
+            {
+                "fuel_type": ft,
+                "prediction_date": date(2026, 2, 16),
+                "predicted_direction": "stable",
+                "probability_hike": Decimal("0.25"),
+                "probability_stable": Decimal("0.60"),
+                "probability_cut": Decimal("0.15"),
+                "model_version": "v1",
+            }
+            for ft in ("benzin", "motorin", "lpg")
+        ]
+
+        count = await bulk_upsert_ml_predictions(session, rows)
+
+        assert count == 3
+        assert len(captured) == 1
+        compiled, params = captured[0]
+        sql = str(compiled)
+        assert "ON CONFLICT ON CONSTRAINT uq_ml_pred_fuel_date" in sql
+        assert "predicted_direction = excluded.predicted_direction" in sql
+        assert [p["fuel_type"] for p in params] == ["benzin", "motorin", "lpg"]
+        assert all(p["system_mode"] == "full" for p in params)
+        # Commit çağıranın sorumluluğunda — repository commit etmez
+        session.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_ml_predictions_dedupes_conflict_key(self) -> None:
+        """Aynı (prediction_date, fuel_type) iki kez gelirse sonuncusu yazılmalı."""
+        from src.repositories.ml_repository import (
+            _ML_PREDICTION_UPSERT,
+            bulk_upsert_ml_predictions,
+        )
+
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        rows = [
+            {
+                "fuel_type": ft,
+                "prediction_date": date(2026, 2, 16),
+                "predicted_direction": direction,
+                "probability_hike": Decimal("0.25"),
+                "probability_stable": Decimal("0.60"),
+                "probability_cut": Decimal("0.15"),
+                "model_version": "v1",
+            }
+            for ft, direction in (
+                ("benzin", "stable"),
+                ("motorin", "stable"),
+                ("benzin", "hike"),
+            )
+        ]
+
+        count = await bulk_upsert_ml_predictions(session, rows)
+
+        assert count == 2
+        stmt, params = session.execute.await_args.args
+        assert stmt is _ML_PREDICTION_UPSERT
+        assert [(p["fuel_type"], p["predicted_direction"]) for p in params] == [
+            ("benzin", "hike"),
+            ("motorin", "stable"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fetch_features_uses_float_columns(self) -> None:
+        """SQL'den gelen float kolonlar feature hesaplamasına doğru aktarılmalı."""
+        from src.celery_app.tasks import _fetch_and_compute_features
+
+        market_rows = [
+            ("benzin", 80.0, 36.0, 600.0, 43.0),
+            ("benzin", 81.0, 36.5, 610.0, 43.5),
+        ]
+        mbe_rows = [("benzin", 0.1, 1.0, 18.0), ("benzin", 0.2, 2.0, 18.5)]
+        tax_row = ("benzin", 2.5, 0.20)
+
+        mock_record = MagicMock(features={"f": 1.0}, missing_features=[])
+        with (
+            patch.dict("src.celery_app.tasks._tax_cache", clear=True),
+            patch(
+                "src.celery_app.tasks._rows_in_own_session",
+                new_callable=AsyncMock,
+                side_effect=[market_rows, mbe_rows, [tax_row]],
+            ),
+            patch(
+                "src.celery_app.tasks.compute_all_features",
+                return_value=mock_record,
+            ) as mock_compute,
+        ):
+            features = await _fetch_and_compute_features("benzin", date(2026, 2, 16))
+
+        assert features == {"f": 1.0}
+        kwargs = mock_compute.call_args.kwargs
+        assert kwargs["brent_usd_bbl"] == 81.0
+        assert kwargs["pump_price"] == 43.5
+        assert kwargs["brent_history"] == [80.0, 81.0]
+        assert kwargs["fx_history"] == [36.0, 36.5]
+        assert kwargs["mbe_value"] == 0.2
+        assert kwargs["previous_mbe"] == 0.1
+        assert kwargs["nc_history"] == [18.0, 18.5]
+        assert kwargs["otv_rate"] == 2.5
+
+    @pytest.mark.asyncio
+    async def test_fetch_features_reuses_cached_tax(self) -> None:
+        """Aynı gün ikinci çağrıda vergi sorgusu cache'ten karşılanmalı."""
+        from src.celery_app.tasks import (
+            _FEATURE_TAX_STMT,
+            _fetch_and_compute_features,
+        )
+
+        market_rows = [("benzin", 80.0, 36.0, 600.0, 43.0)]
+        tax_row = ("benzin", 2.5, 0.20)
+
+        async def _fake_rows(stmt, params):
+            return [tax_row] if stmt is _FEATURE_TAX_STMT else market_rows
+
+        mock_record = MagicMock(features={"f": 1.0}, missing_features=[])
+        with (
+            patch.dict("src.celery_app.tasks._tax_cache", clear=True),
+            patch(
+                "src.celery_app.tasks._rows_in_own_session",
+                side_effect=_fake_rows,
+            ) as mock_rows,
+            patch(
+                "src.celery_app.tasks.compute_all_features",
+                return_value=mock_record,
+            ) as mock_compute,
+        ):
+            await _fetch_and_compute_features("benzin", date(2026, 2, 16))
+            await _fetch_and_compute_features("benzin", date(2026, 2, 16))
+
+        tax_calls = [
+            c for c in mock_rows.call_args_list if c.args[0] is _FEATURE_TAX_STMT
+        ]
+        assert len(tax_calls) == 1
+        assert mock_compute.call_args.kwargs["otv_rate"] == 2.5
+        assert mock_compute.call_args.kwargs["kdv_rate"] == 0.2
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_features_single_query_per_table(self) -> None:
+        """Tüm yakıtların verisi tablo başına tek sorguyla çekilip gruplanmalı."""
+        from src.celery_app.tasks import _fetch_all_features
+
+        market_rows = [
+            ("benzin", 80.0, 36.0, 600.0, 43.0),
+            ("motorin", 80.0, 36.0, 640.0, 41.0),
+        ]
+        mbe_rows = [("motorin", 0.4, 2.0, 20.0)]
+        tax_rows = [("benzin", 2.5, 0.20), ("motorin", 1.5, 0.20)]
+
+        def _fake_compute(**kwargs):
+            return MagicMock(
+                features={"ft": kwargs["fuel_type"], "cif": kwargs["cif_usd_ton"]},
+                missing_features=[],
+            )
+
+        with (
+            patch.dict("src.celery_app.tasks._tax_cache", clear=True),
+            patch(
+                "src.celery_app.tasks._rows_in_own_session",
+                new_callable=AsyncMock,
+                side_effect=[market_rows, mbe_rows, tax_rows],
+            ) as mock_rows,
+            patch(
+                "src.celery_app.tasks.compute_all_features",
+                side_effect=_fake_compute,
+            ) as mock_compute,
+        ):
+            features = await _fetch_all_features(
+                date(2026, 2, 16), ["benzin", "motorin", "lpg"]
+            )
+
+        assert mock_rows.await_count == 3
+        assert mock_rows.call_args_list[0].args[1]["fts"] == ["benzin", "motorin", "lpg"]
+        assert features["benzin"] == {"ft": "benzin", "cif": 600.0}
+        assert features["motorin"] == {"ft": "motorin", "cif": 640.0}
+        # LPG için piyasa verisi yok — sıfır fallback
+        assert set(features["lpg"].values()) == {0.0}
+        motorin_kwargs = mock_compute.call_args_list[1].kwargs
+        assert motorin_kwargs["mbe_value"] == 0.4
+        assert motorin_kwargs["otv_rate"] == 1.5
 
     def test_placeholder_features(self) -> None:
         """Placeholder features tüm FEATURE_NAMES'i kapsamalı."""
@@ -572,6 +991,16 @@ class TestSendDailyNotifications:
 # ============================================================
 
 
+def _mock_health_engine(**execute_kwargs) -> MagicMock:
+    """engine.connect() async context manager'ını taklit eden mock engine."""
+    mock_conn = AsyncMock()
+    mock_conn.execute = AsyncMock(**execute_kwargs)
+    mock_engine = MagicMock()
+    mock_engine.connect.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    mock_engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+    return mock_engine
+
+
 class TestHealthCheck:
     """Sistem sağlık kontrolü task testleri."""
 
@@ -581,32 +1010,37 @@ class TestHealthCheck:
 
         assert health_check.name == "src.celery_app.tasks.health_check"
 
+    def test_redis_client_reused(self) -> None:
+        """Redis client ilk çağrıda oluşturulup sonraki çağrılarda yeniden kullanılmalı."""
+        from src.celery_app.tasks import _get_redis_client
+
+        mock_client = MagicMock()
+        with (
+            patch("src.celery_app.tasks._redis_client", None),
+            patch("redis.asyncio.from_url", return_value=mock_client) as mock_from_url,
+        ):
+            first = _get_redis_client()
+            second = _get_redis_client()
+
+        assert first is second is mock_client
+        mock_from_url.assert_called_once()
+        assert mock_from_url.call_args.kwargs["socket_keepalive"] is True
+
     @pytest.mark.asyncio
     async def test_health_check_format(self) -> None:
         """Sağlık kontrolü doğru formatta sonuç dönmeli."""
-        mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=False)
-        mock_session.execute = AsyncMock()
-
-        mock_session_factory = MagicMock(return_value=mock_session)
+        mock_engine = _mock_health_engine()
 
-        mock_redis_instance = MagicMock()
+        mock_redis_instance = AsyncMock()
         mock_redis_instance.ping.return_value = True
 
         mock_predictor = MagicMock()
         mock_predictor.is_loaded = True
 
         with (
-            patch(
-                "src.config.database.async_session_factory",
-                mock_session_factory,
-            ),
-            patch("redis.from_url", return_value=mock_redis_instance),
-            patch(
-                "src.ml.predictor.get_predictor",
-                return_value=mock_predictor,
-            ),
+            patch("src.celery_app.tasks._HEALTH_ENGINE", mock_engine),
+            patch("src.celery_app.tasks._redis_client", mock_redis_instance),
+            patch("src.celery_app.tasks._ml_ready", mock_predictor.is_loaded),
         ):
             from src.celery_app.tasks import _check_health
 
@@ -623,29 +1057,18 @@ class TestHealthCheck:
     @pytest.mark.asyncio
     async def test_health_check_all_healthy(self) -> None:
         """Tüm servisler sağlıklıyken hepsi True olmalı."""
-        mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=False)
-        mock_session.execute = AsyncMock()
-
-        mock_session_factory = MagicMock(return_value=mock_session)
+        mock_engine = _mock_health_engine()
 
-        mock_redis_instance = MagicMock()
+        mock_redis_instance = AsyncMock()
         mock_redis_instance.ping.return_value = True
 
         mock_predictor = MagicMock()
         mock_predictor.is_loaded = True
 
         with (
-            patch(
-                "src.config.database.async_session_factory",
-                mock_session_factory,
-            ),
-            patch("redis.from_url", return_value=mock_redis_instance),
-            patch(
-                "src.ml.predictor.get_predictor",
-                return_value=mock_predictor,
-            ),
+            patch("src.celery_app.tasks._HEALTH_ENGINE", mock_engine),
+            patch("src.celery_app.tasks._redis_client", mock_redis_instance),
+            patch("src.celery_app.tasks._ml_ready", mock_predictor.is_loaded),
         ):
             from src.celery_app.tasks import _check_health
 
@@ -654,33 +1077,24 @@ class TestHealthCheck:
         assert result["db"] is True
         assert result["redis"] is True
         assert result["ml_model"] is True
+        # DB probu ORM session yerine engine bağlantısıyla yapılır
+        mock_engine.connect.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_health_check_all_unhealthy(self) -> None:
         """Tüm servisler başarısız olduğunda hepsi False olmalı."""
-        mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=False)
-        mock_session.execute = AsyncMock(side_effect=Exception("DB bağlantısı yok"))
+        mock_engine = _mock_health_engine(side_effect=Exception("DB bağlantısı yok"))
 
-        mock_session_factory = MagicMock(return_value=mock_session)
-
-        mock_redis_instance = MagicMock()
+        mock_redis_instance = AsyncMock()
         mock_redis_instance.ping.side_effect = Exception("Redis bağlantısı yok")
 
         mock_predictor = MagicMock()
         mock_predictor.is_loaded = False
 
         with (
-            patch(
-                "src.config.database.async_session_factory",
-                mock_session_factory,
-            ),
-            patch("redis.from_url", return_value=mock_redis_instance),
-            patch(
-                "src.ml.predictor.get_predictor",
-                return_value=mock_predictor,
-            ),
+            patch("src.celery_app.tasks._HEALTH_ENGINE", mock_engine),
+            patch("src.celery_app.tasks._redis_client", mock_redis_instance),
+            patch("src.celery_app.tasks._ml_ready", mock_predictor.is_loaded),
         ):
             from src.celery_app.tasks import _check_health
 
@@ -693,29 +1107,18 @@ class TestHealthCheck:
     @pytest.mark.asyncio
     async def test_health_check_timestamp_format(self) -> None:
         """Timestamp ISO 8601 formatında olmalı."""
-        mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=False)
-        mock_session.execute = AsyncMock(side_effect=Exception("test"))
+        mock_engine = _mock_health_engine(side_effect=Exception("test"))
 
-        mock_session_factory = MagicMock(return_value=mock_session)
-
-        mock_redis_instance = MagicMock()
+        mock_redis_instance = AsyncMock()
         mock_redis_instance.ping.side_effect = Exception("test")
 
         mock_predictor = MagicMock()
         mock_predictor.is_loaded = False
 
         with (
-            patch(
-                "src.config.database.async_session_factory",
-                mock_session_factory,
-            ),
-            patch("redis.from_url", return_value=mock_redis_instance),
-            patch(
-                "src.ml.predictor.get_predictor",
-                return_value=mock_predictor,
-            ),
+            patch("src.celery_app.tasks._HEALTH_ENGINE", mock_engine),
+            patch("src.celery_app.tasks._redis_client", mock_redis_instance),
+            patch("src.celery_app.tasks._ml_ready", mock_predictor.is_loaded),
         ):
             from src.celery_app.tasks import _check_health
 
@@ -726,6 +1129,194 @@ class TestHealthCheck:
         parsed = datetime.fromisoformat(timestamp)
         assert isinstance(parsed, datetime)
 
+    @pytest.mark.asyncio
+    async def test_health_check_uses_cached_ml_state(self) -> None:
+        """Model durumu cache'liyse sağlık kontrolü predictor'a dokunmamalı."""
+        mock_redis_instance = AsyncMock()
+
+        with (
+            patch(
+                "src.celery_app.tasks._HEALTH_ENGINE",
+                _mock_health_engine(side_effect=Exception("DB yok")),
+            ),
+            patch("src.celery_app.tasks._redis_client", mock_redis_instance),
+            patch("src.celery_app.tasks._ml_ready", True),
+            patch("src.celery_app.tasks.get_predictor") as mock_get_predictor,
+        ):
+            from src.celery_app.tasks import _check_health
+
+            result = await _check_health()
+
+        assert result["ml_model"] is True
+        mock_get_predictor.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_health_check_first_ml_probe_runs_in_thread(self) -> None:
+        """Model durumu henüz bilinmiyorsa yükleme thread'e devredilmeli."""
+        mock_redis_instance = AsyncMock()
+
+        with (
+            patch(
+                "src.celery_app.tasks._HEALTH_ENGINE",
+                _mock_health_engine(side_effect=Exception("DB yok")),
+            ),
+            patch("src.celery_app.tasks._redis_client", mock_redis_instance),
+            patch("src.celery_app.tasks._ml_ready", None),
+            patch(
+                "src.celery_app.tasks.asyncio.to_thread",
+                new_callable=AsyncMock,
+                return_value=False,
+            ) as mock_to_thread,
+        ):
+            from src.celery_app.tasks import _check_health, _refresh_ml_state
+
+            result = await _check_health()
+
+        mock_to_thread.assert_awaited_once_with(_refresh_ml_state)
+        assert result["ml_model"] is False
+        assert result["redis"] is True
+
+    def test_refresh_predictor_state_loads_model(self) -> None:
+        """Refresh task'ı model yüklü değilse yükleyip durumu cache'lemeli."""
+        import src.celery_app.tasks as tasks
+
+        mock_predictor = MagicMock()
+        mock_predictor.is_loaded = False
+
+        def _load():
+            mock_predictor.is_loaded = True
+            return True
+
+        mock_predictor.load_model.side_effect = _load
+
+        with (
+            patch.object(tasks, "_ml_ready", None),
+            patch.object(tasks, "get_predictor", return_value=mock_predictor),
+        ):
+            result = tasks.refresh_predictor_state()
+            assert tasks._ml_ready is True
+
+        assert result == {"ml_model": True}
+        mock_predictor.load_model.assert_called_once()
+
+
+# ============================================================
+# Task Fonksiyon Testleri — calculate_daily_mbe_and_risk
+# ============================================================
+
+
+class TestCalculateMbeAndRisk:
+    """Birleşik MBE + risk hesaplama task testleri."""
+
+    def test_task_is_registered(self) -> None:
+        """Task Celery'ye kayıtlı olmalı."""
+        from src.celery_app.tasks import calculate_daily_mbe_and_risk
+
+        assert (
+            calculate_daily_mbe_and_risk.name
+            == "src.celery_app.tasks.calculate_daily_mbe_and_risk"
+        )
+
+    def test_schedule_uses_fused_task(self) -> None:
+        """Beat schedule ayrı MBE/risk task'ları yerine birleşik task'ı kullanmalı."""
+        from src.celery_app.beat_schedule import CELERY_BEAT_SCHEDULE
+
+        tasks = {entry["task"] for entry in CELERY_BEAT_SCHEDULE.values()}
+        assert "src.celery_app.tasks.calculate_daily_mbe_and_risk" in tasks
+        assert "src.celery_app.tasks.calculate_daily_mbe" not in tasks
+        assert "src.celery_app.tasks.calculate_daily_risk" not in tasks
+
+    def test_mbe_uses_prefetched_history(self) -> None:
+        """MBE adımı önceki MBE kayıtlarını yakıt başına tekrar sorgulamamalı."""
+        from src.celery_app.tasks import _compute_mbe_for_fuel
+
+        cur = MagicMock()
+        cur.fetchone.side_effect = [
+            (1, Decimal("80"), Decimal("36"), Decimal("43.5"), Decimal("600")),
+            (Decimal("43.5"),),  # önceki pompa fiyatı — değişim yok
+            (7,),  # tax_parameter id
+        ]
+        prev_rows = [
+            (Decimal("18.0"), Decimal("0.3"), Decimal("18.0"), 4),
+            (Decimal("18.0"), Decimal("0.2"), Decimal("18.0"), 3),
+            (Decimal("18.0"), Decimal("0.1"), Decimal("18.0"), 2),
+        ]
+
+        result = _compute_mbe_for_fuel(
+            cur, "benzin", date(2026, 2, 16),
+            lambda ft, td: {"otv": Decimal("2.5"), "kdv": Decimal("0.20")},
+            prev_rows,
+        )
+
+        executed = [c.args[0] for c in cur.execute.call_args_list]
+        assert not any(
+            sql.lstrip().startswith("SELECT") and "mbe_calculations" in sql
+            for sql in executed
+        )
+        # Hesaplama adımı yazım yapmaz — satırlar toplu yazım için döner
+        assert not any(sql.lstrip().startswith("INSERT") for sql in executed)
+        assert result["snapshot_row"][:4] == (date(2026, 2, 16), "benzin", 1, 7)
+        assert result["dslc"] == 5
+        assert result["mbe_hist"][1:] == [0.3, 0.2]
+
+    def test_mbe_results_written_per_table(self) -> None:
+        """Snapshot ve MBE satırları tablo başına tek execute_values ile yazılmalı."""
+        from src.celery_app.tasks import _write_mbe_results
+
+        today = date(2026, 2, 16)
+        mbe_by_fuel = {
+            ft: {
+                "mbe": 0.1,
+                "nc_fwd": 18.0,
+                "snapshot_row": (today, ft, i, 7),
+                "mbe_row": (18.0, 18.0),
+            }
+            for i, ft in enumerate(["benzin", "motorin"])
+        }
+
+        cur = MagicMock()
+        with patch(
+            "psycopg2.extras.execute_values",
+            side_effect=[[("motorin", 22), ("benzin", 21)], None],
+        ) as mock_exec_values:
+            _write_mbe_results(cur, mbe_by_fuel)
+
+        assert mock_exec_values.call_count == 2
+        assert mbe_by_fuel["benzin"]["cs_id"] == 21
+        assert mbe_by_fuel["motorin"]["cs_id"] == 22
+        mbe_rows = mock_exec_values.call_args_list[1].args[2]
+        assert mbe_rows == [
+            (today, "benzin", 21, 18.0, 18.0),
+            (today, "motorin", 22, 18.0, 18.0),
+        ]
+
+    def test_risk_row_from_in_memory_history(self) -> None:
+        """Risk satırı DB'ye gitmeden bellekteki MBE/FX geçmişinden hesaplanmalı."""
+        from src.celery_app.tasks import _compute_risk_row
+
+        row = _compute_risk_row(
+            "benzin", date(2026, 2, 16),
+            mbe_val=0.5, dslc=30, mbe_hist=[0.5, 0.4, 0.25],
+            fx_rows=[36.0, 36.0, 36.0],
+        )
+
+        assert row[:2] == (date(2026, 2, 16), "benzin")
+        # 0.30*0.1 + 0.15*0 + 0.20*0.5 + 0.20*0.5 + 0.15*1.0 = 0.38
+        assert row[2] == 0.38
+        assert row[9] == "normal"
+
+    def test_risk_rows_written_in_single_statement(self) -> None:
+        """Tüm yakıtların risk satırları tek execute_values çağrısıyla yazılmalı."""
+        from src.celery_app.tasks import _upsert_risk_rows
+
+        cur = MagicMock()
+        rows = [("r1",), ("r2",), ("r3",)]
+        with patch("psycopg2.extras.execute_values") as mock_exec_values:
+            _upsert_risk_rows(cur, rows)
+
+        mock_exec_values.assert_called_once()
+        assert mock_exec_values.call_args.args[2] == rows
+
 
 # ============================================================
 # Hata Yönetimi Testleri
@@ -750,17 +1341,17 @@ class TestErrorHandling:
 
         with (
             patch(
-                "src.data_collectors.brent_collector.fetch_brent_daily",
+                "src.celery_app.tasks.fetch_brent_daily",
                 new_callable=AsyncMock,
                 return_value=mock_brent,
             ),
             patch(
-                "src.data_collectors.fx_collector.fetch_usd_try_daily",
+                "src.celery_app.tasks.fetch_usd_try_daily",
                 new_callable=AsyncMock,
                 side_effect=Exception("FX hatası"),
             ),
             patch(
-                "src.data_collectors.epdk_collector.fetch_turkey_average",
+                "src.celery_app.tasks.fetch_istanbul_avrupa",
                 new_callable=AsyncMock,
                 side_effect=Exception("EPDK hatası"),
             ),
@@ -812,15 +1403,15 @@ class TestErrorHandling:
 
         with (
             patch(
-                "src.ml.predictor.get_predictor",
+                "src.celery_app.tasks.get_predictor",
                 return_value=mock_predictor,
             ),
             patch(
-                "src.config.database.async_session_factory",
+                "src.celery_app.tasks.async_session_factory",
                 mock_session_factory,
             ),
             patch(
-                "src.repositories.ml_repository.upsert_ml_prediction",
+                "src.celery_app.tasks.bulk_upsert_ml_predictions",
                 new_callable=AsyncMock,
             ),
         ):
@@ -21,6 +21,7 @@ from src.ml.feature_engineering import (
     features_dict_to_array,
     features_to_array,
     _compute_sma_float,
+    calculate_sma_fast,
     _compute_std_float,
     _compute_momentum,
     _to_float,
@@ -90,6 +91,21 @@ class TestHelperFunctions:
         result = _compute_momentum(series, 5)
         assert result == pytest.approx(10.0)  # 20 - 10
 
+    def test_calculate_sma_fast_matches_decimal_sma(self):
+        """Numpy SMA serisi Decimal calculate_sma ile ortusmeli."""
+        from src.core.mbe_calculator import calculate_sma
+
+        series = [10.5, 11.25, 9.75, 12.0, 13.125, 8.5, 10.0]
+        for window in (1, 3, 5, 10):
+            expected = calculate_sma([Decimal(str(x)) for x in series], window)
+            result = calculate_sma_fast(series, window)
+            assert result.tolist() == pytest.approx([float(e) for e in expected])
+
+    def test_calculate_sma_fast_empty_raises(self):
+        """Bos seri ValueError firlatmali."""
+        with pytest.raises(ValueError, match="en az 1"):
+            calculate_sma_fast([], 3)
+
 
 # ────────────────────────────────────────────────────────────────────────────
 #  Grup 1: MBE Ozellikleri
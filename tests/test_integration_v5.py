@@ -230,17 +230,15 @@ def test_beat_schedule_v5_timing():
     assert v5_sched["task"] == "src.celery_app.tasks.run_daily_prediction_v5"
 
     # Aksam pipeline sira kontrolu:
-    # collect(18:00) -> MBE(18:10) -> risk(18:20) -> predict_v1(18:30) -> predict_v5(18:35)
+    # collect(18:00) -> MBE+risk(18:10) -> predict_v1(18:30) -> predict_v5(18:35)
     collect_sched = CELERY_BEAT_SCHEDULE["collect-daily-market-data"]["schedule"]
-    mbe_sched = CELERY_BEAT_SCHEDULE["calculate-daily-mbe"]["schedule"]
-    risk_sched = CELERY_BEAT_SCHEDULE["calculate-daily-risk"]["schedule"]
+    mbe_risk_sched = CELERY_BEAT_SCHEDULE["calculate-daily-mbe-risk"]["schedule"]
     v1_sched = CELERY_BEAT_SCHEDULE["run-daily-prediction"]["schedule"]
     v5_evening = CELERY_BEAT_SCHEDULE["run-daily-prediction-v5"]["schedule"]
 
-    # Minute sirasi: 0, 10, 20, 30, 35
+    # Minute sirasi: 0, 10, 30, 35
     assert collect_sched.minute == {0}
-    assert mbe_sched.minute == {10}
-    assert risk_sched.minute == {20}
+    assert mbe_risk_sched.minute == {10}
     assert v1_sched.minute == {30}
     assert v5_evening.minute == {35}
 
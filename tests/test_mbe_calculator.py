@@ -9,7 +9,7 @@ En az 25 test icermektedir.
 """
 
 import pytest
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 
 from src.core.mbe_calculator import (
     PRECISION,
@@ -24,8 +24,13 @@ from src.core.mbe_calculator import (
     calculate_mbe,
     calculate_nc_base_from_pump,
     calculate_nc_forward,
+    calculate_nc_forward_series,
     calculate_sma,
+    calculate_sma_at,
+    calculate_sma_last,
+    calculate_sma_last_multi,
     detect_trend,
+    detect_trend_pair,
     get_regime_config,
     get_rho,
 )
@@ -62,6 +67,11 @@ class TestSafeDecimal:
         result = _safe_decimal(val)
         assert result is val
 
+    def test_bool_not_treated_as_int(self):
+        """bool, int hizli yoluna girmez; eskisi gibi ValueError firlatir."""
+        with pytest.raises(ValueError):
+            _safe_decimal(True)
+
     def test_none_raises_value_error(self):
         """None deger ValueError firlatir."""
         with pytest.raises(ValueError, match="None"):
@@ -140,6 +150,26 @@ class TestCalculateNCForward:
                 rho=Decimal("0"),
             )
 
+    def test_series_matches_row_by_row(self):
+        """Seri hesabi, satir satir calculate_nc_forward ile ayni olmali."""
+        cifs = [Decimal("680"), 700, "712.5", 695.25]
+        fxs = [Decimal("34.20"), Decimal("34.35"), 34.5, "34.41"]
+        result = calculate_nc_forward_series(cifs, fxs, RHO["motorin"])
+        expected = [
+            calculate_nc_forward(c, f, RHO["motorin"]) for c, f in zip(cifs, fxs, strict=True)
+        ]
+        assert result == expected
+
+    def test_series_length_mismatch_raises(self):
+        """CIF ve FX serileri farkli uzunluktaysa ValueError firlatir."""
+        with pytest.raises(ValueError, match="ayni uzunlukta"):
+            calculate_nc_forward_series([Decimal("680")], [], Decimal("1190"))
+
+    def test_series_zero_rho_raises(self):
+        """Seri hesabinda rho=0 ZeroDivisionError firlatir."""
+        with pytest.raises(ZeroDivisionError, match="rho"):
+            calculate_nc_forward_series([Decimal("680")], [Decimal("34")], 0)
+
 
 # =====================================================================
 # calculate_nc_base_from_pump testleri
@@ -253,6 +283,68 @@ class TestCalculateSMA:
         result = calculate_sma(series, window=5)
         assert result == [Decimal("42.00000000")]
 
+    def test_sma_sliding_window_matches_slice_average(self):
+        """Kayan toplam, her indekste pencere diliminin ortalamasina esit olmali."""
+        series = [
+            Decimal("10.12345678"), Decimal("-3.5"), Decimal("7.00000001"),
+            Decimal("12"), Decimal("0.33333333"), Decimal("9.87654321"),
+            Decimal("-1.1"), Decimal("4.44444444"),
+        ]
+        result = calculate_sma(series, window=3)
+        for i, value in enumerate(result):
+            window_data = series[max(0, i - 2) : i + 1]
+            expected = (sum(window_data) / Decimal(len(window_data))).quantize(
+                Decimal("0.00000001"), rounding=ROUND_HALF_UP
+            )
+            assert value == expected
+
+    def test_sma_last_matches_full_series_tail(self):
+        """calculate_sma_last, calculate_sma'nin son degerine esit olmali."""
+        series = [
+            Decimal("10.12345678"), Decimal("-3.5"), Decimal("7.00000001"),
+            Decimal("12"), Decimal("0.33333333"), Decimal("9.87654321"),
+        ]
+        for window in (1, 3, 5, 10):
+            assert calculate_sma_last(series, window) == calculate_sma(series, window)[-1]
+
+    def test_sma_last_empty_series_raises(self):
+        """calculate_sma_last bos seride ValueError firlatir."""
+        with pytest.raises(ValueError, match="en az 1"):
+            calculate_sma_last([], window=5)
+
+    def test_sma_at_matches_full_series(self):
+        """calculate_sma_at her indekste calculate_sma ile ayni degeri verir."""
+        series = [
+            Decimal("10.12345678"), Decimal("-3.5"), Decimal("7.00000001"),
+            Decimal("12"), Decimal("0.33333333"), Decimal("9.87654321"),
+        ]
+        for window in (1, 3, 5, 10):
+            full = calculate_sma(series, window)
+            for i in range(len(series)):
+                assert calculate_sma_at(series, window, i) == full[i]
+
+    def test_sma_last_multi_matches_single_window(self):
+        """calculate_sma_last_multi her pencere icin calculate_sma_last ile ayni."""
+        series = [
+            Decimal("10.12345678"), Decimal("-3.5"), Decimal("7.00000001"),
+            Decimal("12"), Decimal("0.33333333"), Decimal("9.87654321"),
+        ]
+        windows = (3, 5, 10, 5)
+        result = calculate_sma_last_multi(series, windows)
+        assert set(result) == {3, 5, 10}
+        for window in windows:
+            assert result[window] == calculate_sma_last(series, window)
+
+    def test_sma_last_multi_zero_window_raises(self):
+        """Sifir pencere ValueError firlatir."""
+        with pytest.raises(ValueError, match="en az 1"):
+            calculate_sma_last_multi([Decimal("10")], (5, 0))
+
+    def test_sma_at_index_out_of_range_raises(self):
+        """Seri disindaki indeks ValueError firlatir."""
+        with pytest.raises(ValueError, match="seri disinda"):
+            calculate_sma_at([Decimal("10")], window=3, index=1)
+
     def test_sma_empty_series_raises(self):
         """Bos seri ValueError firlatir."""
         with pytest.raises(ValueError, match="en az 1"):
@@ -413,6 +505,26 @@ class TestDetectTrend:
         """Tek deger -> 'no_change'."""
         assert detect_trend([Decimal("10")], lookback=3) == "no_change"
 
+    def test_trend_pair(self):
+        """detect_trend_pair uc degerleri karsilastirir."""
+        assert detect_trend_pair(Decimal("10"), Decimal("11")) == "increase"
+        assert detect_trend_pair(Decimal("11"), Decimal("10")) == "decrease"
+        assert detect_trend_pair(Decimal("10"), Decimal("10.0")) == "no_change"
+
+    def test_full_mbe_trend_matches_sma_series(self):
+        """calculate_full_mbe trendi, tam SMA serisiyle detect_trend ile ayni."""
+        series = [
+            Decimal("20"), Decimal("21.5"), Decimal("19"), Decimal("22"),
+            Decimal("18.25"), Decimal("18"), Decimal("17.5"),
+        ]
+        for n in range(1, len(series) + 1):
+            part = series[:n]
+            result = calculate_full_mbe(part, Decimal("19"), regime=0)
+            expected = detect_trend(
+                calculate_sma(part, result.sma_window), lookback=3
+            )
+            assert result.trend_direction == expected
+
 
 # =====================================================================
 # get_regime_config testleri
@@ -451,6 +563,12 @@ class TestGetRegimeConfig:
         with pytest.raises(ValueError, match="Gecersiz rejim"):
             get_regime_config(99)
 
+    def test_regime_config_cached(self):
+        """Ayni rejim icin her cagrida ayni RegimeConfig nesnesi donmeli."""
+        assert get_regime_config(2) is get_regime_config(2)
+        for regime, (window, m_total) in REGIME_PARAMS.items():
+            assert get_regime_config(regime) == RegimeConfig(window, m_total)
+
 
 # =====================================================================
 # get_rho testleri
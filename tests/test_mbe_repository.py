@@ -15,21 +15,31 @@ from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.core.mbe_repository import (
+    cost_snapshot_exists,
     get_cost_snapshot,
     get_cost_snapshots_range,
+    get_cost_snapshots_range_thin,
     get_latest_mbe,
     get_latest_mbe_all,
     get_mbe_at_date,
     get_mbe_range,
+    get_mbe_range_thin,
+    iter_mbe_range,
     upsert_cost_snapshot,
+    upsert_cost_snapshot_id,
+    upsert_cost_snapshots_bulk,
     upsert_mbe_calculation,
+    upsert_mbe_calculations_bulk,
 )
 from src.core.price_change_repository import (
     create_price_change,
     get_latest_price_change,
+    get_latest_price_change_summary,
     get_latest_price_changes_all,
+    get_price_change_stats_range,
     get_price_changes_by_fuel,
     get_price_changes_range,
+    iter_price_changes_range,
     upsert_price_change,
 )
 from src.models.cost_base_snapshots import CostBaseSnapshot
@@ -202,6 +212,24 @@ class TestIndexes:
         }
         assert required_indexes.issubset(indexes), f"Eksik index'ler: {required_indexes - indexes}"
 
+    def test_fuel_date_indexes_cover_thin_columns(self):
+        """*_range_thin varsayilan kolonlari kapsayan indekste INCLUDE edilir."""
+        from src.core.mbe_repository import (
+            _COST_SNAPSHOT_THIN_COLUMNS,
+            _MBE_THIN_COLUMNS,
+        )
+        from src.core.price_change_repository import _SUMMARY_COLUMNS
+
+        for model, name, columns in (
+            (CostBaseSnapshot, "idx_cost_snapshot_fuel_date", _COST_SNAPSHOT_THIN_COLUMNS),
+            (MBECalculation, "idx_mbe_calc_fuel_date", _MBE_THIN_COLUMNS),
+            (PriceChange, "idx_price_change_fuel_date", _SUMMARY_COLUMNS),
+        ):
+            idx = next(i for i in model.__table__.indexes if i.name == name)
+            covered = {c.name for c in idx.columns}
+            covered |= set(idx.dialect_options["postgresql"]["include"])
+            assert {c.name for c in columns} <= covered
+
     def test_price_change_indexes(self):
         """price_changes gerekli index'lere sahip."""
         indexes = {idx.name for idx in PriceChange.__table__.indexes}
@@ -244,3 +272,395 @@ class TestForeignKeys:
             for fk in MBECalculation.__table__.foreign_keys
         }
         assert "cost_base_snapshots.id" in fks
+
+
+# =====================================================================
+# Sorgu testleri
+# =====================================================================
+
+
+class TestGetLatestMbeAll:
+    """get_latest_mbe_all tek sorgu dogrulamalari."""
+
+    @pytest.mark.asyncio
+    async def test_single_distinct_on_query(self):
+        """Tek DISTINCT ON sorgusu gonderilir, sonuc yakit sirasina dizilir."""
+        from sqlalchemy.dialects import postgresql
+
+        rows = [
+            MagicMock(fuel_type="benzin"),
+            MagicMock(fuel_type="lpg"),
+            MagicMock(fuel_type="motorin"),
+        ]
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        out = await get_latest_mbe_all(session)
+
+        session.execute.assert_awaited_once()
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "DISTINCT ON (mbe_calculations.fuel_type)" in sql
+        assert [r.fuel_type for r in out] == ["benzin", "motorin", "lpg"]
+
+    @pytest.mark.asyncio
+    async def test_missing_fuel_types_skipped(self):
+        """Kaydi olmayan yakit tipi sonuca eklenmez."""
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [
+            MagicMock(fuel_type="motorin"),
+        ]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        out = await get_latest_mbe_all(session)
+
+        assert [r.fuel_type for r in out] == ["motorin"]
+
+
+class TestBulkUpsert:
+    """Toplu UPSERT dogrulamalari."""
+
+    @staticmethod
+    def _mbe_row(trade_date: date, fuel_type: str, mbe: str) -> dict:
+        return {
+            "trade_date": trade_date,
+            "fuel_type": fuel_type,
+            "cost_snapshot_id": 1,
+            "nc_forward": Decimal("20"),
+            "nc_base": Decimal("19"),
+            "mbe_value": Decimal(mbe),
+            "mbe_pct": Decimal("5"),
+        }
+
+    @staticmethod
+    def _session(rows: list) -> MagicMock:
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        return session
+
+    @pytest.mark.asyncio
+    async def test_empty_rows_no_query(self):
+        """Bos liste icin sorgu gonderilmez."""
+        session = self._session([])
+        assert await upsert_cost_snapshots_bulk(session, []) == []
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_prebuilt_statement_with_row_params(self):
+        """Sabit UPSERT ifadesi kullanilir, satirlar parametre olarak gider."""
+        session = self._session([MagicMock(), MagicMock()])
+        rows = [
+            self._mbe_row(date(2026, 1, 5), "benzin", "1"),
+            self._mbe_row(date(2026, 1, 5), "motorin", "2"),
+        ]
+
+        out = await upsert_mbe_calculations_bulk(session, rows)
+        await upsert_mbe_calculations_bulk(session, rows[:1])
+
+        assert len(out) == 2
+        first, second = session.execute.call_args_list
+        assert first.args[0] is second.args[0]
+        assert first.args[1] == rows
+        assert second.args[1] == rows[:1]
+
+    def test_upsert_statement_uses_excluded(self):
+        """DO UPDATE degerleri EXCLUDED'dan okunur, anahtar kolonlar guncellenmez."""
+        from sqlalchemy.dialects import postgresql
+
+        from src.core.mbe_repository import _MBE_CALCULATION_UPSERT
+
+        sql = str(_MBE_CALCULATION_UPSERT.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_mbe_calc_date_fuel" in sql
+        assert "mbe_value = excluded.mbe_value" in sql
+        assert "updated_at = NOW()" in sql
+        assert "trade_date = excluded" not in sql
+        assert "created_at = excluded" not in sql
+
+    @pytest.mark.asyncio
+    async def test_duplicate_keys_keep_last(self):
+        """Ayni anahtar batch icinde tekrar ederse son satir yazilir."""
+        session = self._session([MagicMock()])
+        rows = [
+            self._mbe_row(date(2026, 1, 5), "lpg", "1"),
+            self._mbe_row(date(2026, 1, 5), "lpg", "3"),
+        ]
+
+        await upsert_mbe_calculations_bulk(session, rows)
+
+        params = session.execute.call_args.args[1]
+        assert [r["mbe_value"] for r in params] == [Decimal("3")]
+
+
+class TestRangeThin:
+    """Kolon secimli aralik sorgulari."""
+
+    @pytest.mark.asyncio
+    async def test_mbe_range_thin_selects_only_columns(self):
+        """get_mbe_range_thin yalnizca istenen kolonlari secer."""
+        from sqlalchemy.dialects import postgresql
+
+        result = MagicMock()
+        result.all.return_value = [("row",)]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        out = await get_mbe_range_thin(
+            session, "benzin", date(2026, 1, 1), date(2026, 1, 15),
+            columns=(MBECalculation.trade_date, MBECalculation.mbe_value),
+        )
+
+        assert out == [("row",)]
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        select_list = sql.split("FROM")[0]
+        assert "mbe_calculations.mbe_value" in select_list
+        assert "mbe_calculations.nc_base" not in select_list
+        assert "ORDER BY mbe_calculations.trade_date ASC" in sql
+
+    @pytest.mark.asyncio
+    async def test_cost_snapshots_range_thin_default_columns(self):
+        """Varsayilan kolonlar ORM nesnesi yerine Row dondurur."""
+        result = MagicMock()
+        result.all.return_value = []
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        await get_cost_snapshots_range_thin(
+            session, "lpg", date(2026, 1, 1), date(2026, 1, 15),
+        )
+
+        stmt = session.execute.call_args.args[0]
+        names = [c.name for c in stmt.selected_columns]
+        assert "cif_component_tl" in names
+        assert "source" not in names
+
+
+class TestIterRange:
+    """Akis (stream) aralik sorgulari."""
+
+    @pytest.mark.asyncio
+    async def test_iter_mbe_range_streams_rows(self, async_stream):
+        """iter_mbe_range stream_scalars ile satirlari sirayla verir."""
+        rows = [MagicMock(), MagicMock(), MagicMock()]
+
+        session = MagicMock()
+        session.stream_scalars = AsyncMock(return_value=async_stream(rows))
+
+        out = [
+            r async for r in iter_mbe_range(
+                session, "motorin", date(2024, 1, 1), date(2026, 1, 1),
+            )
+        ]
+
+        assert out == rows
+        stmt = session.stream_scalars.call_args.args[0]
+        assert stmt.get_execution_options()["yield_per"] > 0
+
+    @pytest.mark.asyncio
+    async def test_iter_price_changes_range_streams_rows(self, async_stream):
+        """iter_price_changes_range stream_scalars ile satirlari sirayla verir."""
+        rows = [MagicMock(), MagicMock()]
+
+        session = MagicMock()
+        session.stream_scalars = AsyncMock(return_value=async_stream(rows))
+
+        out = [
+            r async for r in iter_price_changes_range(
+                session, "benzin", date(2020, 1, 1), date(2026, 1, 1),
+            )
+        ]
+
+        assert out == rows
+        stmt = session.stream_scalars.call_args.args[0]
+        assert stmt.get_execution_options()["yield_per"] > 0
+
+
+class TestUpsertIdOnly:
+    """Yalnizca PK donduren UPSERT varyantlari."""
+
+    @pytest.mark.asyncio
+    async def test_cost_snapshot_id_returns_pk(self):
+        """upsert_cost_snapshot_id RETURNING id ile int dondurur."""
+        from sqlalchemy.dialects import postgresql
+
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [42]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        row_id = await upsert_cost_snapshot_id(
+            session,
+            trade_date=date(2026, 1, 5),
+            fuel_type="benzin",
+            market_data_id=1,
+            tax_parameter_id=2,
+            cif_component_tl=Decimal("20"),
+            otv_component_tl=Decimal("10"),
+            kdv_component_tl=Decimal("6"),
+            margin_component_tl=Decimal("1.2"),
+            theoretical_cost_tl=Decimal("37.2"),
+            actual_pump_price_tl=Decimal("38"),
+            implied_cif_usd_ton=None,
+            cost_gap_tl=Decimal("0.8"),
+            cost_gap_pct=Decimal("2.15"),
+        )
+
+        assert row_id == 42
+        stmt = session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.endswith("RETURNING cost_base_snapshots.id")
+
+
+class TestExists:
+    """EXISTS tabanli varlik kontrolleri."""
+
+    @pytest.mark.asyncio
+    async def test_cost_snapshot_exists_uses_exists_query(self):
+        """cost_snapshot_exists tek EXISTS sorgusu ile bool dondurur."""
+        from sqlalchemy.dialects import postgresql
+
+        session = MagicMock()
+        session.scalar = AsyncMock(return_value=True)
+
+        assert await cost_snapshot_exists(session, date(2026, 1, 5), "lpg") is True
+
+        sql = str(session.scalar.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "EXISTS (SELECT *" in sql
+
+    @pytest.mark.asyncio
+    async def test_cost_snapshot_exists_none_is_false(self):
+        """Sorgu None donerse False."""
+        session = MagicMock()
+        session.scalar = AsyncMock(return_value=None)
+
+        assert await cost_snapshot_exists(session, date(2026, 1, 5), "lpg") is False
+
+
+class TestGetLatestPriceChangesAll:
+    """get_latest_price_changes_all tek sorgu dogrulamalari."""
+
+    @pytest.mark.asyncio
+    async def test_single_distinct_on_query(self):
+        """Tek DISTINCT ON sorgusu gonderilir, sonuc yakit sirasina dizilir."""
+        from sqlalchemy.dialects import postgresql
+
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [
+            MagicMock(fuel_type="lpg"),
+            MagicMock(fuel_type="benzin"),
+        ]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        out = await get_latest_price_changes_all(session)
+
+        session.execute.assert_awaited_once()
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "DISTINCT ON (price_changes.fuel_type)" in sql
+        assert "price_changes.change_date DESC" in sql
+        assert [r.fuel_type for r in out] == ["benzin", "lpg"]
+
+
+class TestUpsertPriceChange:
+    """upsert_price_change sabit ifade dogrulamalari."""
+
+    @pytest.mark.asyncio
+    async def test_prebuilt_statement_reused(self):
+        """Her cagrida ayni UPSERT ifadesi kullanilir, satir parametre olarak gider."""
+        from sqlalchemy.dialects import postgresql
+
+        result = MagicMock()
+        result.scalar_one.return_value = MagicMock()
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        kwargs = dict(
+            fuel_type="benzin",
+            change_date=date(2026, 1, 5),
+            direction="increase",
+            old_price=Decimal("44.00"),
+            new_price=Decimal("45.10"),
+            change_amount=Decimal("1.10"),
+            change_pct=Decimal("2.50"),
+        )
+
+        await upsert_price_change(session, **kwargs)
+        await upsert_price_change(session, **{**kwargs, "fuel_type": "lpg"})
+
+        first, second = session.execute.call_args_list
+        assert first.args[0] is second.args[0]
+        assert first.args[1][0]["fuel_type"] == "benzin"
+        assert second.args[1][0]["fuel_type"] == "lpg"
+
+        sql = str(first.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_price_change_fuel_date" in sql
+        assert "new_price = excluded.new_price" in sql
+        assert "fuel_type = excluded.fuel_type" not in sql
+
+
+class TestGetPriceChangeStatsRange:
+    """get_price_change_stats_range sunucu tarafi toplama dogrulamalari."""
+
+    @pytest.mark.asyncio
+    async def test_single_aggregate_query(self):
+        """Tek toplama sorgusu gonderilir; bos aralikta sifir degerler doner."""
+        from sqlalchemy.dialects import postgresql
+
+        result = MagicMock()
+        result.one.return_value = MagicMock(
+            count=0, avg_change_pct=None, max_change_amount=None, increase_count=0,
+        )
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        out = await get_price_change_stats_range(
+            session, "motorin", date(2024, 1, 1), date(2026, 1, 1),
+        )
+
+        session.execute.assert_awaited_once()
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "avg(price_changes.change_pct)" in sql
+        assert "FILTER (WHERE price_changes.direction" in sql
+        assert out == {
+            "fuel_type": "motorin",
+            "count": 0,
+            "avg_change_pct": Decimal("0"),
+            "max_change_amount": Decimal("0"),
+            "increase_count": 0,
+        }
+
+
+class TestGetLatestPriceChangeSummary:
+    """get_latest_price_change_summary dar kolon dogrulamalari."""
+
+    @pytest.mark.asyncio
+    async def test_selects_summary_columns_only(self):
+        """Yalnizca change_date, new_price, direction okunur; tek satir limitli."""
+        from sqlalchemy.dialects import postgresql
+
+        row = (date(2026, 1, 5), Decimal("45.10"), "increase")
+        result = MagicMock()
+        result.one_or_none.return_value = row
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        out = await get_latest_price_change_summary(session, "benzin")
+
+        assert out == row
+        stmt = session.execute.call_args.args[0]
+        assert [c.name for c in stmt.selected_columns] == [
+            "change_date", "new_price", "direction",
+        ]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ORDER BY price_changes.change_date DESC" in sql
+        assert "LIMIT" in sql
@@ -6,8 +6,16 @@ z-score hesaplama ve kademeli zam senaryoları için kapsamlı testler.
 """
 
 import pytest
+from datetime import date
 from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
 
+from src.core.delay_repository import (
+    close_delay_record,
+    create_delay_record,
+    get_delay_history,
+    get_delay_stats,
+)
 from src.core.political_delay_tracker import (
     BELOW_THRESHOLD_RESET,
     DelayState,
@@ -15,6 +23,7 @@ from src.core.political_delay_tracker import (
     DelayTransition,
     calculate_z_score,
     interpret_z_score,
+    replay_delay_series,
     update_tracker,
 )
 
@@ -366,6 +375,53 @@ class TestZScore:
         assert tracker.z_score == Decimal("2.00")
 
 
+# ────────────────────────────────────────────────────────────────────────────
+#  Toplu replay testleri
+# ────────────────────────────────────────────────────────────────────────────
+
+
+class TestReplayDelaySeries:
+    """replay_delay_series — günlük update_tracker döngüsüyle aynı geçişler."""
+
+    @staticmethod
+    def _loop(mbe_values, threshold, price_changed, dates):
+        tracker = DelayTracker()
+        out = []
+        for mbe, changed, day in zip(mbe_values, price_changed, dates, strict=True):
+            tr = update_tracker(tracker, mbe, threshold, day, price_changed=changed)
+            if tr.previous_state != tr.new_state:
+                out.append((tr.new_state, tr.reason, tr.close_status, tracker.to_dict()))
+        return out
+
+    def test_matches_daily_loop(self):
+        """Zam, absorbe, kısa düşüş ve terminal→IDLE geçişleri aynı olmalı."""
+        pattern = [
+            "1.2", "1.5", "0.8", "0.7", "1.1", "1.3", "1.4",  # kısa düşüş, sonra zam
+            "0.5", "0.5", "1.6", "0.9", "0.9", "0.9", "0.9", "0.9",  # eşik altı 5 gün → absorbe
+            "0.4", "1.0", "1.8", "0.2", "0.2", "0.2",  # tam eşikte başla, seri açık biter
+        ]
+        mbe_values = [Decimal(v) for v in pattern]
+        price_changed = [i == 6 for i in range(len(mbe_values))]
+        dates = [f"2026-01-{i + 1:02d}" for i in range(len(mbe_values))]
+        threshold = Decimal("1.0")
+
+        replay = [
+            (tr.new_state, tr.reason, tr.close_status, tr.tracker.to_dict())
+            for tr in replay_delay_series(mbe_values, threshold, price_changed, dates)
+        ]
+
+        assert replay == self._loop(mbe_values, threshold, price_changed, dates)
+        assert [r[0] for r in replay] == [
+            DelayState.WATCHING, DelayState.CLOSED, DelayState.IDLE,
+            DelayState.WATCHING, DelayState.ABSORBED, DelayState.IDLE,
+            DelayState.WATCHING,
+        ]
+
+    def test_empty_series(self):
+        """Boş seride geçiş yok."""
+        assert replay_delay_series([], Decimal("1"), [], []) == []
+
+
 # ────────────────────────────────────────────────────────────────────────────
 #  Serialization testleri
 # ────────────────────────────────────────────────────────────────────────────
@@ -397,3 +453,134 @@ class TestTrackerSerialization:
         assert restored.regime == tracker.regime
         assert restored.z_score == tracker.z_score
         assert restored.below_threshold_streak == tracker.below_threshold_streak
+
+    def test_from_dict_defaults(self):
+        """Boş dict'ten varsayılan tracker oluşmalı (slots — __dict__ yok)."""
+        restored = DelayTracker.from_dict({})
+        assert restored == DelayTracker()
+        assert not hasattr(restored, "__dict__")
+
+    def test_from_dict_state_lookup(self):
+        """Durum değer veya üye olarak verilebilir; geçersiz değer ValueError."""
+        for state in DelayState:
+            assert DelayTracker.from_dict({"state": state.value}).state is state
+            assert DelayTracker.from_dict({"state": state}).state is state
+        with pytest.raises(ValueError):
+            DelayTracker.from_dict({"state": "unknown"})
+
+    def test_from_dict_numeric_values(self):
+        """JSON dışı (int/float/Decimal) değerler de Decimal'e çevrilmeli."""
+        restored = DelayTracker.from_dict(
+            {"mbe_at_cross": 1, "mbe_max": 0.5, "z_score": Decimal("1.25")}
+        )
+        assert restored.mbe_at_cross == Decimal("1")
+        assert restored.mbe_max == Decimal("0.5")
+        assert restored.z_score == Decimal("1.25")
+
+
+# ────────────────────────────────────────────────────────────────────────────
+#  Gecikme istatistikleri (repository) testleri
+# ────────────────────────────────────────────────────────────────────────────
+
+
+class TestDelayStats:
+    """get_delay_stats float dönüş testleri."""
+
+    @pytest.mark.asyncio
+    async def test_stats_returned_as_floats(self):
+        """avg/std float8 cast'li sorgulanır ve float olarak döner."""
+        row = MagicMock(count=3, avg_delay=4.3333333, max_delay=7,
+                        min_delay=2, std_delay=2.0548047)
+        result = MagicMock()
+        result.one.return_value = row
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        stats = await get_delay_stats(session, "benzin")
+
+        assert stats["avg_delay"] == 4.33
+        assert stats["std_delay"] == 2.05
+        assert isinstance(stats["avg_delay"], float)
+        sql = str(session.execute.call_args[0][0])
+        assert "CAST(avg(" in sql and "CAST(stddev_pop(" in sql
+
+    @pytest.mark.asyncio
+    async def test_empty_stats_default_to_zero(self):
+        """Kayıt yoksa avg/std 0.0 döner."""
+        row = MagicMock(count=0, avg_delay=None, max_delay=None,
+                        min_delay=None, std_delay=None)
+        result = MagicMock()
+        result.one.return_value = row
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        stats = await get_delay_stats(session, "lpg")
+
+        assert stats["avg_delay"] == 0.0
+        assert stats["std_delay"] == 0.0
+        assert stats["count"] == 0
+
+
+class TestCreateDelayRecord:
+    """create_delay_record INSERT ... RETURNING testleri."""
+
+    @pytest.mark.asyncio
+    async def test_insert_returning_without_flush(self):
+        """Kayıt tek INSERT ... RETURNING ile yazılmalı, flush yapılmamalı."""
+        record = MagicMock(id=42)
+        result = MagicMock()
+        result.scalar_one.return_value = record
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        session.flush = AsyncMock()
+
+        created = await create_delay_record(
+            session, "benzin", date(2026, 2, 10), Decimal("0.55"),
+        )
+
+        assert created is record
+        sql = str(session.execute.call_args[0][0])
+        assert sql.startswith("INSERT INTO political_delay_history")
+        assert "RETURNING" in sql
+        session.add.assert_not_called()
+        session.flush.assert_not_called()
+
+
+class TestDelayHistoryRead:
+    """get_delay_history salt okunur sorgu testleri."""
+
+    @pytest.mark.asyncio
+    async def test_history_returned_as_mappings(self):
+        """Geçmiş ORM nesnesi yerine satır eşlemesi olarak dönmeli."""
+        rows = [{"id": 1, "fuel_type": "benzin", "delay_days": 4}]
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = rows
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        history = await get_delay_history(session, "benzin", limit=10)
+
+        assert history == rows
+        result.scalars.assert_not_called()
+        sql = str(session.execute.call_args[0][0])
+        assert "ORDER BY political_delay_history.expected_change_date DESC" in sql
+
+
+class TestCloseDelayRecord:
+    """close_delay_record RETURNING testleri."""
+
+    @pytest.mark.asyncio
+    async def test_returns_only_id(self):
+        """UPDATE yalnızca id döndürmeli, tam satır okunmamalı."""
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = 7
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        closed_id = await close_delay_record(
+            session, 7, date(2026, 2, 15), 5, Decimal("0.10"), Decimal("12.5"),
+        )
+
+        assert closed_id == 7
+        sql = str(session.execute.call_args[0][0])
+        assert sql.endswith("RETURNING political_delay_history.id")
@@ -299,6 +299,26 @@ def test_predict_all(mock_predict):
     assert sorted(call_fuels) == sorted(FUEL_TYPES)
 
 
+@patch("src.predictor_v5.predictor.predict")
+def test_predict_all_isolates_fuel_errors(mock_predict):
+    """Bir yakit tipinin hatasi digerlerinin sonucunu etkilemez."""
+    from src.predictor_v5.predictor import predict_all
+
+    def _side_effect(fuel, target_date=None, db_url=None):
+        if fuel == "motorin":
+            raise RuntimeError("model hatasi")
+        return {"fuel_type": fuel}
+
+    mock_predict.side_effect = _side_effect
+
+    results = predict_all(target_date=date(2026, 2, 18))
+
+    assert list(results.keys()) == list(FUEL_TYPES)
+    assert results["motorin"] is None
+    assert results["benzin"] == {"fuel_type": "benzin"}
+    assert results["lpg"] == {"fuel_type": "lpg"}
+
+
 # ===========================================================================
 # TEST 7: Model cache calisiyor
 # ===========================================================================
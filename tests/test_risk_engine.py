@@ -7,7 +7,9 @@ kapsamlı birim testleri.
 """
 
 import pytest
+from datetime import date
 from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
 
 from src.core.risk_engine import (
     DEFAULT_WEIGHTS,
@@ -15,10 +17,18 @@ from src.core.risk_engine import (
     RiskResult,
     apply_regime_modifier,
     calculate_risk_score,
+    calculate_risk_score_batch,
     check_threshold_breach,
     normalize_component,
     _determine_system_mode,
 )
+from src.core.risk_repository import (
+    copy_risk_scores,
+    get_risk_range_rows,
+    iter_risk_range,
+    upsert_risk_score,
+    upsert_risk_scores_bulk,
+)
 
 
 # ────────────────────────────────────────────────────────────────────────────
@@ -155,6 +165,25 @@ class TestCalculateRiskScore:
         assert "mbe" in result.weight_vector
         assert result.weight_vector["mbe"] == "0.30"
 
+    def test_default_ranges_match_explicit_ranges(self):
+        """Varsayılan aralık yolu, aynı aralıklar açıkça verildiğindeki sonucu üretmeli."""
+        explicit_ranges = {
+            "mbe": (Decimal("0"), Decimal("1")),
+            "fx_volatility": (Decimal("0"), Decimal("0.10")),
+            "political_delay": (Decimal("0"), Decimal("60")),
+            "threshold_breach": (Decimal("0"), Decimal("1")),
+            "trend_momentum": (Decimal("-1"), Decimal("1")),
+        }
+        for values in (
+            ("0.4", "0.03", "12", "1", "0.3"),
+            ("-0.5", "0.25", "90", "-1", "-2"),
+            ("0.33333", "0.0777", "45.5", "0.5", "0.12345"),
+        ):
+            components = RiskComponents(*(Decimal(v) for v in values))
+            default = calculate_risk_score(components)
+            explicit = calculate_risk_score(components, normalization_ranges=explicit_ranges)
+            assert default == explicit
+
     def test_system_mode_normal(self):
         """Skor < 0.60 → normal mod."""
         assert _determine_system_mode(Decimal("0.30")) == "normal"
@@ -168,6 +197,61 @@ class TestCalculateRiskScore:
         assert _determine_system_mode(Decimal("0.85")) == "crisis"
 
 
+# ────────────────────────────────────────────────────────────────────────────
+#  calculate_risk_score_batch testleri
+# ────────────────────────────────────────────────────────────────────────────
+
+
+class TestCalculateRiskScoreBatch:
+    """calculate_risk_score_batch (float64) testleri."""
+
+    ROWS = [
+        ("0.5", "0.05", "30", "1", "0"),
+        ("0", "0", "0", "0", "-1"),
+        ("2", "0.2", "90", "1", "1"),
+        ("0.9", "0.08", "55", "1", "0.6"),
+    ]
+
+    def test_matches_decimal_path(self):
+        """Her satır Decimal calculate_risk_score ile ~1e-4 içinde örtüşmeli."""
+        import numpy as np
+
+        out = calculate_risk_score_batch(np.array(self.ROWS, dtype=float))
+        assert out.shape == (len(self.ROWS), 7)
+
+        modes = {"normal": 0, "high_alert": 1, "crisis": 2}
+        for row, res in zip(self.ROWS, out, strict=True):
+            expected = calculate_risk_score(RiskComponents(*map(Decimal, row)))
+            assert res[0] == pytest.approx(float(expected.composite_score), abs=1e-4)
+            assert res[1] == pytest.approx(float(expected.mbe_component), abs=1e-4)
+            assert res[6] == modes[expected.system_mode]
+
+    def test_zero_range_component(self):
+        """Aralığı sıfır olan bileşen normalize_component gibi 0/1 olmalı."""
+        import numpy as np
+
+        ranges = {"mbe": (Decimal("5"), Decimal("5"))}
+        out = calculate_risk_score_batch(
+            np.array([[5, 0, 0, 0, -1], [6, 0, 0, 0, -1]], dtype=float), ranges
+        )
+        assert out[:, 1].tolist() == [0.0, 1.0]
+
+    def test_mode_thresholds_inclusive(self):
+        """Eşiğe eşit skor üst moda düşmeli (_determine_system_mode ile aynı)."""
+        import numpy as np
+
+        weights = {name: Decimal("0") for name in DEFAULT_WEIGHTS}
+        weights["mbe"] = Decimal("1")
+        values = ["0.5999", "0.60", "0.7999", "0.80"]
+        out = calculate_risk_score_batch(
+            np.array([[v, 0, 0, 0, -1] for v in values], dtype=float), weights=weights
+        )
+        assert out[:, 6].tolist() == [
+            ["normal", "high_alert", "crisis"].index(_determine_system_mode(Decimal(v)))
+            for v in values
+        ]
+
+
 # ────────────────────────────────────────────────────────────────────────────
 #  check_threshold_breach testleri
 # ────────────────────────────────────────────────────────────────────────────
@@ -262,3 +346,198 @@ class TestApplyRegimeModifier:
             active_regime_type="holiday",
         )
         assert result == Decimal("0.60")
+
+    def test_unit_modifier_keeps_rounding(self):
+        """1.0 çarpanı eşiği değiştirmez, yalnızca 4 ondalığa yuvarlar."""
+        result = apply_regime_modifier(
+            threshold_open=Decimal("0.123456"),
+            regime_modifier={"holiday": 1.0},
+            active_regime_type="holiday",
+        )
+        assert str(result) == "0.1235"
+
+
+# ────────────────────────────────────────────────────────────────────────────
+#  upsert_risk_scores_bulk testleri
+# ────────────────────────────────────────────────────────────────────────────
+
+
+class TestUpsertRiskScoresBulk:
+    """Toplu risk skoru UPSERT testleri."""
+
+    @staticmethod
+    def _row(trade_date: date, fuel_type: str, score: str) -> dict:
+        return {
+            "trade_date": trade_date,
+            "fuel_type": fuel_type,
+            "composite_score": Decimal(score),
+            "mbe_component": Decimal("0.5"),
+            "fx_volatility_component": Decimal("0.1"),
+            "political_delay_component": Decimal("0"),
+            "threshold_breach_component": Decimal("1"),
+            "trend_momentum_component": Decimal("0.5"),
+            "weight_vector": {"mbe": "0.30"},
+            "system_mode": "normal",
+            "triggered_alerts": None,
+        }
+
+    @staticmethod
+    def _session(rows: list) -> MagicMock:
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        return session
+
+    @pytest.mark.asyncio
+    async def test_empty_rows_no_query(self):
+        """Boş liste için sorgu gönderilmez."""
+        session = self._session([])
+        assert await upsert_risk_scores_bulk(session, []) == []
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_single_execute_with_deduped_rows(self):
+        """Tek execute; aynı anahtarda son satır kalır, ifade tekrar kullanılır."""
+        session = self._session([MagicMock(), MagicMock()])
+        rows = [
+            self._row(date(2026, 1, 5), "benzin", "0.1"),
+            self._row(date(2026, 1, 5), "motorin", "0.2"),
+            self._row(date(2026, 1, 5), "benzin", "0.3"),
+        ]
+
+        out = await upsert_risk_scores_bulk(session, rows)
+        single = self._session([MagicMock()])
+        await upsert_risk_score(single, **rows[1])
+
+        assert len(out) == 2
+        session.execute.assert_awaited_once()
+        assert session.execute.call_args.args[1] == [rows[2], rows[1]]
+        assert single.execute.call_args.args[0] is session.execute.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_returning_false_skips_returning(self):
+        """returning=False ise RETURNING'siz ifade kullanılır, [] döner."""
+        from sqlalchemy.dialects import postgresql
+
+        session = self._session([])
+        rows = [self._row(date(2026, 1, 5), "lpg", "0.4")]
+
+        assert await upsert_risk_scores_bulk(session, rows, returning=False) == []
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "ON CONFLICT ON CONSTRAINT uq_risk_score_date_fuel" in sql
+        assert "RETURNING" not in sql
+
+
+class TestCopyRiskScores:
+    """COPY tabanlı backfill testleri."""
+
+    @staticmethod
+    def _rows(count: int) -> list[dict]:
+        return [
+            TestUpsertRiskScoresBulk._row(date.fromordinal(738000 + i), "benzin", "0.5")
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_small_batch_uses_bulk_upsert(self):
+        """Eşik altındaki satır sayısında COPY yapılmaz."""
+        session = TestUpsertRiskScoresBulk._session([])
+        session.connection = AsyncMock()
+
+        assert await copy_risk_scores(session, self._rows(3)) == 3
+        session.connection.assert_not_called()
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_large_batch_copies_then_merges(self):
+        """Satırlar geçici tabloya COPY edilir, tek INSERT ... SELECT ile birleştirilir."""
+        from src.core.risk_repository import _COPY_COLUMNS, _COPY_THRESHOLD
+
+        raw = MagicMock()
+        raw.driver_connection.copy_records_to_table = AsyncMock()
+        connection = MagicMock()
+        connection.get_raw_connection = AsyncMock(return_value=raw)
+        session = MagicMock()
+        session.connection = AsyncMock(return_value=connection)
+        session.execute = AsyncMock()
+        rows = self._rows(_COPY_THRESHOLD)
+
+        assert await copy_risk_scores(session, rows) == _COPY_THRESHOLD
+
+        copy = raw.driver_connection.copy_records_to_table
+        copy.assert_awaited_once()
+        assert copy.call_args.args[0] == "risk_scores_stage"
+        assert copy.call_args.kwargs["columns"] == _COPY_COLUMNS
+        first = copy.call_args.kwargs["records"][0]
+        assert first[0] == rows[0]["trade_date"]
+        assert first[_COPY_COLUMNS.index("weight_vector")] == '{"mbe": "0.30"}'
+
+        create, merge, drop = (str(c.args[0]) for c in session.execute.call_args_list)
+        assert create.startswith("CREATE TEMP TABLE risk_scores_stage")
+        assert "FROM risk_scores_stage ON CONFLICT" in merge
+        assert drop == "DROP TABLE risk_scores_stage"
+
+    @pytest.mark.asyncio
+    async def test_none_weight_vector_copied_as_null(self):
+        """weight_vector None ise JSON 'null' metni değil SQL NULL gönderilir."""
+        from src.core.risk_repository import _COPY_COLUMNS, _COPY_THRESHOLD
+
+        raw = MagicMock()
+        raw.driver_connection.copy_records_to_table = AsyncMock()
+        connection = MagicMock()
+        connection.get_raw_connection = AsyncMock(return_value=raw)
+        session = MagicMock()
+        session.connection = AsyncMock(return_value=connection)
+        session.execute = AsyncMock()
+        rows = self._rows(_COPY_THRESHOLD)
+        for row in rows:
+            row["weight_vector"] = None
+
+        await copy_risk_scores(session, rows)
+
+        records = raw.driver_connection.copy_records_to_table.call_args.kwargs["records"]
+        index = _COPY_COLUMNS.index("weight_vector")
+        assert all(record[index] is None for record in records)
+
+
+class TestRiskRangeReads:
+    """Dar kolonlu ve akış tabanlı aralık okumaları."""
+
+    @pytest.mark.asyncio
+    async def test_rows_cover_response_schema_without_json_columns(self):
+        """get_risk_range_rows yanıt şemasının alanlarını okur, JSONB/ARRAY okumaz."""
+        from src.api.risk_routes import RiskScoreResponse
+
+        result = MagicMock()
+        result.all.return_value = []
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        assert await get_risk_range_rows(
+            session, "benzin", date(2024, 1, 1), date(2026, 1, 1),
+        ) == []
+        selected = [c.name for c in session.execute.call_args.args[0].selected_columns]
+        assert set(RiskScoreResponse.model_fields) <= set(selected)
+        assert "weight_vector" not in selected
+        assert "triggered_alerts" not in selected
+
+    @pytest.mark.asyncio
+    async def test_iter_risk_range_streams_rows(self, async_stream):
+        """iter_risk_range stream_scalars ile satırları sırayla verir."""
+        rows = [MagicMock(), MagicMock()]
+
+        session = MagicMock()
+        session.stream_scalars = AsyncMock(return_value=async_stream(rows))
+
+        out = [
+            r async for r in iter_risk_range(
+                session, "lpg", date(2020, 1, 1), date(2026, 1, 1),
+            )
+        ]
+
+        assert out == rows
+        stmt = session.stream_scalars.call_args.args[0]
+        assert stmt.get_execution_options()["yield_per"] > 0
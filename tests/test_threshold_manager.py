@@ -16,6 +16,7 @@ from src.core.threshold_manager import (
     build_threshold_seed_data,
     check_cooldown,
     check_hysteresis,
+    check_hysteresis_batch,
     get_seed_thresholds,
 )
 
@@ -175,6 +176,15 @@ class TestDefaultThresholds:
             assert "valid_from" in item
             assert item["fuel_type"] is None  # Tüm yakıt tipleri için geçerli
 
+    def test_seed_data_returns_fresh_dicts(self):
+        """Her çağrı yeni dict'ler döndürmeli; değişiklik sonraki çağrıya sızmamalı."""
+        from datetime import date
+        first = build_threshold_seed_data(valid_from=date(2026, 1, 1))
+        first[0]["version"] = 99
+        second = build_threshold_seed_data(valid_from=date(2026, 2, 1))
+        assert second[0]["version"] == 1
+        assert second[0]["valid_from"] == date(2026, 2, 1)
+
 
 # ────────────────────────────────────────────────────────────────────────────
 #  Rejim modifier testleri
@@ -216,3 +226,57 @@ class TestApplyRegimeToThresholds:
 
         # Orijinal değişmemiş olmalı
         assert thresholds[0]["threshold_open"] == Decimal("0.60")
+
+    def test_mixed_input_types(self):
+        """Float/str eşikler ve Decimal çarpan str() üzerinden aynı sonucu vermeli."""
+        thresholds = [
+            {"threshold_open": 0.6, "threshold_close": "0.45"},
+            {"threshold_open": Decimal("0.60"), "threshold_close": Decimal("0.45")},
+        ]
+        modified = apply_regime_to_thresholds(
+            thresholds, {"election": Decimal("0.85")}, "election",
+        )
+
+        assert modified[0]["threshold_open"] == Decimal("0.510")
+        assert modified[0]["threshold_close"] == Decimal("0.3825")
+        assert str(modified[1]["threshold_open"]) == "0.5100"
+
+
+# ────────────────────────────────────────────────────────────────────────────
+#  check_hysteresis_batch testleri
+# ────────────────────────────────────────────────────────────────────────────
+
+
+class TestCheckHysteresisBatch:
+    """check_hysteresis_batch — skaler check_hysteresis ile aynı maske."""
+
+    def test_matches_scalar(self):
+        """Sınır değerleri dahil her satır skaler sonuçla aynı olmalı."""
+        cases = [
+            (Decimal("0.60"), False),  # açılış eşiğinde → aç
+            (Decimal("0.59"), False),
+            (Decimal("0.45"), True),   # kapanış eşiğinde → kapat
+            (Decimal("0.46"), True),
+            (Decimal("0.50"), False),
+            (Decimal("0.50"), True),
+        ]
+        opens = [Decimal("0.60")] * len(cases)
+        closes = [Decimal("0.45")] * len(cases)
+
+        out = check_hysteresis_batch(
+            [v for v, _ in cases], opens, closes, [a for _, a in cases],
+        )
+
+        assert out.tolist() == [
+            check_hysteresis(v, o, c, a)
+            for (v, a), o, c in zip(cases, opens, closes, strict=True)
+        ]
+
+    def test_scalar_thresholds_broadcast(self):
+        """Eşikler skaler verilebilir."""
+        import numpy as np
+
+        out = check_hysteresis_batch(
+            np.array([0.7, 0.5, 0.3]), 0.6, 0.45, np.array([False, True, True]),
+        )
+        assert out.tolist() == [True, True, False]